@@ -1,21 +1,28 @@
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_core.messages import SystemMessage, HumanMessage
 import spacy
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from core.config import config
 from core.observability import log_llm_call
 from utils.debug_exporter import debug_exporter
+from utils.cache_manager import get_cache_manager, CacheManager
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
 import logging
 import os
 import json
 import re
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Placeholder summary for a theme whose sentiment LLM call failed
+_SENTIMENT_UNAVAILABLE = "Sentiment analysis unavailable"
+
 
 class AnalysisAgent:
     """
@@ -31,6 +38,8 @@ class AnalysisAgent:
     
     def __init__(self):
         """Initialize analysis tools"""
+        self.cache = get_cache_manager()
+
         # OpenAI embeddings
         self.embeddings = OpenAIEmbeddings(
             model="text-embedding-3-large",
@@ -66,24 +75,34 @@ class AnalysisAgent:
 
         logger.info("Analysis Agent initialized")
     
-    def run(self, research_data: Dict, trace_id: Optional[str] = None) -> Dict:
+    def run(
+        self, research_data: Dict, trace_id: Optional[str] = None, cache_key: Optional[str] = None
+    ) -> Dict:
         """
         Analyze research data and extract insights
 
         Args:
             research_data: Output from Research Agent
             trace_id: Optional Langfuse trace ID for observability
+            cache_key: input_key(research_data), if the caller already computed it
 
         Returns:
             Dict with competitors, themes, attributes, vectorstore path
         """
-        self._current_trace_id = trace_id
         logger.info("Analysis Agent: Processing research data")
         
         if not research_data or not research_data.get("sources"):
             logger.warning("No research data to analyze")
             return self._empty_output()
         
+        # Identical sources for the same query produce the same insights
+        if cache_key is None:
+            cache_key = self.input_key(research_data)
+        cached_result = self.cache.get(cache_key, CacheManager.CACHE_TYPE_ANALYSIS)
+        if cached_result:
+            logger.info(f"Analysis Agent: CACHE HIT for input {cache_key[:12]}")
+            return cached_result
+
         # Extract text from sources
         documents = self._extract_documents(research_data["sources"])
         
@@ -95,10 +114,106 @@ class AnalysisAgent:
         chunks = self.text_splitter.create_documents(documents)
         logger.info(f"Created {len(chunks)} document chunks")
         
-        # Create vectorstore with instrumentation
+        sources = research_data["sources"]
+        query = research_data.get("query", "")
+
+        # The vectorstore (embeddings), competitor extraction and theme
+        # extraction are independent; only competitor attributes need both
+        # the vectorstore and the competitor list
+        if config.ENABLE_PARALLEL_ANALYSIS:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                vectorstore_future = executor.submit(self._build_vectorstore, chunks, trace_id)
+                competitors_future = executor.submit(self._identify_competitors, sources, trace_id)
+                themes_future = executor.submit(self._extract_themes_with_sentiment, sources, query, trace_id)
+
+                vectorstore, vectorstore_path = vectorstore_future.result()
+                competitors, llm_competitors, ner_competitors = competitors_future.result()
+                themes = themes_future.result()
+        else:
+            vectorstore, vectorstore_path = self._build_vectorstore(chunks, trace_id)
+            competitors, llm_competitors, ner_competitors = self._identify_competitors(sources, trace_id)
+            themes = self._extract_themes_with_sentiment(sources, query, trace_id)
+
+        competitor_attributes = self._analyze_competitors(
+            competitors,
+            vectorstore,
+            research_data["sources"]
+        )
+
+        # DEBUG: Export debug report (if debug mode enabled)
+        try:
+            if logger.level <= logging.DEBUG:
+                query = research_data.get("query", "unknown")
+                debug_exporter.export_analysis_debug(
+                    query=query,
+                    sources=research_data["sources"],
+                    llm_competitors=llm_competitors,
+                    ner_competitors=ner_competitors,
+                    final_competitors=competitors,
+                    validation_results=None  # Will be filled by quality agent
+                )
+        except Exception as e:
+            logger.warning(f"Failed to export debug report: {e}")
+        
+        output = {
+            "competitors": competitors,
+            "content_themes": themes,
+            "competitor_attributes": competitor_attributes,
+            "vectorstore_path": vectorstore_path
+        }
+        
+        # Only cache usable output: LLM or embedding failures degrade to empty
+        # lists / no vectorstore, and must not be pinned for the cache TTL
+        sentiment_failed = any(
+            theme.get("sentiment_summary") == _SENTIMENT_UNAVAILABLE for theme in themes
+        )
+        if competitors and themes and vectorstore_path and not sentiment_failed:
+            self.cache.set(
+                cache_key,
+                output,
+                CacheManager.CACHE_TYPE_ANALYSIS,
+                query=query or None,
+                metadata={"competitors": len(competitors), "themes": len(themes)}
+            )
+        else:
+            logger.info("Analysis Agent: Degraded output, not caching")
+
+        logger.info(f"Analysis Agent: Identified {len(competitors)} competitors, {len(themes)} themes")
+        return output
+    
+    @staticmethod
+    def input_key(research_data: Optional[Dict]) -> str:
+        """
+        Build a cache key from the inputs the analysis actually reads
+
+        Args:
+            research_data: Output from Research Agent
+
+        Returns:
+            Hex digest cache key
+        """
+        research_data = research_data or {}
+        payload = orjson.dumps(
+            {"query": research_data.get("query", ""), "sources": research_data.get("sources", [])},
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _build_vectorstore(self, chunks: List, trace_id: Optional[str] = None) -> Tuple[Optional[FAISS], Optional[str]]:
+        """
+        Embed document chunks into a FAISS vectorstore and save it
+
+        Args:
+            chunks: Document chunks to embed
+            trace_id: Optional Langfuse trace ID for observability
+
+        Returns:
+            Tuple of (vectorstore, vectorstore_path); both None on failure
+        """
         vectorstore = None
         vectorstore_path = None
-        
+
         # Import observability for span tracking
         from core.observability import create_span, end_span
         
@@ -151,47 +266,18 @@ class AnalysisAgent:
             
             vectorstore = None
             vectorstore_path = None
-        
-        # Extract insights
-        competitors = self._identify_competitors(research_data["sources"])
-        query = research_data.get("query", "")
-        themes = self._extract_themes(research_data["sources"], query=query)
 
-        # Add contextual sentiment analysis (Phase 5)
-        if themes:
-            themes = self._add_contextual_sentiment(themes, research_data["sources"])
+        return vectorstore, vectorstore_path
 
-        competitor_attributes = self._analyze_competitors(
-            competitors,
-            vectorstore,
-            research_data["sources"]
-        )
+    def _extract_themes_with_sentiment(
+        self, sources: List[Dict], query: str = "", trace_id: Optional[str] = None
+    ) -> List[Dict]:
+        """Extract themes and add contextual sentiment (Phase 5)"""
+        themes = self._extract_themes(sources, query=query, trace_id=trace_id)
+        if themes:
+            themes = self._add_contextual_sentiment(themes, sources, trace_id)
+        return themes
 
-        # DEBUG: Export debug report (if debug mode enabled)
-        try:
-            if logger.level <= logging.DEBUG:
-                query = research_data.get("query", "unknown")
-                debug_exporter.export_analysis_debug(
-                    query=query,
-                    sources=research_data["sources"],
-                    llm_competitors=getattr(self, '_last_llm_competitors', []),
-                    ner_competitors=getattr(self, '_last_ner_competitors', []),
-                    final_competitors=competitors,
-                    validation_results=None  # Will be filled by quality agent
-                )
-        except Exception as e:
-            logger.warning(f"Failed to export debug report: {e}")
-        
-        output = {
-            "competitors": competitors,
-            "content_themes": themes,
-            "competitor_attributes": competitor_attributes,
-            "vectorstore_path": vectorstore_path
-        }
-        
-        logger.info(f"Analysis Agent: Identified {len(competitors)} competitors, {len(themes)} themes")
-        return output
-    
     def _extract_documents(self, sources: List[Dict]) -> List[str]:
         """
         Extract text from sources for analysis
@@ -213,18 +299,22 @@ class AnalysisAgent:
         logger.debug(f"Extracted {len(documents)} documents from {len(sources)} sources")
         return documents
     
-    def _identify_competitors(self, sources: List[Dict]) -> List[str]:
+    def _identify_competitors(
+        self, sources: List[Dict], trace_id: Optional[str] = None
+    ) -> Tuple[List[str], List[str], List[str]]:
         """
         Use hybrid approach (LLM + NER) to identify company names from sources
 
         Args:
             sources: List of source dictionaries
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
-            List of competitor names
+            Tuple of (competitor names, raw LLM candidates, raw NER candidates);
+            the raw lists feed the debug export
         """
         # Step 1: Use LLM extraction (primary method)
-        llm_competitors = self._llm_competitor_extraction(sources)
+        llm_competitors = self._llm_competitor_extraction(sources, trace_id)
 
         # Step 2: Use spaCy NER as backup/enhancement (DISABLED - causes noise)
         # NER was extracting title fragments like "Best Influencer Marketing Software"
@@ -236,10 +326,6 @@ class AnalysisAgent:
         #     logger.warning("spaCy not available, skipping NER extraction")
         #     ner_competitors = []
 
-        # Save for debug export
-        self._last_llm_competitors = llm_competitors
-        self._last_ner_competitors = ner_competitors
-
         # Step 3: Use LLM results directly (NER disabled)
         all_competitors = {}
 
@@ -260,14 +346,15 @@ class AnalysisAgent:
 
         result = [name for name, score in sorted_competitors[:15]]
         logger.info(f"Identified {len(result)} competitors (LLM only - NER disabled due to noise)")
-        return result
+        return result, llm_competitors, ner_competitors
 
-    def _llm_competitor_extraction(self, sources: List[Dict]) -> List[str]:
+    def _llm_competitor_extraction(self, sources: List[Dict], trace_id: Optional[str] = None) -> List[str]:
         """
         Use LLM to extract competitor names from sources
 
         Args:
             sources: List of source dictionaries
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             List of competitor company/product names
@@ -321,7 +408,6 @@ class AnalysisAgent:
             content = response.content.strip()
 
             # Log LLM call to Langfuse with token usage and timing
-            trace_id = getattr(self, "_current_trace_id", None)
             if trace_id and hasattr(response, 'usage_metadata'):
                 usage = response.usage_metadata
                 model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
@@ -486,18 +572,19 @@ class AnalysisAgent:
         logger.info(f"Fallback extracted {len(result)} potential competitors")
         return result
     
-    def _extract_themes(self, sources: List[Dict], query: str = "") -> List[Dict]:
+    def _extract_themes(self, sources: List[Dict], query: str = "", trace_id: Optional[str] = None) -> List[Dict]:
         """
         Identify content themes using LLM-based concept extraction
 
         Args:
             sources: List of source dictionaries
             query: Original search query for context
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             List of theme dictionaries with multi-word concepts
         """
-        from core.prompts import THEME_EXTRACTION_PROMPT
+        from core.prompts import THEME_EXTRACTION_TEMPLATE, split_prompt
 
         # Build source content for LLM analysis
         source_content_parts = []
@@ -514,20 +601,21 @@ class AnalysisAgent:
             return []
 
         # Format the prompt
-        prompt = THEME_EXTRACTION_PROMPT.format(
+        prompt = THEME_EXTRACTION_TEMPLATE.format(
             query=query or "market research",
             source_content=source_content
         )
 
         try:
-            # Call LLM for theme extraction
+            # Call LLM for theme extraction; static instructions go first so
+            # they form a cacheable request prefix
+            instructions, data = split_prompt(prompt)
             llm_start = datetime.now()
-            response = self.llm.invoke(prompt)
+            response = self.llm.invoke([SystemMessage(content=instructions), HumanMessage(content=data)])
             llm_end = datetime.now()
             content = response.content.strip()
 
             # Log LLM call to Langfuse
-            trace_id = getattr(self, "_current_trace_id", None)
             if trace_id and hasattr(response, 'usage_metadata'):
                 usage = response.usage_metadata
                 model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
@@ -603,11 +691,14 @@ class AnalysisAgent:
             # Fallback to empty themes rather than garbage word frequency
             return []
 
-    def _add_contextual_sentiment(self, themes: List[Dict], sources: List[Dict]) -> List[Dict]:
+    def _add_contextual_sentiment(
+        self, themes: List[Dict], sources: List[Dict], trace_id: Optional[str] = None
+    ) -> List[Dict]:
         """
         Add contextual sentiment analysis to themes (Phase 5)
         
-        Uses parallel processing if enabled (default) for 4-5x speedup.
+        Sends all themes in one batched LLM call if enabled (default),
+        otherwise one call per theme, in parallel if enabled.
 
         Instead of bare numeric sentiment, provide:
         - sentiment_summary: Readable sentence describing overall sentiment
@@ -616,6 +707,7 @@ class AnalysisAgent:
         Args:
             themes: List of theme dictionaries with source_evidence
             sources: Original source data
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             Themes with contextual sentiment added
@@ -623,21 +715,122 @@ class AnalysisAgent:
         if not themes:
             return themes
         
+        if config.ENABLE_BATCHED_SENTIMENT and len(themes) > 1:
+            logger.info(f"Processing sentiment for {len(themes)} themes in one batched call")
+            return self._add_contextual_sentiment_batched(themes, sources, trace_id)
+
         # Check if parallel processing is enabled
         if config.ENABLE_PARALLEL_SENTIMENT and len(themes) > 1:
             logger.info(f"Processing sentiment for {len(themes)} themes in parallel (max_workers={config.SENTIMENT_MAX_WORKERS})")
-            return self._add_contextual_sentiment_parallel(themes, sources)
+            return self._add_contextual_sentiment_parallel(themes, sources, trace_id)
         else:
             logger.info(f"Processing sentiment for {len(themes)} themes sequentially")
-            return self._add_contextual_sentiment_sequential(themes, sources)
+            return self._add_contextual_sentiment_sequential(themes, sources, trace_id)
     
-    def _add_contextual_sentiment_parallel(self, themes: List[Dict], sources: List[Dict]) -> List[Dict]:
+    def _add_contextual_sentiment_batched(
+        self, themes: List[Dict], sources: List[Dict], trace_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Add contextual sentiment for all themes with a single LLM call
+
+        Themes the batched response does not cover fall back to per-theme
+        calls, run in parallel when ENABLE_PARALLEL_SENTIMENT is set.
+
+        Args:
+            themes: List of theme dictionaries
+            sources: Original source data
+            trace_id: Optional Langfuse trace ID for observability
+
+        Returns:
+            Updated themes with sentiment added
+        """
+        from core.prompts import CONTEXTUAL_SENTIMENT_BATCH_TEMPLATE, split_prompt
+
+        batch = []
+        for idx, theme in enumerate(themes):
+            quotes = self._collect_theme_quotes(theme, sources)
+            if quotes:
+                batch.append({"theme_idx": idx, "theme": theme.get("theme", ""), "quotes": quotes[:10]})
+            else:
+                theme["sentiment_summary"] = "Insufficient data for sentiment analysis"
+                theme["sentiment_signals"] = []
+
+        if not batch:
+            return themes
+
+        prompt = CONTEXTUAL_SENTIMENT_BATCH_TEMPLATE.format(
+            themes_with_quotes=orjson.dumps(batch).decode()
+        )
+
+        results = {}
+        try:
+            instructions, data = split_prompt(prompt)
+            llm_start = datetime.now()
+            response = self.llm.invoke([SystemMessage(content=instructions), HumanMessage(content=data)])
+            llm_end = datetime.now()
+            content = response.content.strip()
+
+            # Log LLM call to Langfuse
+            if trace_id and hasattr(response, 'usage_metadata'):
+                usage = response.usage_metadata
+                model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
+                log_llm_call(
+                    trace_id=trace_id,
+                    name="contextual-sentiment-batch",
+                    model=model_name,
+                    input_text=prompt,
+                    output_text=content,
+                    input_tokens=usage.get('input_tokens', 0),
+                    output_tokens=usage.get('output_tokens', 0),
+                    start_time=llm_start,
+                    end_time=llm_end,
+                )
+
+            # Parse JSON response
+            if "```json" in content:
+                content = content.split("```json")[1].split("```")[0].strip()
+            elif "```" in content:
+                content = content.split("```")[1].split("```")[0].strip()
+
+            for item in json.loads(content).get("themes", []):
+                if isinstance(item, dict) and isinstance(item.get("theme_idx"), int):
+                    results[item["theme_idx"]] = item
+
+        except Exception as e:
+            logger.warning(f"Batched contextual sentiment failed, falling back to per-theme calls: {e}")
+
+        uncovered = []
+        for entry in batch:
+            idx = entry["theme_idx"]
+            result = results.get(idx)
+            if result is None:
+                uncovered.append(idx)
+                continue
+            themes[idx]["sentiment_summary"] = result.get("sentiment_summary", "")
+            themes[idx]["sentiment_signals"] = result.get("sentiment_signals", [])
+
+        if uncovered:
+            missing = [themes[idx] for idx in uncovered]
+            if config.ENABLE_PARALLEL_SENTIMENT and len(missing) > 1:
+                missing = self._add_contextual_sentiment_parallel(missing, sources, trace_id)
+            else:
+                missing = self._add_contextual_sentiment_sequential(missing, sources, trace_id)
+            for idx, theme in zip(uncovered, missing):
+                themes[idx] = theme
+
+        logger.info(f"Added contextual sentiment to {len(themes)} themes (batched, {len(results)}/{len(batch)} from one call)")
+        return themes
+
+    def _add_contextual_sentiment_parallel(
+        self, themes: List[Dict], sources: List[Dict], trace_id: Optional[str] = None
+    ) -> List[Dict]:
         """
         Add contextual sentiment analysis using parallel execution
         
         Args:
             themes: List of theme dictionaries
             sources: Original source data
+            trace_id: Optional Langfuse trace ID for observability
             
         Returns:
             Updated themes with sentiment added
@@ -646,7 +839,7 @@ class AnalysisAgent:
         with ThreadPoolExecutor(max_workers=config.SENTIMENT_MAX_WORKERS) as executor:
             # Submit all tasks
             futures = {
-                executor.submit(self._process_single_theme_sentiment, theme, sources, idx): idx
+                executor.submit(self._process_single_theme_sentiment, theme, sources, idx, trace_id): idx
                 for idx, theme in enumerate(themes)
             }
             
@@ -665,20 +858,23 @@ class AnalysisAgent:
         logger.info(f"Added contextual sentiment to {len(themes)} themes (parallel)")
         return themes
     
-    def _add_contextual_sentiment_sequential(self, themes: List[Dict], sources: List[Dict]) -> List[Dict]:
+    def _add_contextual_sentiment_sequential(
+        self, themes: List[Dict], sources: List[Dict], trace_id: Optional[str] = None
+    ) -> List[Dict]:
         """
         Add contextual sentiment analysis sequentially (fallback mode)
         
         Args:
             themes: List of theme dictionaries
             sources: Original source data
+            trace_id: Optional Langfuse trace ID for observability
             
         Returns:
             Updated themes with sentiment added
         """
         for idx, theme in enumerate(themes):
             try:
-                themes[idx] = self._process_single_theme_sentiment(theme, sources, idx)
+                themes[idx] = self._process_single_theme_sentiment(theme, sources, idx, trace_id)
             except Exception as e:
                 theme_name = theme.get("theme", "unknown")[:30]
                 logger.warning(f"Sentiment analysis failed for theme {idx} ('{theme_name}'): {e}")
@@ -687,7 +883,30 @@ class AnalysisAgent:
         logger.info(f"Added contextual sentiment to {len(themes)} themes (sequential)")
         return themes
     
-    def _process_single_theme_sentiment(self, theme: Dict, sources: List[Dict], idx: int) -> Dict:
+    @staticmethod
+    def _collect_theme_quotes(theme: Dict, sources: List[Dict]) -> List[str]:
+        """
+        Collect a theme's evidence quotes, each prefixed with its source title
+
+        Args:
+            theme: Theme dictionary with source_evidence
+            sources: Original source data
+
+        Returns:
+            List of formatted quotes
+        """
+        quotes = []
+        for evidence in theme.get("source_evidence", []):
+            quote = evidence.get("quote", "")
+            source_idx = evidence.get("source_idx")
+            if quote and source_idx is not None and source_idx < len(sources):
+                source_title = sources[source_idx].get("title", "Unknown source")
+                quotes.append(f"[{source_title}]: \"{quote}\"")
+        return quotes
+
+    def _process_single_theme_sentiment(
+        self, theme: Dict, sources: List[Dict], idx: int, trace_id: Optional[str] = None
+    ) -> Dict:
         """
         Process sentiment for a single theme (runs in thread pool or sequentially)
         
@@ -695,23 +914,15 @@ class AnalysisAgent:
             theme: Theme dictionary with source_evidence
             sources: Original source data
             idx: Theme index (for logging)
+            trace_id: Optional Langfuse trace ID for observability
             
         Returns:
             Updated theme with sentiment_summary and sentiment_signals
         """
-        from core.prompts import CONTEXTUAL_SENTIMENT_PROMPT
+        from core.prompts import CONTEXTUAL_SENTIMENT_TEMPLATE, split_prompt
         
         theme_name = theme.get("theme", "")
-        source_evidence = theme.get("source_evidence", [])
-        
-        # Collect quotes for this theme
-        quotes = []
-        for evidence in source_evidence:
-            quote = evidence.get("quote", "")
-            source_idx = evidence.get("source_idx")
-            if quote and source_idx is not None and source_idx < len(sources):
-                source_title = sources[source_idx].get("title", "Unknown source")
-                quotes.append(f"[{source_title}]: \"{quote}\"")
+        quotes = self._collect_theme_quotes(theme, sources)
         
         if not quotes:
             # No quotes available, use default sentiment
@@ -720,20 +931,20 @@ class AnalysisAgent:
             return theme
         
         # Format prompt
-        prompt = CONTEXTUAL_SENTIMENT_PROMPT.format(
+        prompt = CONTEXTUAL_SENTIMENT_TEMPLATE.format(
             theme=theme_name,
             quotes="\n".join(quotes[:10])  # Limit to 10 quotes
         )
         
         try:
             # Call LLM for contextual sentiment (synchronous, but runs in thread pool)
+            instructions, data = split_prompt(prompt)
             llm_start = datetime.now()
-            response = self.llm.invoke(prompt)
+            response = self.llm.invoke([SystemMessage(content=instructions), HumanMessage(content=data)])
             llm_end = datetime.now()
             content = response.content.strip()
             
             # Log LLM call to Langfuse
-            trace_id = getattr(self, "_current_trace_id", None)
             if trace_id and hasattr(response, 'usage_metadata'):
                 usage = response.usage_metadata
                 model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
@@ -765,7 +976,7 @@ class AnalysisAgent:
             
         except Exception as e:
             logger.warning(f"Contextual sentiment analysis failed for '{theme_name[:30]}': {e}")
-            theme["sentiment_summary"] = "Sentiment analysis unavailable"
+            theme["sentiment_summary"] = _SENTIMENT_UNAVAILABLE
             theme["sentiment_signals"] = []
         
         return theme
@@ -3,6 +3,8 @@ from datetime import datetime
 import logging
 import math
 
+from core.state import elapsed_seconds
+
 try:
     from fuzzywuzzy import fuzz
     FUZZYWUZZY_AVAILABLE = True
@@ -42,7 +44,6 @@ class QualityAgent:
         Returns:
             Final quality report with validated insights
         """
-        self._current_trace_id = trace_id
         logger.info("Quality Agent: Validating outputs")
         
         # Extract outputs from state (handle None values)
@@ -64,8 +65,7 @@ class QualityAgent:
         flags = self._generate_quality_flags(validation_results, research_data)
         
         # Calculate processing time
-        start_time = state.get("start_time", datetime.now())
-        processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = elapsed_seconds(state)
         
         # Compile final report
         final_report = {
@@ -76,7 +76,8 @@ class QualityAgent:
                 "processing_time_seconds": int(processing_time),
                 "confidence_score": confidence,
                 "api_calls": state.get("api_calls", 0),
-                "total_tokens": state.get("total_tokens", 0)
+                "total_tokens": state.get("total_tokens", 0),
+                "errors": state.get("errors", [])
             },
             "validated_insights": {
                 "competitors": analysis.get("competitors", []),
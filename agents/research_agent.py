@@ -1,5 +1,5 @@
 import requests
-import aiohttp
+from requests.adapters import HTTPAdapter
 import asyncio
 import concurrent.futures
 import threading
@@ -8,7 +8,7 @@ import praw
 from typing import Dict, List, Optional
 from datetime import datetime
 from core.config import config
-from core.observability import _active_trace_ids, get_langfuse_client, create_span, end_span
+from core.observability import get_active_trace, get_langfuse_client, create_span, end_span
 from utils.error_handler import retry_on_failure
 from utils.cache_manager import get_cache_manager, CacheManager
 import logging
@@ -35,6 +35,12 @@ class ResearchAgent:
         # Serper.dev API
         self.serper_api_key = config.SERPER_API_KEY
 
+        # Pooled HTTP session: each research run gets a fresh event loop, so a
+        # loop-bound async client can't be reused, but a Session keeps its
+        # keep-alive connections (and TLS sessions) across runs
+        self.http = requests.Session()
+        self.http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
         # Google Trends
         self.trends_client = TrendReq(hl='en-US', tz=360)
 
@@ -61,18 +67,18 @@ class ResearchAgent:
         # Thread pool executor for running non-async libraries (pytrends, praw)
         self.executor = ThreadPoolExecutor(max_workers=3)
 
-    def _trace_api_call(self, name: str, input_data: dict, output_data: dict, duration_ms: float):
+    def _trace_api_call(self, trace_id: Optional[str], name: str, input_data: dict, output_data: dict, duration_ms: float):
         """
         Log an API call to Langfuse as a span (v3 API)
 
         Args:
+            trace_id: Langfuse trace ID of the run making the call
             name: Name of the API call (e.g., "serper_web_search")
             input_data: Input data sent to the API
             output_data: Response from the API
             duration_ms: Duration in milliseconds
         """
-        trace_id = getattr(self, "_current_trace_id", None)
-        if not trace_id or trace_id not in _active_trace_ids:
+        if not trace_id or get_active_trace(trace_id) is None:
             return
 
         try:
@@ -95,7 +101,6 @@ class ResearchAgent:
         Returns:
             Dict containing sources, trends, discussions, and metadata
         """
-        self._current_trace_id = trace_id
         logger.info(f"Research Agent: Processing query '{query}'")
 
         # Check cache first
@@ -117,7 +122,7 @@ class ResearchAgent:
                 new_loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(new_loop)
                 try:
-                    result = new_loop.run_until_complete(self._run_parallel(query))
+                    result = new_loop.run_until_complete(self._run_parallel(query, trace_id))
                     result_future.set_result(result)
                 except Exception as e:
                     result_future.set_exception(e)
@@ -134,7 +139,7 @@ class ResearchAgent:
             asyncio.set_event_loop(loop)
             try:
                 web_results, trends_data, reddit_data = loop.run_until_complete(
-                    self._run_parallel(query)
+                    self._run_parallel(query, trace_id)
                 )
             finally:
                 loop.close()
@@ -167,21 +172,22 @@ class ResearchAgent:
         logger.info(f"Research Agent: Found {len(web_results)} web sources, {len(reddit_data)} discussions")
         return output
 
-    async def _run_parallel(self, query: str) -> tuple:
+    async def _run_parallel(self, query: str, trace_id: Optional[str] = None) -> tuple:
         """
         Run all three API calls in parallel
 
         Args:
             query: User's search query
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             Tuple of (web_results, trends_data, reddit_data)
         """
         # Execute all three API calls concurrently
         web_results, trends_data, reddit_data = await asyncio.gather(
-            self._search_web(query),
-            self._get_trends(query),
-            self._search_reddit(query),
+            self._search_web(query, trace_id),
+            self._get_trends(query, trace_id),
+            self._search_reddit(query, trace_id=trace_id),
             return_exceptions=True
         )
 
@@ -198,12 +204,13 @@ class ResearchAgent:
 
         return web_results, trends_data, reddit_data
     
-    async def _search_web(self, query: str) -> List[Dict]:
+    async def _search_web(self, query: str, trace_id: Optional[str] = None) -> List[Dict]:
         """
         Search web via Serper.dev API (async) with caching
 
         Args:
             query: Search query
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             List of web sources with title, snippet, URL, date
@@ -217,6 +224,7 @@ class ResearchAgent:
                 logger.debug(f"Web search CACHE HIT for query '{query}'")
                 duration_ms = (datetime.now() - start_time).total_seconds() * 1000
                 self._trace_api_call(
+                    trace_id,
                     "serper_web_search",
                     {"query": query, "cached": True},
                     {"results_count": len(cached_result)},
@@ -237,10 +245,7 @@ class ResearchAgent:
                 "hl": "en"   # Language: English
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    response.raise_for_status()
-                    results = await response.json()
+            results = await asyncio.to_thread(self._post_json, url, headers, payload)
 
             sources = []
 
@@ -266,6 +271,7 @@ class ResearchAgent:
             # Trace the API call
             duration_ms = (datetime.now() - start_time).total_seconds() * 1000
             self._trace_api_call(
+                trace_id,
                 "serper_web_search",
                 {"query": query, "num_requested": 20},
                 {"results_count": len(sources)},
@@ -278,33 +284,42 @@ class ResearchAgent:
         except Exception as e:
             duration_ms = (datetime.now() - start_time).total_seconds() * 1000
             self._trace_api_call(
+                trace_id,
                 "serper_web_search",
                 {"query": query},
                 {"error": str(e)},
                 duration_ms
             )
-            logger.error(f"Serper.dev API error: {e}", exc_info=True)
+            logger.error(f"Serper.dev API error: {e}", exc_info=config.LOG_TRACEBACKS)
             return []
     
-    async def _get_trends(self, query: str) -> Dict:
+    def _post_json(self, url: str, headers: Dict, payload: Dict) -> Dict:
+        """POST a JSON payload over the pooled session and return the JSON response"""
+        response = self.http.post(url, headers=headers, json=payload, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_trends(self, query: str, trace_id: Optional[str] = None) -> Dict:
         """
         Get Google Trends data (async via thread pool)
 
         Args:
             query: Search term
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             Dict with trend data and average interest
         """
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(self.executor, self._get_trends_sync, query)
+        return await loop.run_in_executor(self.executor, self._get_trends_sync, query, trace_id)
 
-    def _get_trends_sync(self, query: str) -> Dict:
+    def _get_trends_sync(self, query: str, trace_id: Optional[str] = None) -> Dict:
         """
         Synchronous Google Trends data fetching (runs in thread pool) with caching
 
         Args:
             query: Search term
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             Dict with trend data and average interest
@@ -318,6 +333,7 @@ class ResearchAgent:
                 logger.debug(f"Trends CACHE HIT for query '{query}'")
                 duration_ms = (datetime.now() - start_time).total_seconds() * 1000
                 self._trace_api_call(
+                    trace_id,
                     "google_trends",
                     {"query": query, "cached": True},
                     {"average_interest": cached_result.get("average_interest", 0)},
@@ -356,6 +372,7 @@ class ResearchAgent:
                 # Trace the API call
                 duration_ms = (datetime.now() - start_time).total_seconds() * 1000
                 self._trace_api_call(
+                    trace_id,
                     "google_trends",
                     {"query": query, "timeframe": "today 3-m"},
                     {"average_interest": avg_interest, "data_points": len(trend_dict)},
@@ -367,6 +384,7 @@ class ResearchAgent:
             else:
                 duration_ms = (datetime.now() - start_time).total_seconds() * 1000
                 self._trace_api_call(
+                    trace_id,
                     "google_trends",
                     {"query": query},
                     {"no_data": True},
@@ -379,6 +397,7 @@ class ResearchAgent:
             duration_ms = (datetime.now() - start_time).total_seconds() * 1000
             error_str = str(e)
             self._trace_api_call(
+                trace_id,
                 "google_trends",
                 {"query": query},
                 {"error": error_str},
@@ -391,27 +410,29 @@ class ResearchAgent:
                 logger.warning(f"Trends API error: {e}")
             return {}
     
-    async def _search_reddit(self, query: str, limit: int = 10) -> List[Dict]:
+    async def _search_reddit(self, query: str, limit: int = 10, trace_id: Optional[str] = None) -> List[Dict]:
         """
         Search Reddit discussions (async via thread pool)
 
         Args:
             query: Search query
             limit: Maximum number of results
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             List of Reddit posts with metadata
         """
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(self.executor, self._search_reddit_sync, query, limit)
+        return await loop.run_in_executor(self.executor, self._search_reddit_sync, query, limit, trace_id)
 
-    def _search_reddit_sync(self, query: str, limit: int = 10) -> List[Dict]:
+    def _search_reddit_sync(self, query: str, limit: int = 10, trace_id: Optional[str] = None) -> List[Dict]:
         """
         Synchronous Reddit search (runs in thread pool) with caching
 
         Args:
             query: Search query
             limit: Maximum number of results
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             List of Reddit posts with metadata
@@ -429,6 +450,7 @@ class ResearchAgent:
                 logger.debug(f"Reddit search CACHE HIT for query '{query}'")
                 duration_ms = (datetime.now() - start_time).total_seconds() * 1000
                 self._trace_api_call(
+                    trace_id,
                     "reddit_search",
                     {"query": query, "cached": True},
                     {"discussions_count": len(cached_result)},
@@ -461,6 +483,7 @@ class ResearchAgent:
             # Trace the API call
             duration_ms = (datetime.now() - start_time).total_seconds() * 1000
             self._trace_api_call(
+                trace_id,
                 "reddit_search",
                 {"query": query, "limit": limit},
                 {"discussions_count": len(discussions)},
@@ -473,6 +496,7 @@ class ResearchAgent:
         except Exception as e:
             duration_ms = (datetime.now() - start_time).total_seconds() * 1000
             self._trace_api_call(
+                trace_id,
                 "reddit_search",
                 {"query": query},
                 {"error": str(e)},
@@ -1,16 +1,257 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
-from core.prompts import POSITIONING_PROMPT, CONTENT_GAP_PROMPT, STRATEGIC_MOVES_PROMPT, CONTENT_GAP_ANALYSIS_PROMPT, OPPORTUNITY_SCORING_PROMPT, CONTENT_GAP_WITH_SCORING_PROMPT
+from langchain_core.messages import SystemMessage, HumanMessage
+from pydantic import BaseModel
+from core.prompts import POSITIONING_PROMPT, CONTENT_GAP_PROMPT, STRATEGIC_MOVES_PROMPT, CONTENT_GAP_ANALYSIS_TEMPLATE, OPPORTUNITY_SCORING_TEMPLATE, FUSED_STRATEGY_TEMPLATE, CompiledPrompt, build_gap_scoring_prompt, split_prompt
 from core.config import config
 from core.observability import log_llm_call
-from typing import Dict, List, Optional
+from utils.cache_manager import get_cache_manager, CacheManager
+from utils.async_loop import run_sync
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime
+from functools import cached_property
+import asyncio
+import hashlib
+import heapq
 import json
 import logging
+import math
 import re
+import numpy as np
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Grid points further than 2.5 units from every competitor are opportunity
+# zones; compare squared distances so the threshold check needs no sqrt
+_MIN_ZONE_DISTANCE_SQ = 2.5 ** 2
+
+# Template phrases that mark a content topic as too generic
+_GENERIC_TOPIC_RE = re.compile(
+    r'deep dive into|everything about|best practices for|complete guide to'
+    r'|all you need to know|introduction to|getting started with',
+    re.IGNORECASE
+)
+
+# Candidate opportunity-zone points, every 2 units across the map
+_GRID_POINTS = np.array(
+    [(x, y) for x in range(2, 10, 2) for y in range(2, 10, 2)],
+    dtype=np.float64
+)
+
+# Positioning-map regions: (region_x, region_y) -> (zone description, strategic move)
+# x bands: <4, [4, 5), [5, 6], >6; y bands: <4, [4, 7], >7
+_ZONE_REGIONS = {
+    (0, 2): ("Budget enterprise gap", "Position as 'enterprise features at SMB pricing'"),
+    (1, 2): ("Budget enterprise gap", "Position as 'enterprise features at SMB pricing'"),
+    (2, 2): ("Mid-price enterprise gap", "Position in mid-market sweet spot with balanced offering"),
+    (3, 0): ("Premium SMB gap", "Target premium small business segment with high-touch service"),
+    (1, 0): ("Market gap", "Position in mid-market sweet spot with balanced offering"),
+    (1, 1): ("Market gap", "Position in mid-market sweet spot with balanced offering"),
+    (2, 0): ("Market gap", "Position in mid-market sweet spot with balanced offering"),
+    (2, 1): ("Market gap", "Position in mid-market sweet spot with balanced offering"),
+}
+_DEFAULT_REGION = ("Market gap", None)
+
+
+def _region(x: float, y: float) -> tuple:
+    """Quantize a positioning-map point into its (region_x, region_y) key"""
+    rx = 0 if x < 4 else 1 if x < 5 else 2 if x <= 6 else 3
+    ry = 0 if y < 4 else 1 if y <= 7 else 2
+    return rx, ry
+
+
+def _fallback_grid(n: int) -> List[tuple]:
+    """Evenly spaced (x, y) coordinates for n competitors on a square-ish grid"""
+    cols = math.isqrt(n - 1) + 1 if n else 1  # == ceil(sqrt(n)) without float math
+    rows_span = max(n // cols, 1)
+    x_step = 6.0 / max(cols - 1, 1)
+    return [
+        (round(2.0 + (i % cols) * x_step, 1), round(2.0 + (i // cols) * 6.0 / rows_span, 1))
+        for i in range(n)
+    ]
+
+
+# Fallback layouts for typical competitor counts, computed once
+_FALLBACK_COORDS = {n: _fallback_grid(n) for n in range(1, 64)}
+
+
+# Finds the first JSON object in an LLM response in one pass, tolerating
+# markdown fences or prose around it
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str) -> Optional[Dict]:
+    """Decode the first JSON object in text, or None if there is none"""
+    start = text.find("{")
+    if start < 0:
+        return None
+    return _JSON_DECODER.raw_decode(text, start)[0]
+
+
+# Prompt payload limits: long evidence quotes dominate input tokens
+_MAX_EVIDENCE_PER_THEME = 3
+_MAX_QUOTE_CHARS = 200
+
+
+def _compact_json(data) -> str:
+    """Serialize prompt data without indentation whitespace"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _themes_with_evidence(themes: List[Dict]) -> List[Dict]:
+    """Top themes with their leading evidence quotes, trimmed for the prompt"""
+    return [
+        {
+            "theme": theme.get("theme", ""),
+            "user_interest": theme.get("user_interest", ""),
+            "source_evidence": [
+                {**e, "quote": (e.get("quote") or "")[:_MAX_QUOTE_CHARS]}
+                for e in theme.get("source_evidence", [])[:_MAX_EVIDENCE_PER_THEME]
+            ]
+        }
+        for theme in themes[:5]
+    ]
+
+
+def _source_evidence(themes: List[Dict]) -> List[Dict]:
+    """Flattened, trimmed evidence quotes across the top themes"""
+    return [
+        {
+            "theme": theme.get("theme", ""),
+            "quote": (e.get("quote") or "")[:_MAX_QUOTE_CHARS],
+            "source_idx": e.get("source_idx")
+        }
+        for theme in themes[:5]
+        for e in theme.get("source_evidence", [])[:_MAX_EVIDENCE_PER_THEME]
+    ]
+
+
+# Structured-output schemas for the strategy LLM calls (OpenAI strict JSON schema)
+
+class CompetitorPosition(BaseModel):
+    """Positioning coordinates for one competitor"""
+    name: str
+    x: float
+    y: float
+    rationale: str
+
+
+class PositioningResponse(BaseModel):
+    """Positioning map LLM output"""
+    positions: List[CompetitorPosition]
+
+
+class ScoreReasoning(BaseModel):
+    """Evidence behind an opportunity score"""
+    demand_signal: float
+    demand_evidence: str
+    competitive_gap: float
+    gap_evidence: str
+    actionability: float
+    actionability_reasoning: str
+
+
+class ContentRecommendation(BaseModel):
+    """Content gap recommendation"""
+    topic: str
+    gap_reasoning: str
+    target_audience: str
+    recommended_format: str
+    format_rationale: str
+    why_now: str
+
+
+class ContentGapResponse(BaseModel):
+    """Content gap analysis LLM output"""
+    recommendations: List[ContentRecommendation]
+
+
+class ScoredContentRecommendation(ContentRecommendation):
+    """Content gap recommendation with its opportunity score"""
+    opportunity_score: float
+    score_reasoning: ScoreReasoning
+
+
+class ScoredContentGapResponse(BaseModel):
+    """Combined content gap + scoring LLM output"""
+    recommendations: List[ScoredContentRecommendation]
+
+
+class OpportunityScore(BaseModel):
+    """Opportunity score for one recommendation topic"""
+    topic: str
+    opportunity_score: float
+    score_reasoning: ScoreReasoning
+
+
+class OpportunityScoringResponse(BaseModel):
+    """Opportunity scoring LLM output"""
+    scored_recommendations: List[OpportunityScore]
+
+
+class _JSONArrayStreamParser:
+    """
+    Incrementally extract complete objects from a JSON array inside streamed text
+
+    Feed raw LLM chunks; each object in the array under `key` is returned as
+    soon as its closing brace arrives, without waiting for the full document.
+    """
+
+    def __init__(self, key: str):
+        self._marker = f'"{key}"'
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._obj_start = -1
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Add a chunk of streamed text
+
+        Args:
+            chunk: Next piece of LLM output
+
+        Returns:
+            Objects completed by this chunk
+        """
+        self._buffer += chunk
+        if not self._in_array:
+            marker = self._buffer.find(self._marker)
+            bracket = self._buffer.find("[", marker) if marker >= 0 else -1
+            if bracket < 0:
+                return []
+            self._in_array = True
+            self._pos = bracket + 1
+
+        completed = []
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._obj_start = i
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        completed.append(orjson.loads(buffer[self._obj_start:i + 1]))
+                    except orjson.JSONDecodeError:
+                        logger.debug("Skipping unparseable streamed object")
+        self._pos = len(buffer)
+        return completed
+
 
 class StrategyAgent:
     """
@@ -24,20 +265,103 @@ class StrategyAgent:
     """
     
     def __init__(self):
-        """Initialize Strategy Agent with LLM"""
-        self.llm = ChatOpenAI(
+        """Initialize Strategy Agent (LLM clients are created on first use)"""
+        # Plan cache for repeated competitor/theme structures
+        self.cache = get_cache_manager()
+
+        # Pre-render the static instructions of the positioning prompt once; only
+        # the competitor payload changes per call, and a stable system message
+        # keeps provider-side prompt caching effective.
+        instructions, data_template = split_prompt(POSITIONING_PROMPT)
+        self._positioning_data_template = CompiledPrompt(data_template)
+        # The instructions have no fields; format() only resolves {{ }} escapes
+        self._positioning_instructions = instructions.format()
+
+        logger.info("Strategy Agent initialized with gpt-4.1-mini")
+
+    # LLM clients are built lazily so importing/constructing the agent does not
+    # pull in the LangChain/OpenAI SDKs until the first LLM call
+
+    @cached_property
+    def llm(self):
+        """LangChain chat model for the content gap and scoring prompts"""
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
             model="gpt-4.1-mini",  # Using gpt-4.1-mini for cost efficiency
             temperature=0.3,  # Lower temperature for more consistent outputs
             max_tokens=2000,
             api_key=config.OPENAI_API_KEY
         )
-        
-        logger.info("Strategy Agent initialized with gpt-4.1-mini")
+
+    @cached_property
+    def llm_fast(self):
+        """Cheaper, deterministic chat model for simple scoring tasks"""
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
+            model="gpt-4o-mini",
+            temperature=0.0,
+            max_tokens=1000,
+            api_key=config.OPENAI_API_KEY
+        )
+
+    @cached_property
+    def openai_client(self):
+        """
+        Direct OpenAI client for the positioning prompt (structured outputs)
+
+        Reuses the ChatOpenAI model's underlying AsyncOpenAI client, whose httpx
+        connection pool LangChain shares process-wide across all ChatOpenAI
+        instances, so positioning calls ride the same keep-alive connections.
+        """
+        return self.llm.root_async_client
+
+    # Structured-output variants: the API guarantees schema-valid JSON, so
+    # responses need no fence stripping or parse fallbacks
+
+    @cached_property
+    def content_gap_llm(self):
+        """Content gap analysis model with ContentGapResponse output"""
+        return self.llm.with_structured_output(
+            ContentGapResponse, method="json_schema", include_raw=True
+        )
+
+    @cached_property
+    def scored_content_gap_llm(self):
+        """Combined gap + scoring model with ScoredContentGapResponse output"""
+        return self.llm.with_structured_output(
+            ScoredContentGapResponse, method="json_schema", include_raw=True
+        )
+
+    @cached_property
+    def scoring_llm(self):
+        """Opportunity scoring model (fast model) with OpportunityScoringResponse output"""
+        return self.llm_fast.with_structured_output(
+            OpportunityScoringResponse, method="json_schema", include_raw=True
+        )
     
     def run(self, analysis_insights: Dict, trace_id: Optional[str] = None, query: str = "") -> Dict:
+        """
+        Generate positioning strategies and recommendations (sync wrapper around arun)
+
+        Args:
+            analysis_insights: Output from Analysis Agent
+            trace_id: Optional Langfuse trace ID for observability
+            query: Original search query for context
+
+        Returns:
+            Dict with positioning map, opportunity zones, and recommendations
+        """
+        # The shared AsyncOpenAI client's connection pool is bound to the loop
+        # it first ran on, so every sync call runs on the same persistent loop
+        return run_sync(self.arun(analysis_insights, trace_id, query))
+
+    async def arun(self, analysis_insights: Dict, trace_id: Optional[str] = None, query: str = "") -> Dict:
         """
         Generate positioning strategies and recommendations
 
+        The positioning map and content recommendations are independent LLM
+        calls, so they run concurrently.
+
         Args:
             analysis_insights: Output from Analysis Agent
             trace_id: Optional Langfuse trace ID for observability
@@ -46,50 +370,270 @@ class StrategyAgent:
         Returns:
             Dict with positioning map, opportunity zones, and recommendations
         """
-        self._current_trace_id = trace_id
-        self._query = query
         logger.info("Strategy Agent: Generating recommendations")
 
         if not analysis_insights or not analysis_insights.get("competitors"):
             logger.warning("No analysis insights available")
             return self._empty_output()
 
-        # Generate positioning map
-        positioning_map = self._generate_positioning_map(
-            analysis_insights.get("competitor_attributes", {}),
-            analysis_insights.get("competitors", [])
+        # Check plan cache: the LLM-generated parts (positioning map and content
+        # recommendations) are reused, zones and moves are recomputed from them
+        cache_key = self._structural_key(analysis_insights, query)
+        cached_plan = self.cache.get(cache_key, CacheManager.CACHE_TYPE_STRATEGY)
+        if cached_plan:
+            logger.info("Strategy Agent: CACHE HIT for plan %s", cache_key[:12])
+            return self._assemble_output(
+                analysis_insights,
+                cached_plan["positioning_map"],
+                cached_plan["content_recommendations"]
+            )
+
+        if config.ENABLE_FUSED_STRATEGY_PROMPT:
+            # Single LLM call for positioning map + scored content recommendations
+            positioning_map, content_recs = await self._generate_all(analysis_insights, query, trace_id)
+        else:
+            # Generate positioning map and content recommendations concurrently
+            positioning_map, content_recs = await asyncio.gather(
+                self._generate_positioning_map(
+                    analysis_insights.get("competitor_attributes", {}),
+                    analysis_insights.get("competitors", []),
+                    trace_id
+                ),
+                self._build_content_recommendations(analysis_insights, query, trace_id)
+            )
+
+        self._cache_plan(cache_key, analysis_insights, query, positioning_map, content_recs)
+        output = self._assemble_output(analysis_insights, positioning_map, content_recs)
+
+        logger.info(
+            "Strategy Agent: Generated %d opportunity zones, %d content recommendations",
+            len(output["opportunity_zones"]), len(content_recs)
         )
+        return output
 
-        # Identify opportunity zones
-        opportunity_zones = self._detect_opportunity_zones(
-            positioning_map,
-            analysis_insights
+    async def run_stream(
+        self,
+        analysis_insights: Dict,
+        trace_id: Optional[str] = None,
+        query: str = ""
+    ) -> AsyncIterator[Dict]:
+        """
+        Generate recommendations, yielding partial results as they arrive
+
+        Emits {"stage": "positioning", "data": positioning_map} once the map is
+        ready, {"stage": "recommendation", "data": rec} for each content
+        recommendation as soon as its JSON object is complete in the LLM stream,
+        and finally {"stage": "complete", "data": output} with the same output
+        as run().
+
+        Args:
+            analysis_insights: Output from Analysis Agent
+            trace_id: Optional Langfuse trace ID for observability
+            query: Original search query for context
+
+        Yields:
+            Stage event dicts
+        """
+        logger.info("Strategy Agent: Streaming recommendations")
+
+        if not analysis_insights or not analysis_insights.get("competitors"):
+            logger.warning("No analysis insights available")
+            yield {"stage": "complete", "data": self._empty_output()}
+            return
+
+        cache_key = self._structural_key(analysis_insights, query)
+        cached_plan = self.cache.get(cache_key, CacheManager.CACHE_TYPE_STRATEGY)
+        if cached_plan:
+            logger.info("Strategy Agent: CACHE HIT for plan %s", cache_key[:12])
+            yield {
+                "stage": "complete",
+                "data": self._assemble_output(
+                    analysis_insights,
+                    cached_plan["positioning_map"],
+                    cached_plan["content_recommendations"]
+                )
+            }
+            return
+
+        positioning_task = asyncio.create_task(self._generate_positioning_map(
+            analysis_insights.get("competitor_attributes", {}),
+            analysis_insights.get("competitors", []),
+            trace_id
+        ))
+        positioning_sent = False
+
+        themes = analysis_insights.get("content_themes", [])
+        if config.ENABLE_COMBINED_CONTENT_SCORING and themes:
+            raw_recs = []
+            prompt = self._build_content_scoring_prompt(
+                themes, analysis_insights.get("competitors", []), query
+            )
+            parser = _JSONArrayStreamParser("recommendations")
+            try:
+                llm_start = datetime.now()
+                response = None
+                async for chunk in self.llm.astream(self._to_messages(prompt), stream_usage=True):
+                    response = chunk if response is None else response + chunk
+
+                    if not positioning_sent and positioning_task.done():
+                        positioning_sent = True
+                        yield {"stage": "positioning", "data": positioning_task.result()}
+
+                    for rec in parser.feed(chunk.content or ""):
+                        if len(raw_recs) >= 5:
+                            continue
+                        recommendation = self._to_scored_recommendation(rec, len(raw_recs))
+                        raw_recs.append(rec)
+                        if recommendation:
+                            yield {"stage": "recommendation", "data": recommendation}
+                llm_end = datetime.now()
+
+                # Log LLM call to Langfuse
+                if trace_id and response is not None and response.usage_metadata:
+                    usage = response.usage_metadata
+                    model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
+                    log_llm_call(
+                        trace_id=trace_id,
+                        name="content-gap-with-scoring",
+                        model=model_name,
+                        input_text=prompt,
+                        output_text=response.content,
+                        input_tokens=usage.get('input_tokens', 0),
+                        output_tokens=usage.get('output_tokens', 0),
+                        start_time=llm_start,
+                        end_time=llm_end,
+                    )
+            except Exception as e:
+                logger.error("LLM content gap + scoring stream failed: %s", e)
+            content_recs = self._to_scored_recommendations(raw_recs)
+        else:
+            # Legacy two-step path: scores only exist after the second call
+            content_recs = await self._build_content_recommendations(analysis_insights, query, trace_id)
+            for rec in content_recs:
+                yield {"stage": "recommendation", "data": rec}
+
+        positioning_map = await positioning_task
+        if not positioning_sent:
+            yield {"stage": "positioning", "data": positioning_map}
+
+        self._cache_plan(cache_key, analysis_insights, query, positioning_map, content_recs)
+        output = self._assemble_output(analysis_insights, positioning_map, content_recs)
+
+        logger.info(
+            "Strategy Agent: Streamed %d opportunity zones, %d content recommendations",
+            len(output["opportunity_zones"]), len(content_recs)
         )
+        yield {"stage": "complete", "data": output}
 
-        # Generate content recommendations
+    def _cache_plan(
+        self,
+        cache_key: str,
+        analysis_insights: Dict,
+        query: str,
+        positioning_map: Dict,
+        content_recs: List[Dict]
+    ):
+        """
+        Store the LLM-generated parts of a plan in the plan cache
+
+        Args:
+            cache_key: Structural plan-cache key
+            analysis_insights: Output from Analysis Agent
+            query: Original search query
+            positioning_map: Generated positioning map
+            content_recs: Generated content recommendations
+        """
+        # Only cache plans where the LLM calls produced usable output
+        if content_recs and positioning_map.get("companies"):
+            self.cache.set(
+                cache_key,
+                {
+                    "positioning_map": positioning_map,
+                    "content_recommendations": content_recs
+                },
+                CacheManager.CACHE_TYPE_STRATEGY,
+                query=query,
+                metadata={"competitors": len(analysis_insights.get("competitors", []))}
+            )
+
+    async def _build_content_recommendations(
+        self, analysis_insights: Dict, query: str = "", trace_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Generate scored content recommendations
+
+        Args:
+            analysis_insights: Output from Analysis Agent
+            query: Original search query for context
+            trace_id: Optional Langfuse trace ID for observability
+
+        Returns:
+            List of content recommendations with opportunity scores
+        """
         # Use combined prompt if optimization is enabled (saves 10-15s)
         if config.ENABLE_COMBINED_CONTENT_SCORING:
             logger.info("Using combined content gap + scoring (optimized)")
-            content_recs = self._generate_content_recommendations_with_scoring(
+            return await self._generate_content_recommendations_with_scoring(
                 analysis_insights.get("content_themes", []),
                 analysis_insights.get("competitors", []),
-                query=query
+                query=query,
+                trace_id=trace_id
             )
-        else:
-            logger.info("Using separate content gap + scoring (legacy)")
-            # Phase 3: LLM-based gap analysis
-            content_recs = self._generate_content_recommendations(
+
+        logger.info("Using separate content gap + scoring (legacy)")
+        # Phase 3: LLM-based gap analysis
+        content_recs = await self._generate_content_recommendations(
+            analysis_insights.get("content_themes", []),
+            analysis_insights.get("competitors", []),
+            query=query,
+            trace_id=trace_id
+        )
+        # Phase 4: Score recommendations separately (depends on gap analysis)
+        if content_recs:
+            content_recs = await self._score_recommendations(
+                content_recs,
                 analysis_insights.get("content_themes", []),
                 analysis_insights.get("competitors", []),
-                query=query
+                trace_id
             )
-            # Phase 4: Score recommendations separately
-            if content_recs:
-                content_recs = self._score_recommendations(
-                    content_recs,
-                    analysis_insights.get("content_themes", []),
-                    analysis_insights.get("competitors", [])
-                )
+        return content_recs
+
+    @staticmethod
+    def _to_messages(prompt: str) -> List:
+        """
+        Split a formatted strategy prompt into system (instructions) and human (data) messages
+
+        Keeping the static instructions in their own leading message makes them an
+        identical request prefix across calls, so OpenAI can reuse its prompt cache.
+
+        Args:
+            prompt: Formatted prompt containing the data delimiter
+
+        Returns:
+            List of LangChain messages
+        """
+        instructions, data = split_prompt(prompt)
+        if not instructions:
+            return [HumanMessage(content=data)]
+        return [SystemMessage(content=instructions), HumanMessage(content=data)]
+
+    def _assemble_output(self, analysis_insights: Dict, positioning_map: Dict, content_recs: List[Dict]) -> Dict:
+        """
+        Derive opportunity zones and strategic moves and build the final output
+
+        Args:
+            analysis_insights: Output from Analysis Agent
+            positioning_map: Positioning map (generated or from plan cache)
+            content_recs: Content recommendations (generated or from plan cache)
+
+        Returns:
+            Dict with positioning map, opportunity zones, and recommendations
+        """
+        # Identify opportunity zones
+        opportunity_zones = self._detect_opportunity_zones(
+            positioning_map,
+            analysis_insights
+        )
 
         # Strategic moves
         strategic_moves = self._generate_strategic_moves(
@@ -97,23 +641,51 @@ class StrategyAgent:
             opportunity_zones
         )
 
-        output = {
+        return {
             "positioning_map": positioning_map,
             "opportunity_zones": opportunity_zones,
             "content_recommendations": content_recs,
             "strategic_moves": strategic_moves
         }
-        
-        logger.info(f"Strategy Agent: Generated {len(opportunity_zones)} opportunity zones, {len(content_recs)} content recommendations")
-        return output
+
+    @staticmethod
+    def _structural_key(analysis_insights: Dict, query: str = "") -> str:
+        """
+        Build a plan-cache key from the structure of the analysis insights
+
+        Keys on sorted competitor names, rounded sentiments, and theme names
+        rather than raw text, so near-identical upstream results share a plan.
+
+        Args:
+            analysis_insights: Output from Analysis Agent
+            query: Original search query
+
+        Returns:
+            Hex digest cache key
+        """
+        competitors = analysis_insights.get("competitors", [])
+        attrs = analysis_insights.get("competitor_attributes", {})
+        signature = {
+            "query": query,
+            "comps": sorted(competitors),
+            "attrs": {c: round(attrs.get(c, {}).get("sentiment", 0.0), 1) for c in competitors},
+            "themes": sorted(t.get("theme", "") for t in analysis_insights.get("content_themes", []))
+        }
+        return hashlib.blake2b(
+            orjson.dumps(signature, option=orjson.OPT_SORT_KEYS),
+            digest_size=16
+        ).hexdigest()
     
-    def _generate_positioning_map(self, competitor_attrs: Dict, competitors: List[str]) -> Dict:
+    async def _generate_positioning_map(
+        self, competitor_attrs: Dict, competitors: List[str], trace_id: Optional[str] = None
+    ) -> Dict:
         """
         Use LLM to assign positioning coordinates
         
         Args:
             competitor_attrs: Competitor attributes from Analysis Agent
             competitors: List of competitor names
+            trace_id: Optional Langfuse trace ID for observability
             
         Returns:
             Dict with positioning data
@@ -133,54 +705,50 @@ class StrategyAgent:
                 }
             
             # Format prompt
-            prompt = PromptTemplate.from_template(POSITIONING_PROMPT)
-            formatted_prompt = prompt.format(
-                competitor_data=json.dumps(competitor_data, indent=2)
+            data_block = self._positioning_data_template.format(
+                competitor_data=orjson.dumps(competitor_data).decode()
             )
+            formatted_prompt = f"{self._positioning_instructions}\n\n{data_block}"
 
-            # Get LLM response with timing
+            # Get LLM response with timing (structured output guarantees the schema)
             llm_start = datetime.now()
-            response = self.llm.invoke(formatted_prompt)
+            response = await self.openai_client.chat.completions.parse(
+                model="gpt-4.1-mini",
+                temperature=0.3,
+                max_tokens=2000,
+                response_format=PositioningResponse,
+                messages=[
+                    {"role": "system", "content": self._positioning_instructions},
+                    {"role": "user", "content": data_block},
+                ],
+            )
             llm_end = datetime.now()
+            message = response.choices[0].message
+            content = message.content or ""
 
             # Log LLM call to Langfuse with token usage and timing
-            trace_id = getattr(self, "_current_trace_id", None)
-            if trace_id and hasattr(response, 'usage_metadata'):
-                usage = response.usage_metadata
-                model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
+            if trace_id and response.usage:
                 log_llm_call(
                     trace_id=trace_id,
                     name="positioning-map",
-                    model=model_name,
+                    model=response.model or "gpt-4.1-mini",
                     input_text=formatted_prompt,
-                    output_text=response.content,
-                    input_tokens=usage.get('input_tokens', 0),
-                    output_tokens=usage.get('output_tokens', 0),
+                    output_text=content,
+                    input_tokens=response.usage.prompt_tokens,
+                    output_tokens=response.usage.completion_tokens,
                     start_time=llm_start,
                     end_time=llm_end,
                 )
 
-            # Parse JSON response - handle markdown code blocks
-            response_text = response.content.strip()
-            
-            # Try to extract JSON from markdown code blocks if present
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(1)
-            
-            # Also try extracting JSON object directly (if not already extracted)
-            if not json_match:
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    response_text = json_match.group(0)
-            
-            try:
-                positioning_data = json.loads(response_text)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse LLM positioning response as JSON: {e}")
-                logger.debug(f"Response content: {response.content[:200]}...")
-                # Fallback to simple positioning
+            if message.parsed is None:
+                # Model refused or was cut off - fall back to simple positioning
+                logger.error("LLM positioning response was not parsed: %s", message.refusal or "truncated")
                 positioning_data = self._fallback_positioning(competitors)
+            else:
+                positioning_data = {
+                    position.name: {"x": position.x, "y": position.y, "rationale": position.rationale}
+                    for position in message.parsed.positions
+                }
             
             # Validate and clean coordinates
             positioning_data = self._validate_coordinates(positioning_data)
@@ -194,11 +762,11 @@ class StrategyAgent:
                 "companies": positioning_data
             }
             
-            logger.info(f"Positioned {len(positioning_data)} competitors")
+            logger.info("Positioned %d competitors", len(positioning_data))
             return result
             
         except Exception as e:
-            logger.error(f"Error generating positioning map: {e}", exc_info=True)
+            logger.error("Error generating positioning map: %s", e, exc_info=config.LOG_TRACEBACKS)
             return self._fallback_positioning_map(competitors)
     
     def _fallback_positioning(self, competitors: List[str]) -> Dict:
@@ -211,27 +779,14 @@ class StrategyAgent:
         Returns:
             Simple positioning dict
         """
-        positioning = {}
-        
         # Distribute competitors evenly across grid
-        import math
         n = len(competitors)
-        cols = math.ceil(math.sqrt(n))
-        
-        for i, comp in enumerate(competitors):
-            row = i // cols
-            col = i % cols
-            
-            x = 2.0 + (col * 6.0 / max(cols - 1, 1))
-            y = 2.0 + (row * 6.0 / max((n // cols), 1))
-            
-            positioning[comp] = {
-                "x": round(x, 1),
-                "y": round(y, 1),
-                "rationale": "Estimated positioning"
-            }
-        
-        return positioning
+        coords = _FALLBACK_COORDS.get(n) or _fallback_grid(n)
+
+        return {
+            comp: {"x": x, "y": y, "rationale": "Estimated positioning"}
+            for comp, (x, y) in zip(competitors, coords)
+        }
     
     def _validate_coordinates(self, positioning_data: Dict) -> Dict:
         """
@@ -244,22 +799,23 @@ class StrategyAgent:
             Cleaned positioning data
         """
         cleaned = {}
-        
+        # Local bindings keep the per-company loop on LOAD_FAST lookups
+        _max, _min, _round = max, min, round
+
         for company, data in positioning_data.items():
-            if isinstance(data, dict) and "x" in data and "y" in data:
-                x = float(data["x"])
-                y = float(data["y"])
-                
-                # Clamp to valid range
-                x = max(1.0, min(10.0, x))
-                y = max(1.0, min(10.0, y))
-                
-                cleaned[company] = {
-                    "x": round(x, 1),
-                    "y": round(y, 1),
-                    "rationale": data.get("rationale", "Positioning based on market analysis")
-                }
-        
+            if not (isinstance(data, dict) and "x" in data and "y" in data):
+                continue
+
+            # Clamp to valid range
+            x = _min(10.0, _max(1.0, float(data["x"])))
+            y = _min(10.0, _max(1.0, float(data["y"])))
+
+            cleaned[company] = {
+                "x": _round(x, 1),
+                "y": _round(y, 1),
+                "rationale": data["rationale"] if "rationale" in data else "Positioning based on market analysis"
+            }
+
         return cleaned
     
     def _detect_opportunity_zones(self, positioning_map: Dict, insights: Dict) -> List[Dict]:
@@ -279,56 +835,46 @@ class StrategyAgent:
         if not companies:
             return zones
         
-        # Get all occupied positions
-        occupied_positions = [
-            (data["x"], data["y"]) 
-            for data in companies.values()
-        ]
-        
+        # Get all occupied positions as an (N, 2) array
+        occupied = np.array(
+            [(data["x"], data["y"]) for data in companies.values()],
+            dtype=np.float64
+        )
+
         # Check grid for empty spaces (simplified algorithm)
         # In production, this would use more sophisticated gap analysis
-        
-        # Define grid points to check
-        grid_points = [
-            (x, y) 
-            for x in range(2, 10, 2)  # Check every 2 units
-            for y in range(2, 10, 2)
-        ]
-        
-        for x, y in grid_points:
-            # Check if this point is far from all occupied positions
-            min_distance = min([
-                ((x - ox)**2 + (y - oy)**2)**0.5
-                for ox, oy in occupied_positions
-            ] or [float('inf')])
-            
-            # If minimum distance > 2.5, it's an opportunity zone
-            if min_distance > 2.5:
-                # Determine zone description
-                if x < 5 and y > 7:
-                    desc = "Budget enterprise gap"
-                elif x > 6 and y < 4:
-                    desc = "Premium SMB gap"
-                elif 4 <= x <= 6 and y > 7:
-                    desc = "Mid-price enterprise gap"
-                else:
-                    desc = "Market gap"
-                
-                zones.append({
-                    "coordinates": {"x": float(x), "y": float(y)},
-                    "description": desc,
-                    "rationale": f"No major competitors in this segment",
-                    "opportunity_score": round(min_distance * 2, 1)  # Simple scoring
-                })
-        
-        # Sort by opportunity score and limit to top 3
-        zones.sort(key=lambda z: z["opportunity_score"], reverse=True)
-        zones = zones[:3]
-        
-        logger.info(f"Identified {len(zones)} opportunity zones")
+
+        # Squared distance from every grid point to its nearest competitor
+        diff = _GRID_POINTS[:, None, :] - occupied[None, :, :]
+        min_distances_sq = (diff * diff).sum(axis=-1).min(axis=1)
+
+        # Grid points further than 2.5 from every competitor are opportunity zones;
+        # score them lazily and keep the top 3 (nlargest is stable, so ties keep
+        # grid order) before building any zone dicts
+        candidates = (
+            (idx, round((float(min_distances_sq[idx]) ** 0.5) * 2, 1))  # Simple scoring
+            for idx in np.flatnonzero(min_distances_sq > _MIN_ZONE_DISTANCE_SQ)
+        )
+
+        for idx, score in heapq.nlargest(3, candidates, key=lambda c: c[1]):
+            x, y = (int(v) for v in _GRID_POINTS[idx])
+
+            # Determine zone description
+            desc = _ZONE_REGIONS.get(_region(x, y), _DEFAULT_REGION)[0]
+
+            zones.append({
+                "coordinates": {"x": float(x), "y": float(y)},
+                "description": desc,
+                "rationale": f"No major competitors in this segment",
+                "opportunity_score": score
+            })
+
+        logger.info("Identified %d opportunity zones", len(zones))
         return zones
     
-    def _generate_content_recommendations_with_scoring(self, themes: List[Dict], competitors: List[str], query: str = "") -> List[Dict]:
+    async def _generate_content_recommendations_with_scoring(
+        self, themes: List[Dict], competitors: List[str], query: str = "", trace_id: Optional[str] = None
+    ) -> List[Dict]:
         """
         Generate content gap recommendations WITH scoring in a single LLM call (OPTIMIZED)
 
@@ -339,6 +885,7 @@ class StrategyAgent:
             themes: Content themes from Analysis Agent (with source_evidence)
             competitors: List of competitors
             query: Original search query for context
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             List of content recommendations WITH opportunity scores included
@@ -347,44 +894,17 @@ class StrategyAgent:
             logger.warning("No themes available for content recommendations")
             return []
 
-        # Build themes with evidence for LLM prompt
-        themes_with_evidence = []
-        for theme in themes[:5]:
-            theme_info = {
-                "theme": theme.get("theme", ""),
-                "user_interest": theme.get("user_interest", ""),
-                "source_evidence": theme.get("source_evidence", [])
-            }
-            themes_with_evidence.append(theme_info)
-
-        # Build source evidence summary from themes
-        source_evidence = []
-        for theme in themes[:5]:
-            evidence = theme.get("source_evidence", [])
-            for e in evidence:
-                source_evidence.append({
-                    "theme": theme.get("theme", ""),
-                    "quote": e.get("quote", ""),
-                    "source_idx": e.get("source_idx")
-                })
-
-        # Format combined prompt
-        prompt = CONTENT_GAP_WITH_SCORING_PROMPT.format(
-            query=query or "market research",
-            themes_with_evidence=json.dumps(themes_with_evidence, indent=2),
-            source_evidence=json.dumps(source_evidence[:20], indent=2),  # Limit evidence
-            competitors=", ".join(competitors[:10])  # Limit to 10 competitors
-        )
+        prompt = self._build_content_scoring_prompt(themes, competitors, query)
 
         try:
             # Single LLM call for both gap analysis AND scoring
             llm_start = datetime.now()
-            response = self.llm.invoke(prompt)
+            output = await self.scored_content_gap_llm.ainvoke(self._to_messages(prompt))
             llm_end = datetime.now()
+            response = output["raw"]
             content = response.content.strip()
 
             # Log LLM call to Langfuse
-            trace_id = getattr(self, "_current_trace_id", None)
             if trace_id and hasattr(response, 'usage_metadata'):
                 usage = response.usage_metadata
                 model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
@@ -400,49 +920,176 @@ class StrategyAgent:
                     end_time=llm_end,
                 )
 
-            # Parse JSON response
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
+            if output["parsing_error"]:
+                raise output["parsing_error"]
+            result = output["parsed"].model_dump()
+            recommendations = self._to_scored_recommendations(result["recommendations"])
 
-            result = json.loads(content)
-            llm_recommendations = result.get("recommendations", [])
+            logger.info("LLM generated %d content recommendations with scores (combined call)", len(recommendations))
+            return recommendations
 
-            # Transform to output format (already includes scores!)
-            recommendations = []
-            for i, rec in enumerate(llm_recommendations[:5]):
-                topic = rec.get("topic", "")
+        except Exception as e:
+            logger.error("LLM content gap + scoring failed: %s", e)
+            return []
 
-                # Validate: topic should not be generic template
-                if self._is_generic_topic(topic):
-                    logger.warning(f"Skipping generic topic: {topic}")
-                    continue
+    def _build_content_scoring_prompt(self, themes: List[Dict], competitors: List[str], query: str = "") -> str:
+        """
+        Format the combined content gap + scoring prompt
 
-                recommendations.append({
-                    "topic": topic,
-                    "gap_reasoning": rec.get("gap_reasoning", ""),
-                    "target_audience": rec.get("target_audience", ""),
-                    "recommended_format": rec.get("recommended_format", "Article"),
-                    "format_rationale": rec.get("format_rationale", ""),
-                    "why_now": rec.get("why_now", ""),
-                    "priority": "high" if i < 2 else "medium" if i < 4 else "low",
-                    "estimated_effort": "medium",
-                    "opportunity_score": rec.get("opportunity_score", 5.0),
-                    "score_reasoning": rec.get("score_reasoning", {})
-                })
+        Args:
+            themes: Content themes from Analysis Agent (with source_evidence)
+            competitors: List of competitors
+            query: Original search query for context
 
-            # Sort by opportunity score
-            recommendations.sort(key=lambda x: x.get("opportunity_score", 0), reverse=True)
+        Returns:
+            Formatted prompt string
+        """
+        # Format combined prompt
+        return build_gap_scoring_prompt(
+            query=query or "market research",
+            themes_with_evidence=_compact_json(_themes_with_evidence(themes)),
+            source_evidence=_compact_json(_source_evidence(themes)[:20]),  # Limit evidence
+            competitors=", ".join(competitors[:10])  # Limit to 10 competitors
+        )
 
-            logger.info(f"LLM generated {len(recommendations)} content recommendations with scores (combined call)")
-            return recommendations
+    def _to_scored_recommendations(self, llm_recommendations: List[Dict]) -> List[Dict]:
+        """
+        Transform LLM recommendations (with scores) to output format
+
+        Args:
+            llm_recommendations: Raw recommendations from a scoring-aware prompt
+
+        Returns:
+            Recommendations sorted by opportunity score, generic topics dropped
+        """
+        recommendations = []
+        for i, rec in enumerate(llm_recommendations[:5]):
+            recommendation = self._to_scored_recommendation(rec, i)
+            if recommendation:
+                recommendations.append(recommendation)
 
+        # Sort by opportunity score
+        recommendations.sort(key=lambda x: x.get("opportunity_score", 0), reverse=True)
+        return recommendations
+
+    def _to_scored_recommendation(self, rec: Dict, index: int) -> Optional[Dict]:
+        """
+        Transform a single LLM recommendation (with score) to output format
+
+        Args:
+            rec: Raw recommendation from a scoring-aware prompt
+            index: Position in the LLM output (drives priority)
+
+        Returns:
+            Recommendation dict, or None if the topic is too generic
+        """
+        topic = rec.get("topic", "")
+
+        # Validate: topic should not be generic template
+        if self._is_generic_topic(topic):
+            logger.warning("Skipping generic topic: %s", topic)
+            return None
+
+        return {
+            "topic": topic,
+            "gap_reasoning": rec.get("gap_reasoning", ""),
+            "target_audience": rec.get("target_audience", ""),
+            "recommended_format": rec.get("recommended_format", "Article"),
+            "format_rationale": rec.get("format_rationale", ""),
+            "why_now": rec.get("why_now", ""),
+            "priority": "high" if index < 2 else "medium" if index < 4 else "low",
+            "estimated_effort": "medium",
+            "opportunity_score": rec.get("opportunity_score", 5.0),
+            "score_reasoning": rec.get("score_reasoning", {})
+        }
+
+    async def _generate_all(self, analysis_insights: Dict, query: str = "", trace_id: Optional[str] = None) -> tuple:
+        """
+        Generate positioning map and scored content recommendations in one LLM call
+
+        Shares the competitor/theme context across both tasks, so it is
+        prefilled once instead of per prompt.
+
+        Args:
+            analysis_insights: Output from Analysis Agent
+            query: Original search query for context
+            trace_id: Optional Langfuse trace ID for observability
+
+        Returns:
+            Tuple of (positioning_map, content_recommendations)
+        """
+        competitors = analysis_insights.get("competitors", [])
+        competitor_attrs = analysis_insights.get("competitor_attributes", {})
+        themes = analysis_insights.get("content_themes", [])
+
+        competitor_data = {}
+        for comp in competitors:
+            attrs = competitor_attrs.get(comp, {})
+            competitor_data[comp] = {
+                "sentiment": attrs.get("sentiment", 0.0),
+                "mention_count": attrs.get("mention_count", 0)
+            }
+
+        prompt = FUSED_STRATEGY_TEMPLATE.format(
+            query=query or "market research",
+            competitor_data=_compact_json(competitor_data),
+            themes_with_evidence=_compact_json(_themes_with_evidence(themes)),
+            source_evidence=_compact_json(_source_evidence(themes)[:20])  # Limit evidence
+        )
+
+        try:
+            # Both tasks share one response, so allow a larger output budget
+            llm_start = datetime.now()
+            response = await self.llm.ainvoke(
+                self._to_messages(prompt),
+                max_tokens=4000,
+                response_format={"type": "json_object"}
+            )
+            llm_end = datetime.now()
+            content = response.content.strip()
+
+            # Log LLM call to Langfuse
+            if trace_id and hasattr(response, 'usage_metadata'):
+                usage = response.usage_metadata
+                model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
+                log_llm_call(
+                    trace_id=trace_id,
+                    name="fused-strategy",
+                    model=model_name,
+                    input_text=prompt,
+                    output_text=content,
+                    input_tokens=usage.get('input_tokens', 0),
+                    output_tokens=usage.get('output_tokens', 0),
+                    start_time=llm_start,
+                    end_time=llm_end,
+                )
+
+            result = _extract_json(content)
+            if result is None:
+                raise ValueError("no JSON object in fused strategy response")
         except Exception as e:
-            logger.error(f"LLM content gap + scoring failed: {e}")
-            return []
+            logger.error("LLM fused strategy call failed: %s", e)
+            return self._fallback_positioning_map(competitors), []
+
+        positioning_data = result.get("positioning_map") or self._fallback_positioning(competitors)
+        positioning_map = {
+            "dimensions": {
+                "x_axis": "Price Positioning (1-10)",
+                "y_axis": "Target Company Size (1-10)"
+            },
+            "companies": self._validate_coordinates(positioning_data)
+        }
+        content_recs = self._to_scored_recommendations(result.get("recommendations", []))
 
-    def _generate_content_recommendations(self, themes: List[Dict], competitors: List[str], query: str = "") -> List[Dict]:
+        logger.info(
+            "Fused strategy call positioned %d competitors, %d content recommendations",
+            len(positioning_map["companies"]), len(content_recs)
+        )
+        return positioning_map, content_recs
+
+    async def _generate_content_recommendations(
+        self, themes: List[Dict], competitors: List[str], query: str = "", trace_id: Optional[str] = None
+    ) -> List[Dict]:
         """
         Generate content gap recommendations using LLM-based gap analysis (Phase 3)
 
@@ -450,6 +1097,7 @@ class StrategyAgent:
             themes: Content themes from Analysis Agent (with source_evidence)
             competitors: List of competitors
             query: Original search query for context
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             List of content recommendation dicts with gap_reasoning
@@ -458,32 +1106,22 @@ class StrategyAgent:
             logger.warning("No themes available for content recommendations")
             return []
 
-        # Build themes with evidence for LLM prompt
-        themes_with_evidence = []
-        for theme in themes[:5]:
-            theme_info = {
-                "theme": theme.get("theme", ""),
-                "user_interest": theme.get("user_interest", ""),
-                "source_evidence": theme.get("source_evidence", [])
-            }
-            themes_with_evidence.append(theme_info)
-
         # Format prompt
-        prompt = CONTENT_GAP_ANALYSIS_PROMPT.format(
+        prompt = CONTENT_GAP_ANALYSIS_TEMPLATE.format(
             query=query or "market research",
-            themes_with_evidence=json.dumps(themes_with_evidence, indent=2),
+            themes_with_evidence=_compact_json(_themes_with_evidence(themes)),
             competitors=", ".join(competitors[:10])  # Limit to 10 competitors
         )
 
         try:
             # Call LLM for gap analysis
             llm_start = datetime.now()
-            response = self.llm.invoke(prompt)
+            output = await self.content_gap_llm.ainvoke(self._to_messages(prompt))
             llm_end = datetime.now()
+            response = output["raw"]
             content = response.content.strip()
 
             # Log LLM call to Langfuse
-            trace_id = getattr(self, "_current_trace_id", None)
             if trace_id and hasattr(response, 'usage_metadata'):
                 usage = response.usage_metadata
                 model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
@@ -499,14 +1137,9 @@ class StrategyAgent:
                     end_time=llm_end,
                 )
 
-            # Parse JSON response
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(content)
-            llm_recommendations = result.get("recommendations", [])
+            if output["parsing_error"]:
+                raise output["parsing_error"]
+            llm_recommendations = output["parsed"].model_dump()["recommendations"]
 
             # Transform to output format
             recommendations = []
@@ -515,7 +1148,7 @@ class StrategyAgent:
 
                 # Validate: topic should not be generic template
                 if self._is_generic_topic(topic):
-                    logger.warning(f"Skipping generic topic: {topic}")
+                    logger.warning("Skipping generic topic: %s", topic)
                     continue
 
                 recommendations.append({
@@ -529,11 +1162,11 @@ class StrategyAgent:
                     "estimated_effort": "medium"
                 })
 
-            logger.info(f"LLM generated {len(recommendations)} content recommendations")
+            logger.info("LLM generated %d content recommendations", len(recommendations))
             return recommendations
 
         except Exception as e:
-            logger.error(f"LLM content gap analysis failed: {e}")
+            logger.error("LLM content gap analysis failed: %s", e)
             return []
 
     def _is_generic_topic(self, topic: str) -> bool:
@@ -546,32 +1179,15 @@ class StrategyAgent:
         Returns:
             True if topic is generic, False otherwise
         """
-        topic_lower = topic.lower()
-
-        generic_patterns = [
-            "deep dive into",
-            "everything about",
-            "best practices for",
-            "complete guide to",
-            "all you need to know",
-            "introduction to",
-            "getting started with"
-        ]
-
-        # Check if topic matches generic patterns AND is short (under 8 words)
-        word_count = len(topic.split())
-        if word_count < 6:
-            for pattern in generic_patterns:
-                if pattern in topic_lower:
-                    return True
-
-        return False
+        # Check if topic matches generic patterns AND is short (under 6 words)
+        return len(topic.split()) < 6 and _GENERIC_TOPIC_RE.search(topic) is not None
 
-    def _score_recommendations(
+    async def _score_recommendations(
         self,
         recommendations: List[Dict],
         themes: List[Dict],
-        competitors: List[str]
+        competitors: List[str],
+        trace_id: Optional[str] = None
     ) -> List[Dict]:
         """
         Score recommendations using LLM-based evidence analysis (Phase 4)
@@ -580,6 +1196,7 @@ class StrategyAgent:
             recommendations: Content recommendations from gap analysis
             themes: Content themes with source evidence
             competitors: List of competitors
+            trace_id: Optional Langfuse trace ID for observability
 
         Returns:
             Recommendations with evidence-based opportunity scores
@@ -587,39 +1204,28 @@ class StrategyAgent:
         if not recommendations:
             return recommendations
 
-        # Build source evidence summary from themes
-        source_evidence = []
-        for theme in themes[:5]:
-            evidence = theme.get("source_evidence", [])
-            for e in evidence:
-                source_evidence.append({
-                    "theme": theme.get("theme", ""),
-                    "quote": e.get("quote", ""),
-                    "source_idx": e.get("source_idx")
-                })
-
         # Format prompt
-        prompt = OPPORTUNITY_SCORING_PROMPT.format(
-            recommendations=json.dumps([
+        prompt = OPPORTUNITY_SCORING_TEMPLATE.format(
+            recommendations=_compact_json([
                 {"topic": r.get("topic", ""), "gap_reasoning": r.get("gap_reasoning", "")}
                 for r in recommendations
-            ], indent=2),
-            source_evidence=json.dumps(source_evidence[:20], indent=2),  # Limit evidence
+            ]),
+            source_evidence=_compact_json(_source_evidence(themes)[:10]),  # Limit evidence
             competitors=", ".join(competitors[:10])
         )
 
         try:
             # Call LLM for scoring
             llm_start = datetime.now()
-            response = self.llm.invoke(prompt)
+            output = await self.scoring_llm.ainvoke(self._to_messages(prompt))
             llm_end = datetime.now()
+            response = output["raw"]
             content = response.content.strip()
 
             # Log LLM call to Langfuse
-            trace_id = getattr(self, "_current_trace_id", None)
             if trace_id and hasattr(response, 'usage_metadata'):
                 usage = response.usage_metadata
-                model_name = response.response_metadata.get('model_name', 'gpt-4.1-mini')
+                model_name = response.response_metadata.get('model_name', 'gpt-4o-mini')
                 log_llm_call(
                     trace_id=trace_id,
                     name="opportunity-scoring",
@@ -632,14 +1238,9 @@ class StrategyAgent:
                     end_time=llm_end,
                 )
 
-            # Parse JSON response
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(content)
-            scored_recs = result.get("scored_recommendations", [])
+            if output["parsing_error"]:
+                raise output["parsing_error"]
+            scored_recs = output["parsed"].model_dump()["scored_recommendations"]
 
             # Match scores back to original recommendations
             score_map = {r.get("topic", "").lower(): r for r in scored_recs}
@@ -658,11 +1259,11 @@ class StrategyAgent:
             # Sort by opportunity score
             recommendations.sort(key=lambda x: x.get("opportunity_score", 0), reverse=True)
 
-            logger.info(f"Scored {len(recommendations)} recommendations with evidence-based reasoning")
+            logger.info("Scored %d recommendations with evidence-based reasoning", len(recommendations))
             return recommendations
 
         except Exception as e:
-            logger.error(f"LLM opportunity scoring failed: {e}")
+            logger.error("LLM opportunity scoring failed: %s", e)
             # Return recommendations without scores
             for rec in recommendations:
                 rec["opportunity_score"] = 5.0
@@ -697,12 +1298,9 @@ class StrategyAgent:
             top_zone = zones[0]
             coords = top_zone["coordinates"]
             
-            if coords["x"] < 5 and coords["y"] > 7:
-                moves.append("Position as 'enterprise features at SMB pricing'")
-            elif coords["x"] > 6 and coords["y"] < 4:
-                moves.append("Target premium small business segment with high-touch service")
-            elif 4 <= coords["x"] <= 6:
-                moves.append("Position in mid-market sweet spot with balanced offering")
+            move = _ZONE_REGIONS.get(_region(coords["x"], coords["y"]), _DEFAULT_REGION)[1]
+            if move:
+                moves.append(move)
         
         # Generate moves based on market density
         if avg_x > 6:
@@ -722,7 +1320,7 @@ class StrategyAgent:
         # Limit to top 5 moves
         moves = moves[:5]
         
-        logger.info(f"Generated {len(moves)} strategic moves")
+        logger.info("Generated %d strategic moves", len(moves))
         return moves
     
     def _empty_output(self) -> Dict:
@@ -794,11 +1392,10 @@ if __name__ == "__main__":
         print(f"  {i}. {move}")
     
     # Save output
-    import os
-    output_path = "outputs/reports/strategy_agent_test.json"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(result, f, indent=2)
+    from pathlib import Path
+    output_path = Path("outputs/reports/strategy_agent_test.json")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
     
     print("\n" + "="*60)
     print(f"Full output saved to: {output_path}")
\ No newline at end of file
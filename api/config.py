@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     history_db_path: str = "data/history.db"
     cache_db_path: str = "data/cache.db"
 
+    # LangChain LLM response cache (stored in the cache database)
+    llm_cache_enabled: bool = True
+
     # Query limits
     max_query_length: int = 5000
     min_query_length: int = 3
@@ -32,7 +35,12 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 
-@lru_cache()
-def get_settings() -> Settings:
+@lru_cache(maxsize=1)
+def load_settings() -> Settings:
     """Get cached settings instance"""
     return Settings()
+
+
+async def get_settings() -> Settings:
+    """Settings dependency (async, so FastAPI resolves it without a threadpool hop)"""
+    return load_settings()
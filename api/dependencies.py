@@ -1,17 +1,47 @@
 from functools import lru_cache
+from starlette.concurrency import run_in_threadpool
 from core.orchestrator import AgentOrchestrator
 from utils.query_history import QueryHistory
-from api.config import get_settings
+from api.config import load_settings
 
 
 @lru_cache()
-def get_orchestrator() -> AgentOrchestrator:
-    """Get cached orchestrator instance"""
+def _get_orchestrator_instance() -> AgentOrchestrator:
+    """Create the orchestrator once per process"""
     return AgentOrchestrator()
 
 
 @lru_cache()
-def get_history() -> QueryHistory:
-    """Get cached query history instance"""
-    settings = get_settings()
+def _get_history_instance() -> QueryHistory:
+    """Create the query history instance once per process"""
+    settings = load_settings()
     return QueryHistory(db_path=settings.history_db_path)
+
+
+async def warm_up():
+    """
+    Build the shared instances in the threadpool
+
+    Constructing the orchestrator loads spaCy models and API clients (and
+    pytrends makes a network request); the history instance opens and
+    migrates its database. Called at startup so no request pays for it.
+    """
+    await run_in_threadpool(_get_orchestrator_instance)
+    await run_in_threadpool(_get_history_instance)
+
+
+async def _prebuilt(factory):
+    """Return a cached instance, building it in the threadpool if startup didn't"""
+    if factory.cache_info().currsize:
+        return factory()
+    return await run_in_threadpool(factory)
+
+
+async def get_orchestrator() -> AgentOrchestrator:
+    """Get the orchestrator built at startup (async, so FastAPI resolves it without a threadpool hop)"""
+    return await _prebuilt(_get_orchestrator_instance)
+
+
+async def get_history() -> QueryHistory:
+    """Get the query history built at startup (async, so FastAPI resolves it without a threadpool hop)"""
+    return await _prebuilt(_get_history_instance)
@@ -1,7 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.config import get_settings
+from fastapi.responses import ORJSONResponse
+from api.config import load_settings
+from api.dependencies import warm_up
 from api.routers import analyze_router, history_router, cache_router
+from langchain_core.globals import set_llm_cache
+from contextlib import asynccontextmanager
+from pathlib import Path
 import logging
 
 # Configure logging
@@ -12,7 +17,23 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Get settings
-settings = get_settings()
+settings = load_settings()
+
+# Serve repeated LLM prompts (same prompt, model and params) from SQLite
+if settings.llm_cache_enabled:
+    from langchain_community.cache import SQLiteCache
+    Path(settings.cache_db_path).parent.mkdir(parents=True, exist_ok=True)
+    set_llm_cache(SQLiteCache(database_path=settings.cache_db_path))
+    logger.info(f"LLM response cache enabled at {settings.cache_db_path}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the orchestrator and query history before serving requests"""
+    await warm_up()
+    logger.info("Orchestrator and query history ready")
+    yield
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -21,6 +42,9 @@ app = FastAPI(
     description=settings.api_description,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    # Analysis reports are large nested dicts; orjson encodes them several times faster
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -1,19 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from api.schemas.requests import AnalyzeRequest
 from api.schemas.responses import AnalysisResponse
 from api.dependencies import get_orchestrator, get_history
 from api.config import get_settings
+from core.config import config
 from core.orchestrator import AgentOrchestrator
-from utils.query_history import QueryHistory
+from utils.query_history import QueryHistory, query_fingerprint
+from datetime import timedelta
+import asyncio
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["analysis"])
 
+# Identical query + parameters within this window are served from history.
+# Much shorter than the agent caches (CACHE_TTL_DAYS), so a repeat request
+# gets a new run the next day; clients can also pass refresh=true
+_FRESH_RESULT_TTL = timedelta(hours=24)
+
+# Pipeline runs in progress, keyed by query fingerprint, so concurrent
+# identical requests share one run
+_inflight: dict[tuple[str, str], asyncio.Future] = {}
+
 
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze(
     request: AnalyzeRequest,
+    background_tasks: BackgroundTasks,
     orchestrator: AgentOrchestrator = Depends(get_orchestrator),
     history: QueryHistory = Depends(get_history),
     settings=Depends(get_settings),
@@ -26,33 +42,147 @@ async def analyze(
     2. Analysis Agent - Extracts competitors and themes
     3. Strategy Agent - Generates positioning map and recommendations
     4. Quality Agent - Validates and synthesizes final report
+
+    A stored result for the same query and parameters from the last
+    _FRESH_RESULT_TTL is returned instead, unless `refresh` is set.
+    """
+    query = _validate_query(request.query, settings)
+
+    try:
+        if not request.refresh:
+            cached = await run_in_threadpool(
+                history.get_fresh_response_json, query, request.parameters, _FRESH_RESULT_TTL
+            )
+            if cached:
+                logger.info(f"Serving fresh result from history for query: '{query[:50]}...'")
+                return Response(content=cached, media_type="application/json")
+
+        logger.info(f"Starting analysis for query: '{query[:50]}...'")
+
+        result, is_leader = await _run_coalesced(orchestrator, query, request.parameters)
+        result = {**result, "query_text": query}
+        # Validate and encode once; the same body is returned and stored
+        payload = await run_in_threadpool(_serialize_response, result)
+        # Persist to history after the response is sent (once per pipeline run)
+        if is_leader:
+            background_tasks.add_task(
+                history.save_query, query, result,
+                response_json=payload, parameters=request.parameters,
+            )
+        logger.info(f"Analysis completed for query: '{query[:50]}...'")
+        return Response(content=payload, media_type="application/json")
+
+    except Exception as e:
+        logger.error(f"Analysis failed: {e}", exc_info=config.LOG_TRACEBACKS)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Analysis failed: {str(e)}"
+        )
+
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    request: AnalyzeRequest,
+    orchestrator: AgentOrchestrator = Depends(get_orchestrator),
+    history: QueryHistory = Depends(get_history),
+    settings=Depends(get_settings),
+):
+    """
+    Run full market analysis pipeline, streaming progress as Server-Sent Events.
+
+    Emits `research` and `analysis` events as those agents finish, then
+    `positioning` and one `recommendation` event per content recommendation
+    as the Strategy Agent produces them. The final `complete` event carries
+    the same report as POST /api/analyze.
     """
-    query = request.query.strip()
+    query = _validate_query(request.query, settings)
 
-    if len(query) < settings.min_query_length:
+    logger.info(f"Starting streaming analysis for query: '{query[:50]}...'")
+
+    async def event_stream():
+        try:
+            async for event in orchestrator.run_stream(query, request.parameters):
+                if event["stage"] == "complete":
+                    result = event["data"]
+                    result["query_text"] = query
+                    await run_in_threadpool(_save_history, history, query, result, request.parameters)
+                    logger.info(f"Streaming analysis completed for query: '{query[:50]}...'")
+                yield _sse(event["stage"], event["data"])
+
+        except Exception as e:
+            logger.error(f"Streaming analysis failed: {e}", exc_info=config.LOG_TRACEBACKS)
+            yield _sse("error", {"detail": f"Analysis failed: {str(e)}"})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+async def _run_coalesced(orchestrator: AgentOrchestrator, query: str, parameters: dict | None):
+    """
+    Run the pipeline, or wait on an identical run that is already in flight.
+
+    Returns:
+        Tuple of (result, is_leader), where is_leader is True for the request
+        that actually ran the pipeline
+    """
+    key = query_fingerprint(query, parameters)
+    pending = _inflight.get(key)
+    if pending is not None:
+        logger.info(f"Joining in-flight analysis for query: '{query[:50]}...'")
+        # Shield so a disconnecting follower doesn't cancel the shared run
+        return await asyncio.shield(pending), False
+
+    future = asyncio.get_running_loop().create_future()
+    # Mark the exception retrieved even if no follower was waiting
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _inflight[key] = future
+    try:
+        result = await orchestrator.arun(query, parameters)
+        future.set_result(result)
+        return result, True
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(e)
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+
+def _validate_query(query: str, settings) -> str:
+    """Enforce configured length limits (the request model already stripped the query)"""
+    length = len(query)
+
+    if length < settings.min_query_length:
         raise HTTPException(
             status_code=400,
             detail=f"Query must be at least {settings.min_query_length} characters"
         )
 
-    if len(query) > settings.max_query_length:
+    if length > settings.max_query_length:
         raise HTTPException(
             status_code=400,
             detail=f"Query must be at most {settings.max_query_length} characters"
         )
 
-    logger.info(f"Starting analysis for query: '{query[:50]}...'")
+    return query
 
-    try:
-        result = orchestrator.run(query, request.parameters)
-        result["query_text"] = query
-        history.save_query(query, result)
-        logger.info(f"Analysis completed for query: '{query[:50]}...'")
-        return result
 
+def _serialize_response(result: dict) -> str:
+    """Validate a pipeline result against AnalysisResponse and encode it as JSON"""
+    return AnalysisResponse(**result).model_dump_json()
+
+
+def _save_history(history: QueryHistory, query: str, result: dict, parameters: dict | None = None):
+    """Save a result to history along with its serialized API response"""
+    try:
+        response_json = _serialize_response(result)
     except Exception as e:
-        logger.error(f"Analysis failed: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Analysis failed: {str(e)}"
-        )
+        logger.warning(f"Could not serialize response for history: {e}")
+        response_json = None
+    history.save_query(query, result, response_json=response_json, parameters=parameters)
+
+
+def _sse(event: str, data) -> str:
+    """Format a Server-Sent Event"""
+    return f"event: {event}\ndata: {orjson.dumps(data, default=str).decode()}\n\n"
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from api.schemas.requests import ClearCacheRequest
-from api.schemas.responses import CacheStatsResponse, CacheTypeStats
+from api.schemas.responses import CacheStatsResponse
 from api.dependencies import get_orchestrator
+from core.config import config
 from core.orchestrator import AgentOrchestrator
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/cache", tags=["cache"])
+# Maintenance endpoints; kept out of the public OpenAPI schema
+router = APIRouter(prefix="/api/cache", tags=["cache"], include_in_schema=False)
 
 
 @router.get("/stats", response_model=CacheStatsResponse)
@@ -21,24 +23,13 @@ async def get_cache_stats(
     """
     try:
         stats = orchestrator.get_cache_stats()
-        return CacheStatsResponse(
-            stats=stats.get("stats", {}),
-            hit_rate=stats.get("hit_rate", "0%"),
-            total_entries_valid=stats.get("total_entries_valid", 0),
-            total_entries_all=stats.get("total_entries_all", 0),
-            total_size_bytes=stats.get("total_size_bytes", 0),
-            total_size_mb=stats.get("total_size_mb", 0.0),
-            by_type=[
-                CacheTypeStats(
-                    type=t.get("type", "unknown"),
-                    count=t.get("count", 0),
-                    hits=t.get("hits", 0),
-                )
-                for t in stats.get("by_type", [])
-            ],
-        )
+        if "error" in stats:
+            raise RuntimeError(stats["error"])
+        # CacheManager.get_stats fills every field; FastAPI validates the dict
+        # against CacheStatsResponse while serializing it
+        return stats
     except Exception as e:
-        logger.error(f"Failed to get cache stats: {e}", exc_info=True)
+        logger.error(f"Failed to get cache stats: {e}", exc_info=config.LOG_TRACEBACKS)
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
 
@@ -75,7 +66,7 @@ async def clear_cache(
                 "message": f"Cleared all {deleted} cache entries"
             }
     except Exception as e:
-        logger.error(f"Failed to clear cache: {e}", exc_info=True)
+        logger.error(f"Failed to clear cache: {e}", exc_info=config.LOG_TRACEBACKS)
         raise HTTPException(status_code=500, detail=f"Failed to clear cache: {str(e)}")
 
 
@@ -96,5 +87,5 @@ async def cleanup_expired(
             "message": f"Cleaned up {deleted} expired entries"
         }
     except Exception as e:
-        logger.error(f"Failed to cleanup cache: {e}", exc_info=True)
+        logger.error(f"Failed to cleanup cache: {e}", exc_info=config.LOG_TRACEBACKS)
         raise HTTPException(status_code=500, detail=f"Failed to cleanup: {str(e)}")
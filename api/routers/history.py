@@ -1,26 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from api.schemas.responses import QueryHistoryItem, AnalysisResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from api.schemas.responses import QueryHistoryItem, QueryHistoryPage, AnalysisResponse
 from api.dependencies import get_history
+from core.config import config
 from utils.query_history import QueryHistory
+from typing import Optional
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/history", tags=["history"])
 
+# A saved query row is never updated, so its result can be reused by the
+# browser when the same report is reopened
+_SAVED_RESULT_CACHE_CONTROL = "private, max-age=3600"
 
-@router.get("/recent", response_model=list[QueryHistoryItem])
+
+@router.get("/recent", response_model=QueryHistoryPage)
 async def get_recent_queries(
     limit: int = Query(default=5, ge=1, le=50, description="Number of queries to return"),
+    before_id: Optional[int] = Query(default=None, ge=1, description="Return queries older than this id"),
     history: QueryHistory = Depends(get_history),
 ):
     """
     Get recent query history.
 
-    Returns the most recent queries with their basic metadata.
+    Returns the most recent queries with their basic metadata. Pass the
+    returned `next_cursor` as `before_id` to fetch the next page.
     """
     try:
-        queries = history.get_recent_queries(limit=limit)
-        return [
+        queries = await asyncio.to_thread(history.get_recent_queries, limit, before_id)
+        items = [
             QueryHistoryItem(
                 id=q[0],
                 query=q[1],
@@ -30,47 +39,65 @@ async def get_recent_queries(
             )
             for q in queries
         ]
+        next_cursor = items[-1].id if len(items) == limit else None
+        return QueryHistoryPage(items=items, next_cursor=next_cursor)
     except Exception as e:
-        logger.error(f"Failed to get recent queries: {e}", exc_info=True)
+        logger.error(f"Failed to get recent queries: {e}", exc_info=config.LOG_TRACEBACKS)
         raise HTTPException(status_code=500, detail=f"Failed to get history: {str(e)}")
 
 
-@router.get("/{query_id}", response_model=AnalysisResponse)
-async def get_query_by_id(
-    query_id: int,
+@router.get("/latest", response_model=AnalysisResponse)
+async def get_latest_result(
     history: QueryHistory = Depends(get_history),
 ):
     """
-    Get a specific query result by ID.
-
-    Returns the full analysis result for a previously executed query.
+    Get the most recent query result.
     """
     try:
-        result = history.get_query_by_id(query_id)
+        response_json = await asyncio.to_thread(history.get_latest_response_json)
+        if response_json:
+            return Response(content=response_json, media_type="application/json")
+
+        result = await asyncio.to_thread(history.get_latest_result)
         if not result:
-            raise HTTPException(status_code=404, detail="Query not found")
+            raise HTTPException(status_code=404, detail="No queries found")
         return result
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get query {query_id}: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to get query: {str(e)}")
+        logger.error(f"Failed to get latest result: {e}", exc_info=config.LOG_TRACEBACKS)
+        raise HTTPException(status_code=500, detail=f"Failed to get latest: {str(e)}")
 
 
-@router.get("/latest", response_model=AnalysisResponse)
-async def get_latest_result(
+# Declared after /latest so that path is not captured by {query_id}
+@router.get("/{query_id}", response_model=AnalysisResponse)
+async def get_query_by_id(
+    query_id: int,
+    response: Response,
     history: QueryHistory = Depends(get_history),
 ):
     """
-    Get the most recent query result.
+    Get a specific query result by ID.
+
+    Returns the full analysis result for a previously executed query.
     """
     try:
-        result = history.get_latest_result()
+        # Rows saved by /analyze carry the already-validated response body
+        response_json = await asyncio.to_thread(history.get_response_json_by_id, query_id)
+        if response_json:
+            return Response(
+                content=response_json,
+                media_type="application/json",
+                headers={"Cache-Control": _SAVED_RESULT_CACHE_CONTROL},
+            )
+
+        result = await asyncio.to_thread(history.get_query_by_id, query_id)
         if not result:
-            raise HTTPException(status_code=404, detail="No queries found")
+            raise HTTPException(status_code=404, detail="Query not found")
+        response.headers["Cache-Control"] = _SAVED_RESULT_CACHE_CONTROL
         return result
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get latest result: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to get latest: {str(e)}")
+        logger.error(f"Failed to get query {query_id}: {e}", exc_info=config.LOG_TRACEBACKS)
+        raise HTTPException(status_code=500, detail=f"Failed to get query: {str(e)}")
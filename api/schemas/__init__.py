@@ -2,6 +2,7 @@ from api.schemas.requests import AnalyzeRequest, ClearCacheRequest
 from api.schemas.responses import (
     AnalysisResponse,
     QueryHistoryItem,
+    QueryHistoryPage,
     CacheStatsResponse,
     CacheTypeStats,
 )
@@ -11,6 +12,7 @@ __all__ = [
     "ClearCacheRequest",
     "AnalysisResponse",
     "QueryHistoryItem",
+    "QueryHistoryPage",
     "CacheStatsResponse",
     "CacheTypeStats",
 ]
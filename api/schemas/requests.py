@@ -1,10 +1,13 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
 class AnalyzeRequest(BaseModel):
     """Request model for analysis endpoint"""
 
+    # Strip surrounding whitespace during validation, before the length checks
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     query: str = Field(
         ...,
         min_length=3,
@@ -15,6 +18,10 @@ class AnalyzeRequest(BaseModel):
         default=None,
         description="Optional parameters for customization"
     )
+    refresh: bool = Field(
+        default=False,
+        description="Run the pipeline even if a fresh result for this query is stored"
+    )
 
 
 class ClearCacheRequest(BaseModel):
@@ -1,22 +1,27 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Any
 
 
-class ContentTheme(BaseModel):
+class ResponseModel(BaseModel):
+    """Base for API response models: immutable, unknown keys dropped"""
+    model_config = ConfigDict(frozen=True, extra="ignore", validate_default=False)
+
+
+class ContentTheme(ResponseModel):
     """Content theme with sentiment"""
     theme: str
     frequency: int
     sentiment: float
 
 
-class CompanyPosition(BaseModel):
+class CompanyPosition(ResponseModel):
     """Company position on the positioning map"""
     x: float
     y: float
     rationale: Optional[str] = None
 
 
-class OpportunityZone(BaseModel):
+class OpportunityZone(ResponseModel):
     """Opportunity zone on positioning map"""
     coordinates: dict[str, float]
     description: Optional[str] = None
@@ -24,14 +29,14 @@ class OpportunityZone(BaseModel):
     opportunity_score: Optional[float] = None
 
 
-class PositioningMap(BaseModel):
+class PositioningMap(ResponseModel):
     """Competitive positioning map"""
     dimensions: Optional[dict[str, str]] = None
     companies: Optional[dict[str, CompanyPosition]] = None
     opportunity_zones: Optional[list[OpportunityZone]] = None
 
 
-class ContentRecommendation(BaseModel):
+class ContentRecommendation(ResponseModel):
     """Content recommendation"""
     topic: str
     priority: str
@@ -40,14 +45,14 @@ class ContentRecommendation(BaseModel):
     effort_level: Optional[str] = None
 
 
-class QualityFlag(BaseModel):
+class QualityFlag(ResponseModel):
     """Quality flag from validation"""
     type: str
     message: str
     agent: str
 
 
-class AgentError(BaseModel):
+class AgentError(ResponseModel):
     """Error from an agent"""
     agent: str
     error: str
@@ -55,7 +60,7 @@ class AgentError(BaseModel):
     fallback_used: bool
 
 
-class ReportMetadata(BaseModel):
+class ReportMetadata(ResponseModel):
     """Report metadata"""
     query: str
     timestamp: str
@@ -67,7 +72,7 @@ class ReportMetadata(BaseModel):
     errors: Optional[list[AgentError]] = None
 
 
-class ValidatedInsights(BaseModel):
+class ValidatedInsights(ResponseModel):
     """Validated insights from analysis"""
     competitors: list[str] = Field(default_factory=list)
     content_themes: list[ContentTheme] = Field(default_factory=list)
@@ -76,7 +81,7 @@ class ValidatedInsights(BaseModel):
     strategic_recommendations: list[str] = Field(default_factory=list)
 
 
-class SourceAttribution(BaseModel):
+class SourceAttribution(ResponseModel):
     """Source attribution data"""
     total_sources: Optional[int] = None
     source_breakdown: Optional[dict[str, int]] = None
@@ -85,7 +90,7 @@ class SourceAttribution(BaseModel):
     discussions_available: Optional[bool] = None
 
 
-class AnalysisResponse(BaseModel):
+class AnalysisResponse(ResponseModel):
     """Full analysis response"""
     report_metadata: ReportMetadata
     validated_insights: ValidatedInsights
@@ -94,7 +99,7 @@ class AnalysisResponse(BaseModel):
     query_text: Optional[str] = None
 
 
-class QueryHistoryItem(BaseModel):
+class QueryHistoryItem(ResponseModel):
     """Query history item for listing"""
     id: int
     query: str
@@ -103,14 +108,20 @@ class QueryHistoryItem(BaseModel):
     num_competitors: Optional[int] = None
 
 
-class CacheTypeStats(BaseModel):
+class QueryHistoryPage(ResponseModel):
+    """Page of query history items"""
+    items: list[QueryHistoryItem]
+    next_cursor: Optional[int] = None
+
+
+class CacheTypeStats(ResponseModel):
     """Statistics for a cache type"""
     type: str
     count: int
     hits: int
 
 
-class CacheStatsResponse(BaseModel):
+class CacheStatsResponse(ResponseModel):
     """Cache statistics response"""
     stats: dict[str, int]
     hit_rate: str
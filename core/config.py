@@ -1,40 +1,73 @@
 from dotenv import load_dotenv
-import os
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional
 
+# Also export .env values to os.environ for libraries that read them directly
 load_dotenv()
 
-class Config:
+class Config(BaseSettings):
     """Configuration for Market Horizon AI"""
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
     # OpenAI
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    OPENAI_API_KEY: Optional[str] = None
 
     # Serper
-    SERPER_API_KEY = os.getenv("SERPER_API_KEY")
+    SERPER_API_KEY: Optional[str] = None
 
     # Reddit
-    REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
-    REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
-    REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT", "MarketHorizonAI/1.0")
+    REDDIT_CLIENT_ID: Optional[str] = None
+    REDDIT_CLIENT_SECRET: Optional[str] = None
+    REDDIT_USER_AGENT: str = "MarketHorizonAI/1.0"
 
     # YouTube
-    YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+    YOUTUBE_API_KEY: Optional[str] = None
 
     # Langfuse Observability
-    LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
-    LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
-    LANGFUSE_HOST = os.getenv("LANGFUSE_HOST", "http://localhost:3000")
-    LANGFUSE_ENABLED = os.getenv("LANGFUSE_ENABLED", "true").lower() == "true"
+    LANGFUSE_PUBLIC_KEY: Optional[str] = None
+    LANGFUSE_SECRET_KEY: Optional[str] = None
+    LANGFUSE_HOST: str = "http://localhost:3000"
+    LANGFUSE_ENABLED: bool = True
 
     # App Settings
-    APP_ENV = os.getenv("APP_ENV", "development")
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    CACHE_TTL_DAYS = int(os.getenv("CACHE_TTL_DAYS", 7))
-    MAX_TOKENS_PER_QUERY = int(os.getenv("MAX_TOKENS_PER_QUERY", 15000))
-    BUDGET_LIMIT_TOKENS = int(os.getenv("BUDGET_LIMIT_TOKENS", 100000))
-    
+    APP_ENV: str = "development"
+    LOG_LEVEL: str = "INFO"
+    CACHE_TTL_DAYS: int = 7
+    MAX_TOKENS_PER_QUERY: int = 15000
+    BUDGET_LIMIT_TOKENS: int = 100000
+
     # Performance Optimization Settings
-    ENABLE_PARALLEL_SENTIMENT = os.getenv("ENABLE_PARALLEL_SENTIMENT", "true").lower() == "true"
-    SENTIMENT_MAX_WORKERS = int(os.getenv("SENTIMENT_MAX_WORKERS", "4"))
-    ENABLE_COMBINED_CONTENT_SCORING = os.getenv("ENABLE_COMBINED_CONTENT_SCORING", "true").lower() == "true"
+    ENABLE_PARALLEL_SENTIMENT: bool = True
+    SENTIMENT_MAX_WORKERS: int = 4
+    ENABLE_BATCHED_SENTIMENT: bool = True
+    ENABLE_PARALLEL_ANALYSIS: bool = True
+    ENABLE_COMBINED_CONTENT_SCORING: bool = True
+    ENABLE_FUSED_STRATEGY_PROMPT: bool = False
+    # Run the linear pipeline as direct calls instead of through LangGraph;
+    # set to "false" to go back to workflow.invoke/ainvoke
+    ENABLE_DIRECT_PIPELINE: bool = True
+
+    @property
+    def LOG_TRACEBACKS(self) -> bool:
+        """Whether error logs include tracebacks (formatting them is costly under error storms)"""
+        return self.APP_ENV != "production" or self.LOG_LEVEL.upper() == "DEBUG"
+
+    @field_validator(
+        "LANGFUSE_ENABLED",
+        "ENABLE_PARALLEL_SENTIMENT",
+        "ENABLE_BATCHED_SENTIMENT",
+        "ENABLE_PARALLEL_ANALYSIS",
+        "ENABLE_COMBINED_CONTENT_SCORING",
+        "ENABLE_FUSED_STRATEGY_PROMPT",
+        "ENABLE_DIRECT_PIPELINE",
+        mode="before",
+    )
+    @classmethod
+    def _parse_flag(cls, value):
+        """Flags are on only when set to "true" (any case)"""
+        if isinstance(value, str):
+            return value.lower() == "true"
+        return value
 
 config = Config()
@@ -5,21 +5,55 @@ Provides centralized tracing utilities for the Market Horizon AI pipeline.
 Integrates with Langfuse for LLM observability, debugging, and cost tracking.
 """
 
+from collections import OrderedDict
 from functools import wraps
 from typing import Optional, Dict, Any, Callable
 from datetime import datetime
+import contextvars
 import logging
+import queue
+import re
+import threading
+import time
 import uuid
 
 from core.config import config
 
 logger = logging.getLogger(__name__)
 
+# Date suffix on versioned model names, e.g. -2025-04-14
+_DATE_SUFFIX_RE = re.compile(r'-\d{4}-\d{2}-\d{2}$')
+
+# Resolved once at import; checked on every client lookup
+_LANGFUSE_ENABLED = config.LANGFUSE_ENABLED
+
 # Global Langfuse client instance
 _langfuse_client = None
 
-# Store active trace IDs for span creation
-_active_trace_ids: Dict[str, Any] = {}
+# Store active trace IDs for span creation. Bounded so traces whose Tracer
+# never exits (e.g. an abandoned generator) can't grow it without limit
+_MAX_ACTIVE_TRACES = 10_000
+_active_trace_ids: "OrderedDict[str, Any]" = OrderedDict()
+
+# Trace opened by the innermost Tracer in this context. Copied into
+# asyncio tasks and asyncio.to_thread calls; plain threads fall back to
+# the _active_trace_ids registry.
+_current_trace: contextvars.ContextVar[Optional[Any]] = contextvars.ContextVar(
+    "langfuse_current_trace", default=None
+)
+
+# LLM generation events are recorded by a background worker so the Langfuse
+# payload building stays off the agents' critical path
+_LOG_QUEUE_SIZE = 1000
+_log_queue: "queue.Queue" = queue.Queue(maxsize=_LOG_QUEUE_SIZE)
+_log_worker: Optional[threading.Thread] = None
+_log_worker_lock = threading.Lock()
+dropped_log_events = 0
+
+# Longest flush()/shutdown() wait for queued generation events. The queue is
+# shared by every pipeline in the process, so an unbounded join() would make
+# one run's flush wait on all the others
+_LOG_FLUSH_TIMEOUT = 5.0
 
 
 def get_langfuse_client():
@@ -29,12 +63,12 @@ def get_langfuse_client():
     """
     global _langfuse_client
 
-    if not config.LANGFUSE_ENABLED:
-        return None
-
     if _langfuse_client is not None:
         return _langfuse_client
 
+    if not _LANGFUSE_ENABLED:
+        return None
+
     if not config.LANGFUSE_PUBLIC_KEY or not config.LANGFUSE_SECRET_KEY:
         logger.warning(
             "Langfuse enabled but credentials not configured. "
@@ -74,7 +108,7 @@ def get_langfuse_callback_handler(trace_id: Optional[str] = None):
     Returns:
         CallbackHandler instance or None if Langfuse is not available
     """
-    if not config.LANGFUSE_ENABLED:
+    if not _LANGFUSE_ENABLED:
         return None
 
     if not config.LANGFUSE_PUBLIC_KEY or not config.LANGFUSE_SECRET_KEY:
@@ -99,14 +133,38 @@ def get_langfuse_callback_handler(trace_id: Optional[str] = None):
         return None
 
 
+def _register_trace(trace_id: str, trace: Any):
+    """Track an active trace, evicting the oldest beyond _MAX_ACTIVE_TRACES"""
+    _active_trace_ids[trace_id] = trace
+    while len(_active_trace_ids) > _MAX_ACTIVE_TRACES:
+        try:
+            _active_trace_ids.popitem(last=False)
+        except KeyError:
+            break
+
+
+def get_active_trace(trace_id: Optional[str]) -> Optional[Any]:
+    """
+    Get the live Langfuse trace for a trace ID.
+
+    Args:
+        trace_id: ID returned by Tracer
+
+    Returns:
+        Trace object, or None if the trace is not active
+    """
+    trace = _current_trace.get()
+    if trace is not None and trace.id == trace_id:
+        return trace
+    return _active_trace_ids.get(trace_id)
+
+
 def _normalize_model_name(model: str) -> str:
     """
     Normalize model names by removing date suffixes.
     e.g., 'gpt-4.1-mini-2025-04-14' -> 'gpt-4.1-mini'
     """
-    import re
-    # Remove date suffix pattern like -2025-04-14
-    return re.sub(r'-\d{4}-\d{2}-\d{2}$', '', model)
+    return _DATE_SUFFIX_RE.sub('', model)
 
 
 def log_llm_call(
@@ -138,17 +196,102 @@ def log_llm_call(
         end_time: When the LLM call ended (for latency calculation)
         metadata: Optional metadata dict
     """
-    if trace_id not in _active_trace_ids:
+    trace = get_active_trace(trace_id)
+    if trace is None:
         return
 
-    trace = _active_trace_ids.get(trace_id)
-    if not trace:
+    _enqueue_log_event((
+        trace, name, model, input_text, output_text,
+        input_tokens, output_tokens, start_time, end_time, metadata
+    ))
+
+
+def _enqueue_log_event(event: tuple):
+    """Queue a generation event, dropping the oldest one if the queue is full"""
+    global dropped_log_events
+
+    _ensure_log_worker()
+    while True:
+        try:
+            _log_queue.put_nowait(event)
+            return
+        except queue.Full:
+            try:
+                _log_queue.get_nowait()
+                _log_queue.task_done()
+                dropped_log_events += 1
+                logger.debug(f"Langfuse log queue full, dropped oldest event ({dropped_log_events} total)")
+            except queue.Empty:
+                pass
+
+
+def _ensure_log_worker():
+    """Start the background generation-logging worker, restarting it if it died"""
+    global _log_worker
+
+    if _log_worker is not None and _log_worker.is_alive():
         return
 
-    # Normalize model name (remove date suffix)
-    normalized_model = _normalize_model_name(model)
+    with _log_worker_lock:
+        if _log_worker is None or not _log_worker.is_alive():
+            _log_worker = threading.Thread(target=_drain_log_queue, name="langfuse-log-worker", daemon=True)
+            _log_worker.start()
+
+
+def _drain_log_queue():
+    """Worker loop: record queued generation events in Langfuse"""
+    while True:
+        event = _log_queue.get()
+        try:
+            _record_generation(*event)
+        except Exception as e:
+            # A bad event must not take the worker down with it
+            logger.debug(f"Dropped malformed LLM log event: {e}")
+        finally:
+            _log_queue.task_done()
+
+
+def _wait_for_log_queue(timeout: float = _LOG_FLUSH_TIMEOUT) -> bool:
+    """
+    Wait until queued generation events are recorded, at most timeout seconds.
+
+    Returns:
+        True if the queue drained, False if the wait timed out
+    """
+    if _log_worker is None:
+        return True
+
+    _ensure_log_worker()
+    deadline = time.monotonic() + timeout
+    with _log_queue.all_tasks_done:
+        while _log_queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(
+                    f"Timed out waiting for {_log_queue.unfinished_tasks} queued LLM log events"
+                )
+                return False
+            _log_queue.all_tasks_done.wait(remaining)
+    return True
+
 
+def _record_generation(
+    trace: Any,
+    name: str,
+    model: str,
+    input_text: str,
+    output_text: str,
+    input_tokens: int,
+    output_tokens: int,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    metadata: Optional[Dict[str, Any]]
+):
+    """Create and end a Langfuse generation for one LLM call"""
     try:
+        # Normalize model name (remove date suffix)
+        normalized_model = _normalize_model_name(model)
+
         generation = trace.generation(
             name=name,
             model=normalized_model,
@@ -193,6 +336,7 @@ class Tracer:
         self.trace = None
         self.id = None
         self.start_time = None
+        self._context_token = None
 
     def __enter__(self):
         self.start_time = datetime.now()
@@ -207,7 +351,8 @@ class Tracer:
                     metadata=self.metadata,
                 )
                 self.id = self.trace.id
-                _active_trace_ids[self.id] = self.trace
+                _register_trace(self.id, self.trace)
+                self._context_token = _current_trace.set(self.trace)
                 logger.debug(f"Created Langfuse trace: {self.name} (id: {self.id})")
             except Exception as e:
                 logger.warning(f"Failed to create Langfuse trace: {e}")
@@ -228,11 +373,17 @@ class Tracer:
                     output_data["error_type"] = exc_type.__name__
 
                 self.trace.update(output=output_data)
-
-                if self.id in _active_trace_ids:
-                    del _active_trace_ids[self.id]
             except Exception as e:
                 logger.warning(f"Failed to end Langfuse trace: {e}")
+            finally:
+                _active_trace_ids.pop(self.id, None)
+                if self._context_token is not None:
+                    try:
+                        _current_trace.reset(self._context_token)
+                    except ValueError:
+                        # Exited from a different context (e.g. a finalized async generator)
+                        pass
+                    self._context_token = None
 
         return False
 
@@ -241,6 +392,9 @@ class Span:
     """
     Context manager for creating Langfuse spans within a trace using v2 API.
 
+    The span is sent as a single event on exit (with its start and end
+    times) rather than as a create followed by an end update.
+
     Usage:
         with Span(trace_id, "research_agent", metadata={"sources": 3}) as span:
             # Execute agent logic
@@ -264,22 +418,6 @@ class Span:
 
     def __enter__(self):
         self.start_time = datetime.now()
-
-        if self.trace_id not in _active_trace_ids:
-            return self
-
-        trace = _active_trace_ids.get(self.trace_id)
-        if trace:
-            try:
-                self.span = trace.span(
-                    name=self.name,
-                    input=self.input_data,
-                    metadata=self.metadata,
-                )
-                logger.debug(f"Created Langfuse span: {self.name}")
-            except Exception as e:
-                logger.warning(f"Failed to create Langfuse span: {e}")
-
         return self
 
     def update(self, output: Any = None, metadata: Optional[Dict[str, Any]] = None):
@@ -290,9 +428,11 @@ class Span:
             self.metadata.update(metadata)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration_ms = (datetime.now() - self.start_time).total_seconds() * 1000
+        end_time = datetime.now()
+        duration_ms = (end_time - self.start_time).total_seconds() * 1000
 
-        if self.span:
+        trace = get_active_trace(self.trace_id)
+        if trace is not None:
             try:
                 output_data = self._output or {}
                 if isinstance(output_data, dict):
@@ -301,13 +441,63 @@ class Span:
                         output_data["error"] = str(exc_val)
                         output_data["error_type"] = exc_type.__name__
 
-                self.span.end(output=output_data, metadata=self.metadata)
+                self.span = trace.span(
+                    name=self.name,
+                    start_time=self.start_time,
+                    end_time=end_time,
+                    input=self.input_data,
+                    output=output_data,
+                    metadata=self.metadata,
+                )
+                logger.debug(f"Recorded Langfuse span: {self.name}")
             except Exception as e:
-                logger.warning(f"Failed to end Langfuse span: {e}")
+                logger.warning(f"Failed to record Langfuse span: {e}")
 
         return False
 
 
+class _NoOpTracer:
+    """Tracer used when Langfuse is disabled: only assigns a trace ID"""
+
+    def __init__(self, name: str, metadata: Optional[Dict[str, Any]] = None,
+                 user_id: Optional[str] = None, session_id: Optional[str] = None):
+        self.name = name
+        self.trace = None
+        self.id = None
+
+    def __enter__(self):
+        self.id = str(uuid.uuid4())
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class _NoOpSpan:
+    """Span used when Langfuse is disabled"""
+
+    __slots__ = ()
+
+    def __init__(self, trace_id: str, name: str, metadata: Optional[Dict[str, Any]] = None,
+                 input_data: Optional[Any] = None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def update(self, output: Any = None, metadata: Optional[Dict[str, Any]] = None):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+# With Langfuse disabled, skip the trace/span bookkeeping entirely
+if not _LANGFUSE_ENABLED:
+    Tracer = _NoOpTracer
+    Span = _NoOpSpan
+
+
 def create_span(trace_id: str, name: str, input_data: Optional[Dict] = None) -> Optional[Any]:
     """
     Create a manual span for API call tracing (v2 API).
@@ -320,11 +510,8 @@ def create_span(trace_id: str, name: str, input_data: Optional[Dict] = None) ->
     Returns:
         Span object or None if tracing unavailable
     """
-    if trace_id not in _active_trace_ids:
-        return None
-
-    trace = _active_trace_ids.get(trace_id)
-    if not trace:
+    trace = get_active_trace(trace_id)
+    if trace is None:
         return None
 
     try:
@@ -433,6 +620,9 @@ def log_score(
 
 def flush():
     """Flush any pending Langfuse events"""
+    # Let the background worker record queued generations first
+    _wait_for_log_queue()
+
     client = get_langfuse_client()
     if client:
         try:
@@ -444,6 +634,8 @@ def flush():
 def shutdown():
     """Shutdown Langfuse client gracefully"""
     global _langfuse_client
+    _wait_for_log_queue()
+
     if _langfuse_client:
         try:
             _langfuse_client.flush()
@@ -1,12 +1,79 @@
 from langgraph.graph import StateGraph, END
-from core.state import AgentState
+from langchain_core.runnables import RunnableLambda
+from core.state import AgentError, AgentState, elapsed_seconds
+from core.config import config
 from core.observability import Tracer, Span, flush as flush_traces, log_score
 from utils.cache_manager import get_cache_manager
+from utils.async_loop import run_sync
+from concurrent.futures import Future
 from datetime import datetime
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Union
+import asyncio
+import copy
+import functools
+import hashlib
 import logging
+import threading
+import time
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Skeleton of the report returned when the pipeline ends without a quality report
+_FALLBACK_VALIDATED_INSIGHTS = MappingProxyType({
+    "competitors": [],
+    "content_themes": [],
+    "positioning_map": {},
+    "content_recommendations": [],
+    "strategic_recommendations": []
+})
+# State key each workflow node produces
+_NODE_OUTPUT_KEYS = MappingProxyType({
+    "research": "research_data",
+    "analysis": "analysis_insights",
+    "strategy": "strategy_recommendations",
+    "quality": "quality_report",
+})
+_FALLBACK_QUALITY_FLAG = MappingProxyType({
+    "type": "error",
+    "message": "Pipeline incomplete - agents not fully initialized",
+    "agent": "orchestrator"
+})
+
+# Agent instances shared by every orchestrator and concurrent run, since
+# building them loads spaCy models and API clients. Agents must not keep
+# per-run state on self: the trace ID and intermediate results are passed
+# through their helper methods instead
+_AGENTS = None
+_AGENTS_LOCK = threading.Lock()
+
+
+def _get_agents() -> tuple:
+    """Import and construct the four agents once per process"""
+    global _AGENTS
+    if _AGENTS is None:
+        with _AGENTS_LOCK:
+            if _AGENTS is None:
+                # Import agents here to avoid circular imports
+                from agents.research_agent import ResearchAgent
+                from agents.analysis_agent import AnalysisAgent
+                from agents.strategy_agent import StrategyAgent
+                from agents.quality_agent import QualityAgent
+
+                _AGENTS = (ResearchAgent(), AnalysisAgent(), StrategyAgent(), QualityAgent())
+    return _AGENTS
+
+
+class _InflightCall:
+    """An agent call in progress and the number of pipelines waiting on it"""
+
+    __slots__ = ("future", "waiters")
+
+    def __init__(self):
+        self.future = Future()
+        self.waiters = 0
+
 
 class AgentOrchestrator:
     """
@@ -17,36 +84,65 @@ class AgentOrchestrator:
     
     def __init__(self):
         """Initialize orchestrator and build workflow"""
-        # Import agents here to avoid circular imports
-        from agents.research_agent import ResearchAgent
-        from agents.analysis_agent import AnalysisAgent
-        from agents.strategy_agent import StrategyAgent
-        from agents.quality_agent import QualityAgent
-
         # Initialize cache manager
         self.cache = get_cache_manager()
 
-        # Initialize all agents
-        self.research_agent = ResearchAgent()
-        self.analysis_agent = AnalysisAgent()
-        self.strategy_agent = StrategyAgent()
-        self.quality_agent = QualityAgent()
+        # Agents are shared across orchestrator instances
+        (
+            self.research_agent,
+            self.analysis_agent,
+            self.strategy_agent,
+            self.quality_agent,
+        ) = _get_agents()
 
-        self.workflow = self._build_workflow()
+        # Agent calls currently running, keyed by (agent, input hash), so
+        # concurrent pipelines with identical inputs share one call
+        self._inflight: Dict[str, _InflightCall] = {}
+        self._inflight_lock = threading.Lock()
+
+        # The graph shape is fixed, so it is compiled once per class; nodes
+        # find this instance through the run config
+        self.workflow = type(self)._get_workflow()
+        self._run_config = {"configurable": {"orchestrator": self}}
 
         logger.info("AgentOrchestrator initialized with all 4 agents")
         logger.info(f"Cache manager initialized with database at data/cache.db")
     
-    def _build_workflow(self) -> StateGraph:
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_workflow(cls):
+        """Compiled workflow shared by every instance of this class"""
+        return cls._build_workflow()
+
+    @staticmethod
+    def _node(method_name: str):
+        """Workflow node that dispatches to the orchestrator running the graph"""
+        def node(state: AgentState, config) -> dict:
+            return getattr(config["configurable"]["orchestrator"], method_name)(state)
+        return node
+
+    @staticmethod
+    def _anode(method_name: str):
+        """Async counterpart of _node"""
+        async def node(state: AgentState, config) -> dict:
+            return await getattr(config["configurable"]["orchestrator"], method_name)(state)
+        return node
+
+    @classmethod
+    def _build_workflow(cls) -> StateGraph:
         """Build LangGraph workflow with StateGraph API (LangGraph 1.0.2)"""
         # Create workflow with AgentState
         workflow = StateGraph(AgentState)
         
         # Add nodes for each agent
-        workflow.add_node("research", self._run_research)
-        workflow.add_node("analysis", self._run_analysis)
-        workflow.add_node("strategy", self._run_strategy)
-        workflow.add_node("quality", self._run_quality)
+        workflow.add_node("research", cls._node("_run_research"))
+        workflow.add_node("analysis", cls._node("_run_analysis"))
+        # Strategy has a native async path for ainvoke; the other agents are
+        # blocking and LangGraph runs them in its executor under ainvoke
+        workflow.add_node("strategy", RunnableLambda(
+            cls._node("_run_strategy"), afunc=cls._anode("_arun_strategy"), name="strategy"
+        ))
+        workflow.add_node("quality", cls._node("_run_quality"))
         
         # Define workflow edges (sequential execution)
         workflow.set_entry_point("research")
@@ -58,17 +154,20 @@ class AgentOrchestrator:
         # Compile and return the workflow
         return workflow.compile()
     
-    def _run_research(self, state: AgentState) -> AgentState:
+    def _run_research(self, state: AgentState) -> dict:
         """Execute Research Agent"""
-        state["current_agent"] = "research"
+        update = {"current_agent": "research"}
         logger.info(f"Research Agent: Processing query '{state['query']}'")
 
         trace_id = state.get("trace_id")
         with Span(trace_id, "research_agent", input_data={"query": state["query"]}) as span:
             try:
-                result = self.research_agent.run(state["query"], trace_id=trace_id)
-                state["research_data"] = result
-                state["api_calls"] += 1
+                result = self._coalesce(
+                    f"research:{state['query']}",
+                    lambda: self.research_agent.run(state["query"], trace_id=trace_id)
+                )
+                update["research_data"] = result
+                update["api_calls"] = 1
                 logger.info("Research Agent: Completed successfully")
 
                 # Update span with output summary
@@ -78,28 +177,29 @@ class AgentOrchestrator:
                 })
 
             except Exception as e:
-                logger.error(f"Research agent failed: {e}", exc_info=True)
-                state["errors"].append({
-                    "agent": "research",
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat(),
-                    "fallback_used": False
-                })
-                span.update(output={"success": False, "error": str(e)})
+                update["errors"] = [self._record_agent_error("research", e, span)]
 
-        return state
+        return update
     
-    def _run_analysis(self, state: AgentState) -> AgentState:
+    def _run_analysis(self, state: AgentState) -> dict:
         """Execute Analysis Agent"""
-        state["current_agent"] = "analysis"
+        update = {"current_agent": "analysis"}
         logger.info("Analysis Agent: Processing research data")
 
         trace_id = state.get("trace_id")
         with Span(trace_id, "analysis_agent", input_data={"has_research_data": bool(state.get("research_data"))}) as span:
             try:
-                result = self.analysis_agent.run(state["research_data"], trace_id=trace_id)
-                state["analysis_insights"] = result
-                state["api_calls"] += 1
+                # The agent's own cache key identifies identical inputs, so the
+                # research data is hashed once for both coalescing and the cache
+                cache_key = self.analysis_agent.input_key(state["research_data"])
+                result = self._coalesce(
+                    f"analysis:{cache_key}",
+                    lambda: self.analysis_agent.run(
+                        state["research_data"], trace_id=trace_id, cache_key=cache_key
+                    )
+                )
+                update["analysis_insights"] = result
+                update["api_calls"] = 1
                 logger.info("Analysis Agent: Completed successfully")
 
                 span.update(output={
@@ -109,29 +209,25 @@ class AgentOrchestrator:
                 })
 
             except Exception as e:
-                logger.error(f"Analysis agent failed: {e}", exc_info=True)
-                state["errors"].append({
-                    "agent": "analysis",
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat(),
-                    "fallback_used": False
-                })
-                span.update(output={"success": False, "error": str(e)})
+                update["errors"] = [self._record_agent_error("analysis", e, span)]
 
-        return state
+        return update
     
-    def _run_strategy(self, state: AgentState) -> AgentState:
+    def _run_strategy(self, state: AgentState) -> dict:
         """Execute Strategy Agent"""
-        state["current_agent"] = "strategy"
+        update = {"current_agent": "strategy"}
         logger.info("Strategy Agent: Generating recommendations")
 
         trace_id = state.get("trace_id")
         query = state.get("query", "")  # Pass query for content gap analysis
         with Span(trace_id, "strategy_agent", input_data={"has_analysis_insights": bool(state.get("analysis_insights"))}) as span:
             try:
-                result = self.strategy_agent.run(state["analysis_insights"], trace_id=trace_id, query=query)
-                state["strategy_recommendations"] = result
-                state["api_calls"] += 1
+                result = self._coalesce(
+                    self._inflight_key("strategy", (state["analysis_insights"], query)),
+                    lambda: self.strategy_agent.run(state["analysis_insights"], trace_id=trace_id, query=query)
+                )
+                update["strategy_recommendations"] = result
+                update["api_calls"] = 1
                 logger.info("Strategy Agent: Completed successfully")
 
                 span.update(output={
@@ -141,27 +237,48 @@ class AgentOrchestrator:
                 })
 
             except Exception as e:
-                logger.error(f"Strategy agent failed: {e}", exc_info=True)
-                state["errors"].append({
-                    "agent": "strategy",
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat(),
-                    "fallback_used": False
-                })
-                span.update(output={"success": False, "error": str(e)})
+                update["errors"] = [self._record_agent_error("strategy", e, span)]
 
-        return state
+        return update
     
-    def _run_quality(self, state: AgentState) -> AgentState:
+    async def _arun_strategy(self, state: AgentState) -> dict:
+        """Execute Strategy Agent on the event loop (used by ainvoke)"""
+        update = {"current_agent": "strategy"}
+        logger.info("Strategy Agent: Generating recommendations")
+
+        trace_id = state.get("trace_id")
+        query = state.get("query", "")
+        with Span(trace_id, "strategy_agent", input_data={"has_analysis_insights": bool(state.get("analysis_insights"))}) as span:
+            try:
+                result = await self._acoalesce(
+                    self._inflight_key("strategy", (state["analysis_insights"], query)),
+                    lambda: self.strategy_agent.arun(state["analysis_insights"], trace_id=trace_id, query=query)
+                )
+                update["strategy_recommendations"] = result
+                update["api_calls"] = 1
+                logger.info("Strategy Agent: Completed successfully")
+
+                span.update(output={
+                    "opportunity_zones": len(result.get("opportunity_zones", [])) if result else 0,
+                    "content_recommendations": len(result.get("content_recommendations", [])) if result else 0,
+                    "success": True,
+                })
+
+            except Exception as e:
+                update["errors"] = [self._record_agent_error("strategy", e, span)]
+
+        return update
+
+    def _run_quality(self, state: AgentState) -> dict:
         """Execute Quality Agent"""
-        state["current_agent"] = "quality"
+        update = {"current_agent": "quality"}
         logger.info("Quality Agent: Validating outputs")
 
         trace_id = state.get("trace_id")
         with Span(trace_id, "quality_agent", input_data={"has_strategy_recommendations": bool(state.get("strategy_recommendations"))}) as span:
             try:
                 result = self.quality_agent.run(state, trace_id=trace_id)
-                state["quality_report"] = result
+                update["quality_report"] = result
                 logger.info("Quality Agent: Completed successfully")
 
                 span.update(output={
@@ -171,16 +288,9 @@ class AgentOrchestrator:
                 })
 
             except Exception as e:
-                logger.error(f"Quality agent failed: {e}", exc_info=True)
-                state["errors"].append({
-                    "agent": "quality",
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat(),
-                    "fallback_used": False
-                })
-                span.update(output={"success": False, "error": str(e)})
+                update["errors"] = [self._record_agent_error("quality", e, span)]
 
-        return state
+        return update
     
     def run(self, query: str, parameters: dict = None) -> dict:
         """
@@ -196,52 +306,369 @@ class AgentOrchestrator:
         logger.info(f"Orchestrator: Starting pipeline for query: '{query}'")
 
         # Create Langfuse trace for the entire pipeline
-        with Tracer(
-            name="market_horizon_pipeline",
-            user_id="streamlit-user",  # Default user for Streamlit app
-            metadata={
-                "query": query,
-                "parameters": parameters or {},
-            }
-        ) as trace:
+        with self._pipeline_tracer(query, parameters) as trace:
             # Initialize state with trace_id for child spans
-            initial_state: AgentState = {
-                "query": query,
-                "parameters": parameters or {},
-                "research_data": None,
-                "analysis_insights": None,
-                "strategy_recommendations": None,
-                "quality_report": None,
-                "errors": [],
-                "retry_count": 0,
-                "start_time": datetime.now(),
-                "current_agent": "",
-                "total_tokens": 0,
-                "api_calls": 0,
-                "trace_id": trace.id,  # Pass trace ID to agents
-            }
+            initial_state = self._initial_state(query, parameters, trace.id)
 
             # Execute workflow
-            final_state = self.workflow.invoke(initial_state)
-
-            # Compile the output
-            output = self._compile_output(final_state)
-
-            # Log quality score to Langfuse
-            confidence_score = output.get("report_metadata", {}).get("confidence_score", 0)
-            if trace.id and confidence_score:
-                log_score(
-                    trace_id=trace.id,
-                    name="confidence_score",
-                    value=confidence_score,
-                    comment=f"Pipeline confidence score based on data quality and completeness"
-                )
+            if config.ENABLE_DIRECT_PIPELINE:
+                final_state = self._run_direct(initial_state)
+            else:
+                final_state = self.workflow.invoke(initial_state, config=self._run_config)
+
+            output = self._finish_run(trace.id, final_state)
 
             # Flush traces before returning
             flush_traces()
 
             return output
+
+    def _run_direct(self, state: AgentState) -> AgentState:
+        """Run the four nodes in order without LangGraph (the graph is strictly linear)"""
+        for node in (self._run_research, self._run_analysis, self._run_strategy, self._run_quality):
+            self._apply_update(state, node(state))
+        return state
+
+    async def _arun_direct(self, state: AgentState) -> AgentState:
+        """Async counterpart of _run_direct; blocking agents run in worker threads"""
+        self._apply_update(state, await asyncio.to_thread(self._run_research, state))
+        self._apply_update(state, await asyncio.to_thread(self._run_analysis, state))
+        self._apply_update(state, await self._arun_strategy(state))
+        self._apply_update(state, await asyncio.to_thread(self._run_quality, state))
+        return state
+
+    def stream_updates(self, query: str, parameters: dict = None) -> Iterator[dict]:
+        """
+        Execute full pipeline, yielding each agent's output as soon as it finishes
+
+        Synchronous counterpart of run_stream built on the workflow's
+        "updates" stream, for callers without an event loop.
+
+        Args:
+            query: User's market research query
+            parameters: Optional parameters for customization
+
+        Yields:
+            {"agent": node name, "result": that agent's output}; the last item
+            has agent "complete" and carries the same report as run()
+        """
+        logger.info(f"Orchestrator: Starting update stream for query: '{query}'")
+
+        with self._pipeline_tracer(query, parameters, streaming=True) as trace:
+            final_state = self._initial_state(query, parameters, trace.id)
+
+            for chunk in self.workflow.stream(final_state, config=self._run_config, stream_mode="updates"):
+                for node, update in chunk.items():
+                    self._apply_update(final_state, update)
+                    yield {"agent": node, "result": update.get(_NODE_OUTPUT_KEYS[node])}
+
+            output = self._finish_run(trace.id, final_state)
+
+            flush_traces()
+
+            yield {"agent": "complete", "result": output}
+
+    async def arun(self, query: str, parameters: dict = None) -> dict:
+        """
+        Execute full pipeline without blocking the event loop
+
+        Same result as run(). Blocking agents run in LangGraph's executor and
+        the Strategy Agent runs natively async, so many pipelines can share
+        one event loop.
+
+        Args:
+            query: User's market research query
+            parameters: Optional parameters for customization
+
+        Returns:
+            Final quality report with all insights
+        """
+        logger.info(f"Orchestrator: Starting async pipeline for query: '{query}'")
+
+        with self._pipeline_tracer(query, parameters) as trace:
+            initial_state = self._initial_state(query, parameters, trace.id)
+
+            if config.ENABLE_DIRECT_PIPELINE:
+                final_state = await self._arun_direct(initial_state)
+            else:
+                final_state = await self.workflow.ainvoke(initial_state, config=self._run_config)
+
+            output = self._finish_run(trace.id, final_state)
+
+            # Flushing waits on the log worker and Langfuse HTTP calls
+            await asyncio.to_thread(flush_traces)
+
+            return output
+
+    async def arun_batch(
+        self,
+        queries: List[str],
+        parameters: dict = None,
+        max_concurrency: int = 4,
+        rate_limit: Optional[float] = None,
+    ) -> List[Union[dict, Exception]]:
+        """
+        Execute the pipeline for many queries concurrently
+
+        All runs share this orchestrator's compiled workflow, agents and cache.
+
+        Args:
+            queries: Market research queries
+            parameters: Optional parameters applied to every query
+            max_concurrency: Maximum number of pipelines running at once
+            rate_limit: Optional maximum number of pipeline starts per second
+
+        Returns:
+            One entry per query, in order: the report, or the exception that
+            query's pipeline raised
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        min_interval = 1.0 / rate_limit if rate_limit else 0.0
+        start_lock = asyncio.Lock()
+        next_start = 0.0
+
+        async def run_one(query: str) -> dict:
+            nonlocal next_start
+            async with semaphore:
+                if min_interval:
+                    # Space pipeline starts to stay under provider rate limits
+                    async with start_lock:
+                        delay = next_start - time.monotonic()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        next_start = time.monotonic() + min_interval
+                return await self.arun(query, parameters)
+
+        logger.info(f"Orchestrator: Starting batch of {len(queries)} queries (max_concurrency={max_concurrency})")
+        return await asyncio.gather(*(run_one(query) for query in queries), return_exceptions=True)
+
+    def run_batch(
+        self,
+        queries: List[str],
+        parameters: dict = None,
+        max_concurrency: int = 4,
+        rate_limit: Optional[float] = None,
+    ) -> List[Union[dict, Exception]]:
+        """
+        Synchronous wrapper for arun_batch (call from code without a running event loop)
+
+        Args:
+            queries: Market research queries
+            parameters: Optional parameters applied to every query
+            max_concurrency: Maximum number of pipelines running at once
+            rate_limit: Optional maximum number of pipeline starts per second
+
+        Returns:
+            One report or exception per query, in order
+        """
+        # Same persistent loop as the agents' sync paths, so pooled async
+        # clients are never left bound to a closed loop
+        return run_sync(self.arun_batch(queries, parameters, max_concurrency, rate_limit))
+
+    def _pipeline_tracer(self, query: str, parameters: dict, **metadata) -> Tracer:
+        """Create the Langfuse trace wrapping one pipeline run"""
+        return Tracer(
+            name="market_horizon_pipeline",
+            user_id="streamlit-user",  # Default user for Streamlit app
+            metadata={
+                "query": query,
+                "parameters": parameters or {},
+                **metadata,
+            }
+        )
+
+    def _finish_run(self, trace_id, final_state: AgentState) -> dict:
+        """Compile the output and log its confidence score to Langfuse"""
+        output = self._compile_output(final_state)
+
+        confidence_score = output.get("report_metadata", {}).get("confidence_score", 0)
+        if trace_id and confidence_score:
+            log_score(
+                trace_id=trace_id,
+                name="confidence_score",
+                value=confidence_score,
+                comment=f"Pipeline confidence score based on data quality and completeness"
+            )
+
+        return output
     
+    async def run_stream(self, query: str, parameters: dict = None) -> AsyncIterator[dict]:
+        """
+        Execute full pipeline, yielding progress events as agents finish
+
+        Runs the same agents as run(), but streams the Strategy Agent's
+        positioning map and content recommendations as soon as each is ready.
+
+        Args:
+            query: User's market research query
+            parameters: Optional parameters for customization
+
+        Yields:
+            Stage event dicts ({"stage": ..., "data": ...}); the last event has
+            stage "complete" and carries the same report as run()
+        """
+        logger.info(f"Orchestrator: Starting streaming pipeline for query: '{query}'")
+
+        with self._pipeline_tracer(query, parameters, streaming=True) as trace:
+            state = self._initial_state(query, parameters, trace.id)
+
+            # Research and analysis are blocking; keep them off the event loop
+            self._apply_update(state, await asyncio.to_thread(self._run_research, state))
+            yield {"stage": "research", "data": {
+                "sources_count": len((state.get("research_data") or {}).get("sources", []))
+            }}
+
+            self._apply_update(state, await asyncio.to_thread(self._run_analysis, state))
+            insights = state.get("analysis_insights") or {}
+            yield {"stage": "analysis", "data": {
+                "competitors": insights.get("competitors", []),
+                "themes_count": len(insights.get("content_themes", []))
+            }}
+
+            state["current_agent"] = "strategy"
+            with Span(trace.id, "strategy_agent", input_data={"has_analysis_insights": bool(insights), "streaming": True}) as span:
+                try:
+                    async for event in self.strategy_agent.run_stream(insights, trace_id=trace.id, query=query):
+                        if event["stage"] == "complete":
+                            state["strategy_recommendations"] = event["data"]
+                        else:
+                            yield event
+                    state["api_calls"] += 1
+
+                    result = state["strategy_recommendations"] or {}
+                    span.update(output={
+                        "opportunity_zones": len(result.get("opportunity_zones", [])),
+                        "content_recommendations": len(result.get("content_recommendations", [])),
+                        "success": True,
+                    })
+
+                except Exception as e:
+                    state["errors"].append(self._record_agent_error("strategy", e, span))
+
+            self._apply_update(state, await asyncio.to_thread(self._run_quality, state))
+            output = self._finish_run(trace.id, state)
+
+            await asyncio.to_thread(flush_traces)
+
+            yield {"stage": "complete", "data": output}
+
+    def _inflight_key(self, agent: str, payload: Any) -> str:
+        """Content-addressed key for an agent call"""
+        digest = hashlib.blake2b(
+            orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str),
+            digest_size=16
+        ).hexdigest()
+        return f"{agent}:{digest}"
+
+    def _claim(self, key: str):
+        """Return (future, is_leader) for an agent call, registering a new future if none is running"""
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            if call is not None:
+                call.waiters += 1
+                return call.future, False
+            call = _InflightCall()
+            self._inflight[key] = call
+            return call.future, True
+
+    def _release(self, key: str, future: Future, result: Any = None, error: Optional[BaseException] = None):
+        """
+        Publish the leader's outcome to any waiting pipelines
+
+        With waiters, the result is published as a snapshot so the leader's
+        pipeline can keep mutating its own dicts while followers copy from
+        it; with none (the common case) nothing is copied.
+        """
+        with self._inflight_lock:
+            call = self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        elif call is not None and call.waiters:
+            future.set_result(copy.deepcopy(result))
+        else:
+            future.set_result(result)
+
+    def _coalesce(self, key: str, call: Callable[[], Any]) -> Any:
+        """
+        Run an agent call, or wait for an identical one already in flight
+
+        Nodes run on worker threads under ainvoke, so waiting is a blocking
+        Future.result(). The agents' own SQLite caches serve repeats once the
+        call has finished. Followers each get their own copy of the result,
+        since pipelines mutate the dicts they are handed.
+
+        Args:
+            key: "<agent>:<input key>" identifying identical calls
+            call: Runs the agent when this caller is the leader
+        """
+        future, is_leader = self._claim(key)
+        if not is_leader:
+            logger.info(f"Joining in-flight agent call {key}")
+            return copy.deepcopy(future.result())
+
+        try:
+            result = call()
+        except BaseException as e:
+            self._release(key, future, error=e)
+            raise
+        self._release(key, future, result)
+        return result
+
+    async def _acoalesce(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of _coalesce; shares the same in-flight table"""
+        future, is_leader = self._claim(key)
+        if not is_leader:
+            logger.info(f"Joining in-flight agent call {key}")
+            return copy.deepcopy(await asyncio.wrap_future(future))
+
+        try:
+            result = await call()
+        except BaseException as e:
+            self._release(key, future, error=e)
+            raise
+        self._release(key, future, result)
+        return result
+
+    def _record_agent_error(self, agent: str, error: Exception, span: Span) -> AgentError:
+        """Log an agent failure, record it on the agent's span and return the state error entry"""
+        logger.error(f"{agent.capitalize()} agent failed: {error}", exc_info=config.LOG_TRACEBACKS)
+        message = str(error)
+        span.update(output={"success": False, "error": message})
+        return {
+            "agent": agent,
+            "error": message,
+            "timestamp": datetime.now().isoformat(),
+            "fallback_used": False
+        }
+
+    @staticmethod
+    def _apply_update(state: AgentState, update: dict):
+        """Merge a node's update into state the way the workflow's reducers do"""
+        for key, value in update.items():
+            if key in ("errors", "api_calls"):
+                state[key] = state[key] + value
+            else:
+                state[key] = value
+
+    def _initial_state(self, query: str, parameters: dict, trace_id) -> AgentState:
+        """Build the initial pipeline state"""
+        return {
+            "query": query,
+            "parameters": parameters or {},
+            "research_data": None,
+            "analysis_insights": None,
+            "strategy_recommendations": None,
+            "quality_report": None,
+            "errors": [],
+            "retry_count": 0,
+            "start_time": datetime.now(),
+            "start_perf": time.perf_counter(),
+            "current_agent": "",
+            "total_tokens": 0,
+            "api_calls": 0,
+            "trace_id": trace_id,  # Pass trace ID to agents
+        }
+
     def _compile_output(self, state: AgentState) -> dict:
         """Compile final output from state"""
         # If quality report exists, return it
@@ -249,7 +676,7 @@ class AgentOrchestrator:
             return state["quality_report"]
 
         # Fallback: construct basic report
-        processing_time = (datetime.now() - state["start_time"]).total_seconds()
+        processing_time = elapsed_seconds(state)
 
         return {
             "report_metadata": {
@@ -260,20 +687,9 @@ class AgentOrchestrator:
                 "confidence_score": 0.0,
                 "errors": state["errors"]
             },
-            "validated_insights": {
-                "competitors": [],
-                "content_themes": [],
-                "positioning_map": {},
-                "content_recommendations": [],
-                "strategic_recommendations": []
-            },
-            "quality_flags": [
-                {
-                    "type": "error",
-                    "message": "Pipeline incomplete - agents not fully initialized",
-                    "agent": "orchestrator"
-                }
-            ],
+            # Copy the (empty) containers so reports never share the template's lists
+            "validated_insights": {key: value.copy() for key, value in _FALLBACK_VALIDATED_INSIGHTS.items()},
+            "quality_flags": [dict(_FALLBACK_QUALITY_FLAG)],
             "source_attribution": {}
         }
 
@@ -365,8 +781,7 @@ if __name__ == "__main__":
     result = orchestrator.run(query)
     
     # Print result
-    import json
     print("\n" + "="*60)
     print("ORCHESTRATOR TEST RESULT")
     print("="*60)
-    print(json.dumps(result, indent=2))
\ No newline at end of file
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode())
\ No newline at end of file
@@ -1,6 +1,9 @@
 """
 LLM Prompts for Market Horizon AI Agents
 """
+import functools
+import keyword
+import string
 
 # ============================================================================
 # RESEARCH AGENT PROMPTS
@@ -123,11 +126,13 @@ Provide your analysis in JSON format with scores and detailed rationale.
 # STRATEGY AGENT PROMPTS
 # ============================================================================
 
-POSITIONING_PROMPT = """
-Analyze the following competitors and assign positioning coordinates on a 2D map:
+# Strategy prompts (and the analysis theme/sentiment prompts) keep all static
+# instructions before this delimiter and the per-call data after it, so the instruction block is an identical request
+# prefix across calls (eligible for provider-side prompt caching)
+PROMPT_DATA_DELIMITER = "---DATA---"
 
-Competitor data:
-{competitor_data}
+POSITIONING_PROMPT = """
+Analyze the competitors in the data section below and assign positioning coordinates on a 2D map.
 
 Task: Assign X,Y coordinates for each competitor on a 1-10 scale:
 - **X-axis**: Price Positioning (1=budget, 10=premium)
@@ -151,14 +156,19 @@ Consider these factors:
    - Simple, easy-to-use tools → lower scores
    - Advanced features, customization → higher scores
 
-Output **ONLY** valid JSON with company names as keys and x,y coordinates:
+Output **ONLY** valid JSON with one entry per competitor (name exactly as given) and x,y coordinates:
 
 {{
-  "Company A": {{"x": 7.5, "y": 8.0, "rationale": "Enterprise focus, premium pricing"}},
-  "Company B": {{"x": 3.0, "y": 4.5, "rationale": "SMB focus, affordable pricing"}}
+  "positions": [
+    {{"name": "Company A", "x": 7.5, "y": 8.0, "rationale": "Enterprise focus, premium pricing"}},
+    {{"name": "Company B", "x": 3.0, "y": 4.5, "rationale": "SMB focus, affordable pricing"}}
+  ]
 }}
 
 Ensure all coordinates are between 1.0 and 10.0.
+---DATA---
+Competitor data:
+{competitor_data}
 """
 
 CONTENT_GAP_PROMPT = """
@@ -298,12 +308,7 @@ Highlight any unsupported claims that need additional research.
 THEME_EXTRACTION_PROMPT = """
 You are analyzing search results to identify meaningful business concepts that users care about.
 
-Query context: {query}
-
-Source content to analyze:
-{source_content}
-
-Your task: Identify 5 distinct BUSINESS CONCEPTS discussed across these sources.
+Your task: Identify 5 distinct BUSINESS CONCEPTS discussed across the sources in the data section below.
 
 RULES FOR GOOD THEMES:
 1. Each theme MUST be a multi-word phrase (2-5 words) representing a specific topic
@@ -355,129 +360,149 @@ Output ONLY valid JSON in this exact format:
 IMPORTANT: Each quote must be an ACTUAL substring from the source text, not a paraphrase.
 
 Analyze the sources and extract exactly 5 themes.
-"""
-
-# ============================================================================
-# CONTENT GAP ANALYSIS PROMPT (Phase 3 Fix)
-# ============================================================================
-
-CONTENT_GAP_ANALYSIS_PROMPT = """
-You are a content strategist analyzing market research to identify specific content opportunities.
 
+---DATA---
 Query context: {query}
 
-Themes identified (with source evidence):
-{themes_with_evidence}
-
-Competitors in market:
-{competitors}
-
-Your task: For each theme, identify a SPECIFIC content gap and generate an actionable recommendation.
+Source content to analyze:
+{source_content}
+"""
 
-A CONTENT GAP is something users want to know that existing content doesn't adequately address.
+# ============================================================================
+# SHARED PROMPT FRAGMENTS
+# ============================================================================
+# The content gap / scoring prompts below are composed from these at import,
+# so every prompt carries the same legend and example text.
 
-For each recommendation, provide:
-1. topic: A specific, actionable article title (NOT generic like "Deep dive into X")
-2. gap_reasoning: What question do users have that competitors don't answer?
-3. target_audience: Who specifically would benefit from this content?
-4. format_rationale: Why this format is best (Tutorial, Comparison, Case Study, Checklist, Guide)
-5. why_now: What signals indicate this content is needed now?
+_JSON_OUTPUT_RULES = "Output ONLY valid JSON in this exact format:\n"
 
-GOOD RECOMMENDATION EXAMPLES:
-- topic: "Step-by-step CRM data migration checklist: What to prepare before switching"
-  gap_reasoning: "Sources discuss migration difficulty but none provide actionable preparation steps"
+_FORMAT_CHOICES = "Tutorial|Comparison|Case Study|Checklist|Guide"
 
-- topic: "HubSpot vs Salesforce for real estate teams under 10 agents: A cost analysis"
-  gap_reasoning: "Comparisons exist but none focus on small real estate team economics"
+_GAP_EXAMPLES = """\
+GOOD: "Step-by-step CRM data migration checklist: What to prepare before switching" (gap: sources discuss migration difficulty but none give preparation steps)
+BAD: "Deep dive into CRM", "CRM best practices" (generic, no gap)
+"""
 
-BAD RECOMMENDATION EXAMPLES (DO NOT OUTPUT):
-- "Deep dive into CRM" (too generic)
-- "Everything about lead management" (not specific)
-- "CRM best practices" (doesn't address a gap)
+_SCORE_LEGEND = """\
+Scoring dimensions (1-10):
+- demand_signal: 10 = several sources name it as a pain point or frequent question; 5 = some discussion; 1 = no evidence of demand
+- competitive_gap: 10 = no competitor covers it; 5 = covered with gaps; 1 = well covered
+- actionability: 10 = clear format and scope, executable now; 5 = needs some research; 1 = needs deep expertise
+opportunity_score = demand_signal * 0.4 + competitive_gap * 0.4 + actionability * 0.2
+"""
 
-Output ONLY valid JSON in this exact format:
-{{
-  "recommendations": [
+# One entry of a "recommendations" array (braces escaped for str.format)
+_SCORED_RECOMMENDATION_EXAMPLE = """\
     {{
       "topic": "Specific, actionable article title",
-      "gap_reasoning": "What's missing from existing content that users need",
+      "gap_reasoning": "Question users have that competitors don't answer",
       "target_audience": "Specific audience segment",
-      "recommended_format": "Tutorial|Comparison|Case Study|Checklist|Guide",
+      "recommended_format": \"""" + _FORMAT_CHOICES + """\",
       "format_rationale": "Why this format serves the audience best",
-      "why_now": "What signals indicate this content is timely"
+      "why_now": "Signals that this content is needed now",
+      "opportunity_score": 7.8,
+      "score_reasoning": {{
+        "demand_signal": 8,
+        "demand_evidence": "3 sources mention lead scoring as top pain point",
+        "competitive_gap": 7,
+        "gap_evidence": "Competitors discuss leads but not scoring mechanics",
+        "actionability": 9,
+        "actionability_reasoning": "Tutorial format, clear step-by-step structure possible"
+      }}
     }}
-  ]
-}}
-
-Generate exactly 5 recommendations, one per theme.
 """
 
 # ============================================================================
-# OPPORTUNITY SCORING PROMPT (Phase 4 Fix)
+# CONTENT GAP ANALYSIS PROMPT (Phase 3 Fix)
 # ============================================================================
+# Deprecated: only used when ENABLE_COMBINED_CONTENT_SCORING is off. The
+# combined CONTENT_GAP_WITH_SCORING_PROMPT (see build_gap_scoring_prompt)
+# does gap analysis and scoring in one call and sends the evidence once.
 
-OPPORTUNITY_SCORING_PROMPT = """
-You are evaluating content opportunities based on market evidence.
+CONTENT_GAP_ANALYSIS_PROMPT = "".join([
+    """
+You are a content strategist analyzing market research to identify specific content opportunities.
 
-For each content recommendation, provide an evidence-based opportunity score.
+Your task: For each theme in the data section below, identify a SPECIFIC content gap (something users want to know that existing content doesn't adequately address) and generate an actionable recommendation.
 
-Recommendations to score:
-{recommendations}
+Fields:
+- topic: specific, actionable article title
+- gap_reasoning: the question users have that competitors don't answer
+- target_audience: who specifically benefits
+- recommended_format: """, _FORMAT_CHOICES, """
+- format_rationale: why this format serves the audience best
+- why_now: signals that this content is needed now
 
-Source evidence context:
-{source_evidence}
+""",
+    _GAP_EXAMPLES,
+    """
+Return the recommendations in the response schema. Generate exactly 5 recommendations, one per theme.
+---DATA---
+Query context: {query}
+
+Themes identified (with source evidence):
+{themes_with_evidence}
 
 Competitors in market:
 {competitors}
+""",
+])
 
-For each recommendation, evaluate these dimensions (1-10 scale):
+# ============================================================================
+# OPPORTUNITY SCORING PROMPT (Phase 4 Fix)
+# ============================================================================
+# Deprecated: second round-trip of the legacy gap -> score path; superseded
+# by CONTENT_GAP_WITH_SCORING_PROMPT.
 
-1. **demand_signal** (1-10): How strongly do sources indicate user interest?
-   - 8-10: Multiple sources explicitly mention this as a pain point or frequent question
-   - 5-7: Some sources discuss this topic with engagement signals
-   - 1-4: Weak or no evidence of user demand
+OPPORTUNITY_SCORING_PROMPT = "".join([
+    """
+You are evaluating content opportunities based on market evidence.
 
-2. **competitive_gap** (1-10): How underserved is this topic?
-   - 8-10: No competitors adequately address this; clear whitespace
-   - 5-7: Competitors touch on this but leave gaps
-   - 1-4: Well-covered by multiple competitors
+For each content recommendation in the data section below, provide an evidence-based opportunity score.
 
-3. **actionability** (1-10): How easily can this content be created?
-   - 8-10: Clear format, well-defined scope, executable immediately
-   - 5-7: Moderate complexity, may need some research
-   - 1-4: Requires deep expertise or extensive research
+""",
+    _SCORE_LEGEND,
+    """
+Cite the evidence for each dimension in demand_evidence, gap_evidence and actionability_reasoning, and return one scored_recommendations entry per topic in the response schema.
 
-Calculate opportunity_score as weighted average:
-opportunity_score = (demand_signal * 0.4) + (competitive_gap * 0.4) + (actionability * 0.2)
+Score all provided recommendations.
+---DATA---
+Recommendations to score:
+{recommendations}
 
-Output ONLY valid JSON:
-{{
-  "scored_recommendations": [
-    {{
-      "topic": "Original topic title",
-      "opportunity_score": 7.8,
-      "score_reasoning": {{
-        "demand_signal": 8,
-        "demand_evidence": "3 sources mention lead scoring as top pain point",
-        "competitive_gap": 7,
-        "gap_evidence": "Competitors discuss leads but not scoring mechanics",
-        "actionability": 9,
-        "actionability_reasoning": "Tutorial format, clear step-by-step structure possible"
-      }}
-    }}
-  ]
-}}
+Source evidence context:
+{source_evidence}
 
-Score all provided recommendations.
-"""
+Competitors in market:
+{competitors}
+""",
+])
 
 # ============================================================================
 # COMBINED CONTENT GAP + SCORING PROMPT (Performance Optimization)
 # ============================================================================
 
-CONTENT_GAP_WITH_SCORING_PROMPT = """
+CONTENT_GAP_WITH_SCORING_PROMPT = "".join([
+    """
 You are a content strategist analyzing market research to identify AND score content opportunities.
 
+Your task: For each theme in the data section below, identify a SPECIFIC content gap (something users want to know that existing content doesn't adequately address), generate an actionable recommendation, AND provide an evidence-based opportunity score.
+
+""",
+    _GAP_EXAMPLES,
+    "\n",
+    _SCORE_LEGEND,
+    "\n",
+    _JSON_OUTPUT_RULES,
+    """{{
+  "recommendations": [
+""",
+    _SCORED_RECOMMENDATION_EXAMPLE,
+    """  ]
+}}
+
+Generate exactly 5 recommendations, one per theme.
+---DATA---
 Query context: {query}
 
 Themes identified (with source evidence):
@@ -488,79 +513,64 @@ Source evidence context:
 
 Competitors in market:
 {competitors}
+""",
+])
 
-Your task: For each theme, identify a SPECIFIC content gap, generate an actionable recommendation, AND provide an evidence-based opportunity score.
-
-A CONTENT GAP is something users want to know that existing content doesn't adequately address.
-
-For each recommendation, provide:
-1. topic: A specific, actionable article title (NOT generic like "Deep dive into X")
-2. gap_reasoning: What question do users have that competitors don't answer?
-3. target_audience: Who specifically would benefit from this content?
-4. recommended_format: Tutorial|Comparison|Case Study|Checklist|Guide
-5. format_rationale: Why this format serves the audience best
-6. why_now: What signals indicate this content is needed now?
-7. opportunity_score: Weighted average of demand_signal (40%), competitive_gap (40%), actionability (20%)
-8. score_reasoning: Evidence for each dimension
-
-GOOD RECOMMENDATION EXAMPLES:
-- topic: "Step-by-step CRM data migration checklist: What to prepare before switching"
-  gap_reasoning: "Sources discuss migration difficulty but none provide actionable preparation steps"
-  opportunity_score: 8.4 (high demand, clear gap, easy to create)
+# ============================================================================
+# FUSED STRATEGY PROMPT (Performance Optimization)
+# ============================================================================
 
-- topic: "HubSpot vs Salesforce for real estate teams under 10 agents: A cost analysis"
-  gap_reasoning: "Comparisons exist but none focus on small real estate team economics"
-  opportunity_score: 7.6 (moderate demand, good gap, moderate complexity)
+FUSED_STRATEGY_PROMPT = "".join([
+    """
+You are a market strategist. Using the research in the data section below, complete TWO tasks in a single response.
 
-BAD RECOMMENDATION EXAMPLES (DO NOT OUTPUT):
-- "Deep dive into CRM" (too generic)
-- "Everything about lead management" (not specific)
-- "CRM best practices" (doesn't address a gap)
+## Task 1: Positioning map
 
-Scoring dimensions (1-10 scale):
+Assign X,Y coordinates for each competitor on a 1-10 scale:
+- **X-axis**: Price Positioning (1=budget, 10=premium)
+- **Y-axis**: Target Company Size (1=freelancer/SMB, 10=enterprise)
 
-1. **demand_signal** (1-10): How strongly do sources indicate user interest?
-   - 8-10: Multiple sources explicitly mention this as a pain point or frequent question
-   - 5-7: Some sources discuss this topic with engagement signals
-   - 1-4: Weak or no evidence of user demand
+Use pricing indicators ("affordable", free tiers → lower X; "enterprise", "contact sales" → higher X),
+target market indicators (freelancers → lower Y; teams → mid Y; enterprises, integrations, scalability → higher Y)
+and feature complexity (simple tools → lower scores; advanced customization → higher scores).
+Ensure all coordinates are between 1.0 and 10.0.
 
-2. **competitive_gap** (1-10): How underserved is this topic?
-   - 8-10: No competitors adequately address this; clear whitespace
-   - 5-7: Competitors touch on this but leave gaps
-   - 1-4: Well-covered by multiple competitors
+## Task 2: Scored content recommendations
+
+For each theme, identify a SPECIFIC content gap (something users want to know that existing content
+doesn't adequately address) and generate an actionable, evidence-based recommendation.
+
+""",
+    _GAP_EXAMPLES,
+    "\n",
+    _SCORE_LEGEND,
+    "\n",
+    _JSON_OUTPUT_RULES,
+    """{{
+  "positioning_map": {{
+    "Company A": {{"x": 7.5, "y": 8.0, "rationale": "Enterprise focus, premium pricing"}},
+    "Company B": {{"x": 3.0, "y": 4.5, "rationale": "SMB focus, affordable pricing"}}
+  }},
+  "recommendations": [
+""",
+    _SCORED_RECOMMENDATION_EXAMPLE,
+    """  ]
+}}
 
-3. **actionability** (1-10): How easily can this content be created?
-   - 8-10: Clear format, well-defined scope, executable immediately
-   - 5-7: Moderate complexity, may need some research
-   - 1-4: Requires deep expertise or extensive research
+Position every competitor and generate exactly 5 recommendations, one per theme.
+---DATA---
+Query context: {query}
 
-Calculate: opportunity_score = (demand_signal * 0.4) + (competitive_gap * 0.4) + (actionability * 0.2)
+Competitor data:
+{competitor_data}
 
-Output ONLY valid JSON in this exact format:
-{{
-  "recommendations": [
-    {{
-      "topic": "Specific, actionable article title",
-      "gap_reasoning": "What's missing from existing content that users need",
-      "target_audience": "Specific audience segment",
-      "recommended_format": "Tutorial|Comparison|Case Study|Checklist|Guide",
-      "format_rationale": "Why this format serves the audience best",
-      "why_now": "What signals indicate this content is timely",
-      "opportunity_score": 7.8,
-      "score_reasoning": {{
-        "demand_signal": 8,
-        "demand_evidence": "3 sources mention lead scoring as top pain point",
-        "competitive_gap": 7,
-        "gap_evidence": "Competitors discuss leads but not scoring mechanics",
-        "actionability": 9,
-        "actionability_reasoning": "Tutorial format, clear step-by-step structure possible"
-      }}
-    }}
-  ]
-}}
+Themes identified (with source evidence):
+{themes_with_evidence}
 
-Generate exactly 5 recommendations, one per theme.
-"""
+Source evidence context:
+{source_evidence}
+""",
+])
 
 # ============================================================================
 # CONTEXTUAL SENTIMENT PROMPT (Phase 5 Fix)
@@ -569,12 +579,7 @@ Generate exactly 5 recommendations, one per theme.
 CONTEXTUAL_SENTIMENT_PROMPT = """
 You are analyzing sentiment in market research sources to provide contextual attribution.
 
-Theme to analyze: {theme}
-
-Source quotes mentioning this theme:
-{quotes}
-
-Your task: Analyze sentiment WITH context. Don't just say "positive" or "negative" - explain WHAT the sentiment is about and WHY.
+Your task: Analyze sentiment WITH context for the theme and source quotes in the data section below. Don't just say "positive" or "negative" - explain WHAT the sentiment is about and WHY.
 
 For each theme, provide:
 1. sentiment_summary: A readable sentence describing the overall sentiment (e.g., "Users praise the ease of use but criticize the pricing")
@@ -610,24 +615,198 @@ Output ONLY valid JSON:
 }}
 
 Provide 2-4 sentiment signals based on the source quotes.
+
+---DATA---
+Theme to analyze: {theme}
+
+Source quotes mentioning this theme:
+{quotes}
+"""
+
+# Batched variant: one request covers every theme of a run
+CONTEXTUAL_SENTIMENT_BATCH_PROMPT = """
+You are analyzing sentiment in market research sources to provide contextual attribution.
+
+Your task: Analyze sentiment WITH context for EACH theme in the data section below, using only that theme's source quotes. Don't just say "positive" or "negative" - explain WHAT the sentiment is about and WHY.
+
+For each theme, provide:
+1. sentiment_summary: A readable sentence describing the overall sentiment (e.g., "Users praise the ease of use but criticize the pricing")
+2. sentiment_signals: List of specific sentiment observations with:
+   - subject: What specifically is the sentiment about?
+   - polarity: "positive", "negative", or "mixed"
+   - reason: Why do users feel this way? (quote or paraphrase from sources)
+
+GOOD SENTIMENT EXAMPLES:
+- subject: "HubSpot onboarding process"
+  polarity: "positive"
+  reason: "described as 'quick and intuitive' by multiple users"
+
+- subject: "Salesforce pricing"
+  polarity: "negative"
+  reason: "users mention it's 'expensive for small teams'"
+
+BAD SENTIMENT EXAMPLES (DO NOT OUTPUT):
+- subject: "CRM" (too vague)
+  polarity: "positive"
+  reason: "sources are positive" (no specific reason)
+
+Output ONLY valid JSON, with one entry per input theme and its theme_idx copied from the input:
+{{
+  "themes": [
+    {{
+      "theme_idx": 0,
+      "sentiment_summary": "Users appreciate X but express concerns about Y",
+      "sentiment_signals": [
+        {{
+          "subject": "Specific feature or aspect",
+          "polarity": "positive|negative|mixed",
+          "reason": "Specific reason from sources"
+        }}
+      ]
+    }}
+  ]
+}}
+
+Provide 2-4 sentiment signals per theme based on its source quotes.
+
+---DATA---
+Themes with their source quotes (JSON):
+{themes_with_quotes}
 """
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+class CompiledPrompt:
+    """
+    Prompt template compiled to a generated function
+
+    The template is parsed into literal segments and named fields, then
+    turned into a generated function whose body is a single f-string, so
+    format() runs as one BUILD_STRING instead of re-parsing the whole
+    template on every call the way str.format does. Supports plain {name}
+    fields and {{ }} escapes. Placeholders are validated at construction;
+    the function is generated on first format(), so importing this module
+    doesn't pay for templates a process never uses.
+    """
+
+    __slots__ = ("template", "fields", "_pieces", "_namespace", "_render")
+
+    def __init__(self, template: str):
+        self.template = template
+
+        namespace = {}
+        pieces = []
+        fields = []
+        for i, (literal, field, spec, conversion) in enumerate(string.Formatter().parse(template)):
+            if field is not None and (spec or conversion or not field.isidentifier() or keyword.iskeyword(field)):
+                raise ValueError(f"Unsupported placeholder in prompt: {{{field}}}")
+            if literal:
+                # Literals are bound by name, so no quoting or brace escaping is needed
+                namespace[f"__lit{i}"] = literal
+                pieces.append(f"{{__lit{i}}}")
+            if field is not None:
+                pieces.append(f"{{{field}}}")
+                if field not in fields:
+                    fields.append(field)
+
+        self.fields = tuple(fields)
+        self._pieces = pieces
+        self._namespace = namespace
+        self._render = None
+
+    def _compile(self):
+        """Generate the render function (idempotent, so a racing first call is harmless)"""
+        params = "".join(f"{field}, " for field in self.fields)
+        if params:
+            params = "*, " + params
+        source = f"def render({params}**_unused):\n    return f'{''.join(self._pieces)}'\n"
+        namespace = dict(self._namespace)
+        exec(source, namespace)
+        self._render = namespace["render"]
+        return self._render
+
+    def format(self, **kwargs) -> str:
+        """Fill the template; extra keys are ignored and a missing field raises TypeError"""
+        render = self._render
+        if render is None:
+            render = self._compile()
+        return render(**kwargs)
+
+
+# Templates formatted on every agent call
+THEME_EXTRACTION_TEMPLATE = CompiledPrompt(THEME_EXTRACTION_PROMPT)
+CONTEXTUAL_SENTIMENT_TEMPLATE = CompiledPrompt(CONTEXTUAL_SENTIMENT_PROMPT)
+CONTEXTUAL_SENTIMENT_BATCH_TEMPLATE = CompiledPrompt(CONTEXTUAL_SENTIMENT_BATCH_PROMPT)
+CONTENT_GAP_ANALYSIS_TEMPLATE = CompiledPrompt(CONTENT_GAP_ANALYSIS_PROMPT)
+OPPORTUNITY_SCORING_TEMPLATE = CompiledPrompt(OPPORTUNITY_SCORING_PROMPT)
+CONTENT_GAP_WITH_SCORING_TEMPLATE = CompiledPrompt(CONTENT_GAP_WITH_SCORING_PROMPT)
+FUSED_STRATEGY_TEMPLATE = CompiledPrompt(FUSED_STRATEGY_PROMPT)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_prompt(template: str) -> CompiledPrompt:
+    """Parse a template string once; later calls with the same string reuse it"""
+    return CompiledPrompt(template)
+
+
+def build_gap_scoring_prompt(
+    query: str,
+    themes_with_evidence: str,
+    source_evidence: str,
+    competitors: str,
+) -> str:
+    """
+    Format the combined content gap + opportunity scoring prompt
+
+    Args:
+        query: Original search query
+        themes_with_evidence: Serialized themes with their evidence
+        source_evidence: Serialized source evidence
+        competitors: Comma-separated competitor names
+
+    Returns:
+        Formatted prompt string
+    """
+    return CONTENT_GAP_WITH_SCORING_TEMPLATE.format(
+        query=query,
+        themes_with_evidence=themes_with_evidence,
+        source_evidence=source_evidence,
+        competitors=competitors,
+    )
+
+
 def format_prompt(template: str, **kwargs) -> str:
     """
     Format a prompt template with provided arguments
     
     Args:
-        template: Prompt template string
+        template: Prompt template string (or CompiledPrompt)
         **kwargs: Values to insert into template
         
     Returns:
         Formatted prompt string
     """
-    return template.format(**kwargs)
+    if isinstance(template, CompiledPrompt):
+        return template.format(**kwargs)
+    return _compile_prompt(template).format(**kwargs)
+
+
+def split_prompt(prompt: str) -> tuple:
+    """
+    Split a formatted prompt into its static instructions and per-call data
+
+    Args:
+        prompt: Formatted prompt containing PROMPT_DATA_DELIMITER
+
+    Returns:
+        Tuple of (instructions, data); instructions is empty if there is no delimiter
+    """
+    instructions, sep, data = prompt.partition(PROMPT_DATA_DELIMITER)
+    if not sep:
+        return "", prompt.strip()
+    return instructions.strip(), data.strip()
 
 
 # Export all prompts
@@ -641,9 +820,22 @@ __all__ = [
     'VALIDATION_PROMPT',
     'SOURCE_ATTRIBUTION_PROMPT',
     'THEME_EXTRACTION_PROMPT',
-    'CONTENT_GAP_ANALYSIS_PROMPT',
-    'OPPORTUNITY_SCORING_PROMPT',
     'CONTENT_GAP_WITH_SCORING_PROMPT',
+    'CONTENT_GAP_ANALYSIS_PROMPT',  # deprecated
+    'OPPORTUNITY_SCORING_PROMPT',  # deprecated
+    'FUSED_STRATEGY_PROMPT',
     'CONTEXTUAL_SENTIMENT_PROMPT',
-    'format_prompt'
+    'CONTEXTUAL_SENTIMENT_BATCH_PROMPT',
+    'PROMPT_DATA_DELIMITER',
+    'CompiledPrompt',
+    'THEME_EXTRACTION_TEMPLATE',
+    'CONTEXTUAL_SENTIMENT_TEMPLATE',
+    'CONTEXTUAL_SENTIMENT_BATCH_TEMPLATE',
+    'CONTENT_GAP_ANALYSIS_TEMPLATE',
+    'OPPORTUNITY_SCORING_TEMPLATE',
+    'CONTENT_GAP_WITH_SCORING_TEMPLATE',
+    'FUSED_STRATEGY_TEMPLATE',
+    'build_gap_scoring_prompt',
+    'format_prompt',
+    'split_prompt'
 ]
\ No newline at end of file
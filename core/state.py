@@ -1,5 +1,7 @@
-from typing import Dict, List, Optional, TypedDict
+from typing import Annotated, Dict, List, Optional, TypedDict
 from datetime import datetime
+import operator
+import time
 
 
 class AgentError(TypedDict):
@@ -11,7 +13,12 @@ class AgentError(TypedDict):
 
 
 class AgentState(TypedDict):
-    """Shared state passed between agents in the workflow"""
+    """
+    Shared state passed between agents in the workflow
+
+    Nodes return only the keys they change; errors and api_calls are
+    accumulated by their reducers.
+    """
 
     # User Input
     query: str
@@ -24,14 +31,27 @@ class AgentState(TypedDict):
     quality_report: Optional[Dict]
 
     # Metadata
-    errors: List[AgentError]
+    errors: Annotated[List[AgentError], operator.add]
     retry_count: int
     start_time: datetime
+    start_perf: float  # time.perf_counter() at start, for processing time
     current_agent: str
 
     # Cost Tracking
     total_tokens: int
-    api_calls: int
+    api_calls: Annotated[int, operator.add]
 
     # Observability
-    trace_id: Optional[str]
\ No newline at end of file
+    trace_id: Optional[str]
+
+
+def elapsed_seconds(state: Dict) -> float:
+    """
+    Seconds since the pipeline run started
+
+    Uses the monotonic start_perf; states built outside the orchestrator
+    may only carry the start_time datetime.
+    """
+    if "start_perf" in state:
+        return time.perf_counter() - state["start_perf"]
+    return (datetime.now() - state.get("start_time", datetime.now())).total_seconds()
\ No newline at end of file
@@ -1,5 +1,5 @@
 import api from './api'
-import type { QueryHistoryItem, AnalysisResult } from '@/types'
+import type { QueryHistoryItem, QueryHistoryPage, AnalysisResult } from '@/types'
 
 /**
  * History API service
@@ -9,8 +9,16 @@ export const historyService = {
    * Get recent query history
    */
   async getRecent(limit: number = 5): Promise<QueryHistoryItem[]> {
-    const response = await api.get<QueryHistoryItem[]>('/history/recent', {
-      params: { limit },
+    const page = await historyService.getPage(limit)
+    return page.items
+  },
+
+  /**
+   * Get a page of query history, older than `beforeId` when given
+   */
+  async getPage(limit: number = 5, beforeId?: number): Promise<QueryHistoryPage> {
+    const response = await api.get<QueryHistoryPage>('/history/recent', {
+      params: { limit, before_id: beforeId },
     })
     return response.data
   },
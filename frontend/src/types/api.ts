@@ -22,6 +22,11 @@ export interface QueryHistoryItem {
   num_competitors: number | null
 }
 
+export interface QueryHistoryPage {
+  items: QueryHistoryItem[]
+  next_cursor: number | null
+}
+
 export interface CacheTypeStats {
   type: string
   count: number
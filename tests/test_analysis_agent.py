@@ -171,6 +171,39 @@ class TestAnalysisAgentMethods:
             assert isinstance(comp, str)
             assert len(comp) > 3  # Minimum length filter
 
+    def test_batched_sentiment_fallback_runs_in_parallel(self, agent, monkeypatch):
+        """Test themes missing from a failed batched call go through the parallel path"""
+        from core.config import config
+
+        if not config.ENABLE_PARALLEL_SENTIMENT:
+            pytest.skip("ENABLE_PARALLEL_SENTIMENT is turned off in this environment")
+
+        class _FailingLLM:
+            def invoke(self, messages):
+                raise ValueError("truncated JSON")
+
+        sources = [{"title": "Review site", "content": "..."}]
+        themes = [
+            {"theme": f"Theme {i}", "source_evidence": [{"quote": f"quote {i}", "source_idx": 0}]}
+            for i in range(3)
+        ]
+        calls = []
+
+        def fake_parallel(missing, sources, trace_id=None):
+            calls.append([theme["theme"] for theme in missing])
+            for theme in missing:
+                theme["sentiment_summary"] = "parallel"
+                theme["sentiment_signals"] = []
+            return missing
+
+        monkeypatch.setattr(agent, "llm", _FailingLLM())
+        monkeypatch.setattr(agent, "_add_contextual_sentiment_parallel", fake_parallel)
+
+        result = agent._add_contextual_sentiment_batched(themes, sources)
+
+        assert calls == [["Theme 0", "Theme 1", "Theme 2"]]
+        assert [theme["sentiment_summary"] for theme in result] == ["parallel"] * 3
+
 
 class TestSampleData:
     """Validate sample data structure"""
@@ -0,0 +1,131 @@
+"""
+Tests for coalescing concurrent identical POST /api/analyze requests
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from api.dependencies import get_history, get_orchestrator
+from api.routers import analyze as analyze_module
+from utils.query_history import QueryHistory
+
+QUERY = "project management tools for startups"
+
+
+def _report(query):
+    return {
+        "report_metadata": {
+            "query": query,
+            "timestamp": "2026-01-01T00:00:00",
+            "total_sources": 3,
+            "processing_time_seconds": 1,
+            "confidence_score": 0.7,
+        },
+        "validated_insights": {"competitors": ["Acme"]},
+        "quality_flags": [],
+    }
+
+
+class _StubOrchestrator:
+    """Orchestrator whose run blocks until released, counting pipeline runs"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def arun(self, query, parameters=None):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return _report(query)
+
+
+class _CountingInflight(dict):
+    """In-flight table that counts requests joining an existing run"""
+
+    joined = 0
+
+    def get(self, key, default=None):
+        if key in self:
+            self.joined += 1
+        return super().get(key, default)
+
+
+@pytest.fixture
+def history(tmp_path):
+    """QueryHistory on a throwaway database"""
+    return QueryHistory(db_path=str(tmp_path / "history.db"))
+
+
+@pytest.fixture
+def inflight(monkeypatch):
+    """Fresh in-flight table for the analyze router"""
+    table = _CountingInflight()
+    monkeypatch.setattr(analyze_module, "_inflight", table)
+    return table
+
+
+async def _post_concurrently(orchestrator, history, inflight, count):
+    """Send `count` identical requests and release the pipeline once all but one have joined"""
+    app = FastAPI()
+    app.include_router(analyze_module.router)
+    app.dependency_overrides[get_orchestrator] = lambda: orchestrator
+    app.dependency_overrides[get_history] = lambda: history
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        requests = [
+            asyncio.create_task(client.post("/api/analyze", json={"query": QUERY}))
+            for _ in range(count)
+        ]
+        deadline = time.monotonic() + 5
+        while inflight.joined < count - 1 and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        orchestrator.release.set()
+        return await asyncio.gather(*requests)
+
+
+class TestAnalyzeCoalescing:
+    """Test suite for sharing one pipeline run across identical requests"""
+
+    def test_identical_requests_run_pipeline_once(self, history, inflight):
+        """Test concurrent identical requests share one run and one history row"""
+        orchestrator = _StubOrchestrator()
+
+        responses = asyncio.run(_post_concurrently(orchestrator, history, inflight, count=4))
+
+        assert orchestrator.calls == 1
+        assert inflight.joined == 3
+        assert [response.status_code for response in responses] == [200] * 4
+        bodies = [response.json() for response in responses]
+        assert all(body == bodies[0] for body in bodies)
+        assert bodies[0]["query_text"] == QUERY
+
+        history.flush()
+        assert len(history.get_recent_queries(limit=10)) == 1
+        assert analyze_module._inflight == {}
+
+    def test_leader_failure_reaches_every_waiter(self, history, inflight):
+        """Test a failed run returns the error to the leader and every follower"""
+        orchestrator = _StubOrchestrator(error=RuntimeError("pipeline exploded"))
+
+        responses = asyncio.run(_post_concurrently(orchestrator, history, inflight, count=3))
+
+        assert orchestrator.calls == 1
+        assert [response.status_code for response in responses] == [500] * 3
+        assert all(
+            response.json()["detail"] == "Analysis failed: pipeline exploded"
+            for response in responses
+        )
+
+        history.flush()
+        assert history.get_recent_queries(limit=10) == []
+        assert analyze_module._inflight == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
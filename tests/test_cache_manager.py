@@ -0,0 +1,110 @@
+"""
+Tests for CacheManager statistics and the LangChain LLM cache table it manages
+"""
+import sqlite3
+
+import pytest
+from utils.cache_manager import CacheManager
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """CacheManager on a throwaway database"""
+    return CacheManager(db_path=str(tmp_path / "cache.db"), auto_cleanup=False)
+
+
+def _add_llm_rows(cache, count):
+    """Create LangChain's SQLiteCache table in the same database and fill it"""
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {CacheManager.LLM_CACHE_TABLE} "
+            "(prompt VARCHAR, llm VARCHAR, idx INTEGER, response VARCHAR, PRIMARY KEY (prompt, llm, idx))"
+        )
+        start = conn.execute(f"SELECT COUNT(*) FROM {CacheManager.LLM_CACHE_TABLE}").fetchone()[0]
+        conn.executemany(
+            f"INSERT INTO {CacheManager.LLM_CACHE_TABLE} VALUES (?, ?, 0, ?)",
+            [(f"prompt {i}", "gpt", "x" * 10) for i in range(start, start + count)],
+        )
+
+
+def _llm_prompts(cache):
+    with sqlite3.connect(cache.db_path) as conn:
+        return [row[0] for row in conn.execute(
+            f"SELECT prompt FROM {CacheManager.LLM_CACHE_TABLE} ORDER BY rowid"
+        )]
+
+
+class TestCacheStats:
+    """Test suite for CacheManager.get_stats"""
+
+    def test_by_type_includes_llm_responses(self, cache):
+        """Test cache entries and LLM responses are both reported per type"""
+        cache.set("web key", {"results": [1]}, CacheManager.CACHE_TYPE_WEB)
+        _add_llm_rows(cache, 3)
+
+        stats = cache.get_stats()
+
+        assert {"type": CacheManager.CACHE_TYPE_WEB, "count": 1, "hits": 0} in stats["by_type"]
+        assert {"type": CacheManager.CACHE_TYPE_LLM, "count": 3, "hits": 0} in stats["by_type"]
+        assert stats["total_entries_all"] == 4
+
+    def test_stats_route_returns_validated_dict(self, cache):
+        """Test /api/cache/stats serves get_stats through CacheStatsResponse"""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from api.dependencies import get_orchestrator
+        from api.routers.cache import router
+
+        class _Orchestrator:
+            def get_cache_stats(self):
+                return cache.get_stats()
+
+        cache.set("web key", {"results": [1]}, CacheManager.CACHE_TYPE_WEB)
+        _add_llm_rows(cache, 2)
+
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_orchestrator] = lambda: _Orchestrator()
+
+        body = TestClient(app).get("/api/cache/stats").json()
+
+        assert body["total_entries_all"] == 3
+        assert {"type": CacheManager.CACHE_TYPE_LLM, "count": 2, "hits": 0} in body["by_type"]
+
+
+class TestLLMCacheManagement:
+    """Test suite for clearing and bounding the LLM response cache"""
+
+    def test_clear_all_empties_llm_cache(self, cache):
+        """Test clear_all removes cache entries and cached LLM responses"""
+        cache.set("web key", {"results": [1]}, CacheManager.CACHE_TYPE_WEB)
+        _add_llm_rows(cache, 3)
+
+        assert cache.clear_all() == 4
+        assert _llm_prompts(cache) == []
+
+    def test_delete_by_type_llm(self, cache):
+        """Test the llm_responses type clears only the LLM cache"""
+        cache.set("web key", {"results": [1]}, CacheManager.CACHE_TYPE_WEB)
+        _add_llm_rows(cache, 2)
+
+        assert cache.delete_by_type(CacheManager.CACHE_TYPE_LLM) == 2
+        assert cache.get("web key", CacheManager.CACHE_TYPE_WEB) == {"results": [1]}
+
+    def test_cleanup_keeps_newest_llm_rows(self, cache, monkeypatch):
+        """Test cleanup trims the LLM cache to its newest LLM_CACHE_MAX_ENTRIES rows"""
+        monkeypatch.setattr(CacheManager, "LLM_CACHE_MAX_ENTRIES", 3)
+        _add_llm_rows(cache, 5)
+
+        assert cache.cleanup_expired() == 2
+        assert _llm_prompts(cache) == ["prompt 2", "prompt 3", "prompt 4"]
+
+    def test_no_llm_table(self, cache):
+        """Test a database without the LLM cache table is handled"""
+        assert cache.clear_all() == 0
+        assert cache.cleanup_expired() == 0
+        assert cache.delete_by_type(CacheManager.CACHE_TYPE_LLM) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""
+Tests for the background LLM-call logging in core.observability
+"""
+import queue
+import threading
+import time
+
+import pytest
+from core import observability
+
+
+class _FakeGeneration:
+    def end(self):
+        pass
+
+
+class _FakeTrace:
+    """Stand-in for a Langfuse trace that records generation calls"""
+
+    id = "trace-1"
+
+    def __init__(self):
+        self.generations = []
+
+    def generation(self, **kwargs):
+        self.generations.append(kwargs)
+        return _FakeGeneration()
+
+
+def _event(trace, model="gpt-4.1-mini-2025-04-14"):
+    return (trace, "test-call", model, "input", "output", 10, 5, None, None, None)
+
+
+class TestLogWorker:
+    """Test suite for the generation-logging worker"""
+
+    def test_worker_survives_bad_event(self):
+        """Test a malformed event is dropped without killing the worker"""
+        trace = _FakeTrace()
+
+        observability._enqueue_log_event(_event(trace, model=None))
+        observability._enqueue_log_event((trace, "wrong-arity"))
+        observability._enqueue_log_event(_event(trace))
+
+        assert observability._wait_for_log_queue(timeout=5)
+        assert observability._log_worker.is_alive()
+
+        # The good event after the bad ones is still recorded
+        assert len(trace.generations) == 1
+        assert trace.generations[0]["model"] == "gpt-4.1-mini"
+
+    def test_dead_worker_is_restarted(self, monkeypatch):
+        """Test a worker thread that exited is replaced on the next event"""
+
+        class _DeadThread:
+            def is_alive(self):
+                return False
+
+        monkeypatch.setattr(observability, "_log_worker", _DeadThread())
+        trace = _FakeTrace()
+        observability._enqueue_log_event(_event(trace))
+
+        assert isinstance(observability._log_worker, threading.Thread)
+        assert observability._log_worker.is_alive()
+        assert observability._wait_for_log_queue(timeout=5)
+        assert len(trace.generations) == 1
+
+    def test_flush_wait_is_bounded(self, monkeypatch):
+        """Test waiting on a queue nobody drains times out instead of blocking"""
+        stuck_queue = queue.Queue()
+        stuck_queue.put_nowait(_event(_FakeTrace()))
+        monkeypatch.setattr(observability, "_log_queue", stuck_queue)
+        monkeypatch.setattr(observability, "_ensure_log_worker", lambda: None)
+        monkeypatch.setattr(observability, "_log_worker", object())
+
+        started = time.monotonic()
+        assert observability._wait_for_log_queue(timeout=0.2) is False
+        assert time.monotonic() - started < 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
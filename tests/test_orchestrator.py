@@ -0,0 +1,370 @@
+"""
+Tests for AgentOrchestrator's pipeline execution paths
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from core import orchestrator as orchestrator_module
+from core.orchestrator import AgentOrchestrator
+from utils.cache_manager import CacheManager
+
+
+class _StubResearchAgent:
+    def run(self, query, trace_id=None):
+        return {"query": query, "sources": [{"url": "https://example.com"}]}
+
+
+class _StubAnalysisAgent:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    @staticmethod
+    def input_key(research_data):
+        return str(sorted((research_data or {}).get("sources", []), key=str))
+
+    def run(self, research_data, trace_id=None, cache_key=None):
+        if self.fail:
+            raise RuntimeError("analysis exploded")
+        return {"competitors": [{"name": "Acme"}], "content_themes": [{"theme": "pricing"}]}
+
+
+class _StubStrategyAgent:
+    def run(self, analysis_insights, trace_id=None, query=""):
+        return {"opportunity_zones": [], "content_recommendations": [{"title": query}]}
+
+    async def arun(self, analysis_insights, trace_id=None, query=""):
+        return self.run(analysis_insights, trace_id=trace_id, query=query)
+
+
+class _StubQualityAgent:
+    def run(self, state, trace_id=None):
+        return {
+            "report_metadata": {"query": state["query"], "confidence_score": 0.5},
+            "seen_errors": [error["agent"] for error in state["errors"]],
+            "seen_api_calls": state["api_calls"],
+        }
+
+
+def _stub_agents(fail_analysis=False):
+    return (
+        _StubResearchAgent(),
+        _StubAnalysisAgent(fail=fail_analysis),
+        _StubStrategyAgent(),
+        _StubQualityAgent(),
+    )
+
+
+def _comparable(state):
+    """State without per-run timing fields"""
+    result = {key: value for key, value in state.items() if key not in ("start_time", "start_perf")}
+    result["errors"] = [
+        {key: value for key, value in error.items() if key != "timestamp"}
+        for error in state["errors"]
+    ]
+    return result
+
+
+@pytest.fixture
+def make_orchestrator(monkeypatch, tmp_path):
+    """Build an orchestrator around stub agents"""
+    cache = CacheManager(db_path=str(tmp_path / "cache.db"))
+    monkeypatch.setattr(orchestrator_module, "get_cache_manager", lambda: cache)
+
+    def make(fail_analysis=False):
+        monkeypatch.setattr(orchestrator_module, "_AGENTS", _stub_agents(fail_analysis))
+        return AgentOrchestrator()
+
+    return make
+
+
+class TestDirectPipelineParity:
+    """Test suite comparing the direct pipeline with the LangGraph workflow"""
+
+    @pytest.mark.parametrize("fail_analysis", [False, True])
+    def test_sync_paths_match(self, make_orchestrator, fail_analysis):
+        """Test _run_direct produces the same state as workflow.invoke"""
+        orchestrator = make_orchestrator(fail_analysis)
+
+        graph_state = orchestrator.workflow.invoke(
+            orchestrator._initial_state("crm tools", {}, None), config=orchestrator._run_config
+        )
+        direct_state = orchestrator._run_direct(orchestrator._initial_state("crm tools", {}, None))
+
+        assert _comparable(direct_state) == _comparable(graph_state)
+
+    @pytest.mark.parametrize("fail_analysis", [False, True])
+    def test_async_paths_match(self, make_orchestrator, fail_analysis):
+        """Test _arun_direct produces the same state as workflow.ainvoke"""
+        orchestrator = make_orchestrator(fail_analysis)
+
+        graph_state = asyncio.run(orchestrator.workflow.ainvoke(
+            orchestrator._initial_state("crm tools", {}, None), config=orchestrator._run_config
+        ))
+        direct_state = asyncio.run(
+            orchestrator._arun_direct(orchestrator._initial_state("crm tools", {}, None))
+        )
+
+        assert _comparable(direct_state) == _comparable(graph_state)
+
+    def test_failed_agent_recorded(self, make_orchestrator):
+        """Test an agent failure is reported as an error and not counted as an API call"""
+        orchestrator = make_orchestrator(fail_analysis=True)
+
+        state = orchestrator._run_direct(orchestrator._initial_state("crm tools", {}, None))
+
+        assert [error["agent"] for error in state["errors"]] == ["analysis"]
+        assert state["errors"][0]["error"] == "analysis exploded"
+        assert state["analysis_insights"] is None
+        assert state["api_calls"] == 2
+        assert state["quality_report"]["seen_errors"] == ["analysis"]
+
+    def test_run_uses_direct_pipeline(self, make_orchestrator, monkeypatch):
+        """Test run() and arun() bypass the workflow when the flag is on (the default)"""
+        if not orchestrator_module.config.ENABLE_DIRECT_PIPELINE:
+            pytest.skip("ENABLE_DIRECT_PIPELINE is turned off in this environment")
+        orchestrator = make_orchestrator()
+
+        def unexpected(*args, **kwargs):
+            raise AssertionError("workflow should not be invoked")
+
+        monkeypatch.setattr(orchestrator, "workflow", type("W", (), {"invoke": unexpected, "ainvoke": unexpected})())
+
+        report = orchestrator.run("crm tools")
+        assert report["report_metadata"]["query"] == "crm tools"
+        assert report["seen_api_calls"] == 3
+
+        report = asyncio.run(orchestrator.arun("crm tools"))
+        assert report["seen_api_calls"] == 3
+
+
+class TestStreamUpdates:
+    """Test suite for the synchronous per-agent update stream"""
+
+    def test_yields_each_agent_then_report(self, make_orchestrator):
+        """Test each agent's output is yielded in order, then the same report as run()"""
+        orchestrator = make_orchestrator()
+
+        events = list(orchestrator.stream_updates("crm tools"))
+
+        assert [event["agent"] for event in events] == [
+            "research", "analysis", "strategy", "quality", "complete"
+        ]
+        assert events[0]["result"]["query"] == "crm tools"
+        assert events[1]["result"]["competitors"] == [{"name": "Acme"}]
+        assert events[2]["result"]["content_recommendations"] == [{"title": "crm tools"}]
+        assert events[-1]["result"] == orchestrator.run("crm tools")
+        assert events[-1]["result"]["seen_api_calls"] == 3
+
+    def test_failed_agent_reported_in_stream(self, make_orchestrator):
+        """Test a failing agent yields no result and its error reaches the report"""
+        orchestrator = make_orchestrator(fail_analysis=True)
+
+        events = {event["agent"]: event["result"] for event in orchestrator.stream_updates("crm tools")}
+
+        assert events["analysis"] is None
+        assert events["complete"]["seen_errors"] == ["analysis"]
+
+
+class TestBatch:
+    """Test suite for running many pipelines concurrently"""
+
+    @staticmethod
+    def _fake_arun(orchestrator, monkeypatch, delay=0.02, fail=()):
+        """Replace arun with a fake that records starts and peak concurrency"""
+        stats = {"running": 0, "peak": 0, "starts": []}
+
+        async def fake_arun(query, parameters=None):
+            stats["starts"].append(time.monotonic())
+            stats["running"] += 1
+            stats["peak"] = max(stats["peak"], stats["running"])
+            try:
+                await asyncio.sleep(delay)
+                if query in fail:
+                    raise RuntimeError(f"failed: {query}")
+                return {"query": query, "parameters": parameters}
+            finally:
+                stats["running"] -= 1
+
+        monkeypatch.setattr(orchestrator, "arun", fake_arun)
+        return stats
+
+    def test_results_in_order_with_exceptions(self, make_orchestrator, monkeypatch):
+        """Test each query gets its report or its own exception, in input order"""
+        orchestrator = make_orchestrator()
+        self._fake_arun(orchestrator, monkeypatch, fail=("q1", "q3"))
+
+        results = asyncio.run(orchestrator.arun_batch(["q0", "q1", "q2", "q3"], {"region": "us"}))
+
+        assert results[0] == {"query": "q0", "parameters": {"region": "us"}}
+        assert results[2] == {"query": "q2", "parameters": {"region": "us"}}
+        assert isinstance(results[1], RuntimeError) and str(results[1]) == "failed: q1"
+        assert isinstance(results[3], RuntimeError) and str(results[3]) == "failed: q3"
+
+    def test_max_concurrency_respected(self, make_orchestrator, monkeypatch):
+        """Test no more than max_concurrency pipelines run at once"""
+        orchestrator = make_orchestrator()
+        stats = self._fake_arun(orchestrator, monkeypatch)
+
+        results = asyncio.run(orchestrator.arun_batch([f"q{i}" for i in range(6)], max_concurrency=2))
+
+        assert [result["query"] for result in results] == [f"q{i}" for i in range(6)]
+        assert stats["peak"] == 2
+
+    def test_rate_limit_spaces_starts(self, make_orchestrator, monkeypatch):
+        """Test pipeline starts are at least 1 / rate_limit seconds apart"""
+        orchestrator = make_orchestrator()
+        stats = self._fake_arun(orchestrator, monkeypatch, delay=0)
+
+        asyncio.run(orchestrator.arun_batch(["a", "b", "c", "d"], max_concurrency=4, rate_limit=20))
+
+        gaps = [later - earlier for earlier, later in zip(stats["starts"], stats["starts"][1:])]
+        assert len(gaps) == 3
+        assert all(gap >= 0.045 for gap in gaps)
+
+    def test_run_batch_sync_wrapper(self, make_orchestrator):
+        """Test run_batch runs real (stubbed) pipelines and can be called repeatedly"""
+        orchestrator = make_orchestrator()
+
+        for _ in range(2):
+            reports = orchestrator.run_batch(["crm tools", "email tools"], max_concurrency=2)
+            assert [report["report_metadata"]["query"] for report in reports] == ["crm tools", "email tools"]
+
+
+class TestCoalesce:
+    """Test suite for sharing identical in-flight agent calls"""
+
+    def _run_with_followers(self, orchestrator, leader_call, followers=3):
+        """Start a leader call, join `followers` callers to it, then let it finish"""
+        release = threading.Event()
+        claimed = threading.Semaphore(0)
+        original_claim = orchestrator._claim
+
+        def counting_claim(key):
+            outcome = original_claim(key)
+            claimed.release()
+            return outcome
+
+        orchestrator._claim = counting_claim
+        follower_calls = []
+        outcomes = {}
+
+        def leader_body():
+            release.wait(5)
+            return leader_call()
+
+        def follower_body():
+            follower_calls.append(1)
+            return {"from": "follower"}
+
+        def run(name, call):
+            try:
+                outcomes[name] = ("result", orchestrator._coalesce("analysis:q1", call))
+            except Exception as e:
+                outcomes[name] = ("error", e)
+
+        threads = [threading.Thread(target=run, args=("leader", leader_body))]
+        threads[0].start()
+        claimed.acquire(timeout=5)
+        for i in range(followers):
+            thread = threading.Thread(target=run, args=(f"follower{i}", follower_body))
+            threads.append(thread)
+            thread.start()
+        for _ in range(followers):
+            claimed.acquire(timeout=5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert follower_calls == []
+        return outcomes
+
+    def test_followers_get_copy_of_leader_result(self, make_orchestrator):
+        """Test followers receive the leader's result as independent copies"""
+        orchestrator = make_orchestrator()
+        leader_result = {"competitors": [{"name": "Acme"}]}
+
+        outcomes = self._run_with_followers(orchestrator, lambda: leader_result)
+
+        results = [value for kind, value in outcomes.values()]
+        assert all(kind == "result" for kind, _ in outcomes.values())
+        assert all(result == leader_result for result in results)
+        assert outcomes["leader"][1] is leader_result
+        follower_results = [outcomes[f"follower{i}"][1] for i in range(3)]
+        assert len({id(result) for result in follower_results + [leader_result]}) == 4
+        assert follower_results[0]["competitors"] is not leader_result["competitors"]
+        assert orchestrator._inflight == {}
+
+    def test_leader_exception_reaches_followers(self, make_orchestrator):
+        """Test a failing leader call raises the same exception in every follower"""
+        orchestrator = make_orchestrator()
+        error = RuntimeError("upstream down")
+
+        def failing_call():
+            raise error
+
+        outcomes = self._run_with_followers(orchestrator, failing_call)
+
+        assert {kind for kind, _ in outcomes.values()} == {"error"}
+        assert all(value is error for _, value in outcomes.values())
+        assert orchestrator._inflight == {}
+
+    def test_async_follower_gets_copy(self, make_orchestrator):
+        """Test _acoalesce followers get a copy of the leader's result"""
+        orchestrator = make_orchestrator()
+        leader_result = {"content_recommendations": [{"title": "x"}]}
+
+        async def scenario():
+            release = asyncio.Event()
+
+            async def leader_call():
+                await release.wait()
+                return leader_result
+
+            async def follower_call():
+                raise AssertionError("follower should not run its own call")
+
+            leader = asyncio.create_task(orchestrator._acoalesce("strategy:k", leader_call))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(orchestrator._acoalesce("strategy:k", follower_call))
+            await asyncio.sleep(0)
+            release.set()
+            return await leader, await follower
+
+        leader_value, follower_value = asyncio.run(scenario())
+
+        assert leader_value is leader_result
+        assert follower_value == leader_result
+        assert follower_value is not leader_result
+
+
+    def test_no_copy_without_followers(self, make_orchestrator, monkeypatch):
+        """Test a call nobody joined returns its result without copying it"""
+        orchestrator = make_orchestrator()
+        copies = []
+        monkeypatch.setattr(orchestrator_module.copy, "deepcopy", lambda value: copies.append(value) or value)
+        leader_result = {"competitors": ["Acme"]}
+
+        assert orchestrator._coalesce("analysis:solo", lambda: leader_result) is leader_result
+        assert copies == []
+
+    def test_one_snapshot_plus_one_copy_per_follower(self, make_orchestrator, monkeypatch):
+        """Test followers cost one snapshot plus one copy each"""
+        orchestrator = make_orchestrator()
+        real_deepcopy = orchestrator_module.copy.deepcopy
+        copies = []
+
+        def counting_deepcopy(value):
+            copies.append(1)
+            return real_deepcopy(value)
+
+        monkeypatch.setattr(orchestrator_module.copy, "deepcopy", counting_deepcopy)
+
+        self._run_with_followers(orchestrator, lambda: {"competitors": ["Acme"]}, followers=2)
+
+        assert len(copies) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,54 @@
+"""
+Tests that compiled prompt templates render exactly like str.format
+"""
+import pytest
+from core import prompts
+from core.prompts import CompiledPrompt
+
+COMPILED_TEMPLATES = sorted(
+    name for name, value in vars(prompts).items()
+    if name.endswith("_TEMPLATE") and isinstance(value, CompiledPrompt)
+)
+
+
+def _sample_kwargs(template: CompiledPrompt) -> dict:
+    # Values with braces, quotes and backslashes must pass through untouched
+    return {field: f"<{field} {{x}} 'q' \"dq\" \\n>" for field in template.fields}
+
+
+class TestCompiledPrompt:
+    """Test suite for CompiledPrompt"""
+
+    def test_templates_found(self):
+        """Test every per-call template is compiled"""
+        assert len(COMPILED_TEMPLATES) >= 7
+
+    @pytest.mark.parametrize("name", COMPILED_TEMPLATES)
+    def test_matches_str_format(self, name):
+        """Test format(**kw) equals template.format(**kw) for each module template"""
+        template = getattr(prompts, name)
+        kwargs = _sample_kwargs(template)
+
+        assert template.format(**kwargs) == template.template.format(**kwargs)
+
+    def test_escapes_and_repeated_fields(self):
+        """Test {{ }} escapes and a field used twice render like str.format"""
+        text = "{{literal}} {a} and {b}, again {a}: {{ \"json\": '{b}' }}\\n"
+        kwargs = {"a": "A", "b": "{B}", "unused": "ignored"}
+
+        assert CompiledPrompt(text).format(**kwargs) == text.format(**kwargs)
+
+    def test_missing_field_raises(self):
+        """Test a missing field raises instead of rendering a placeholder"""
+        with pytest.raises(TypeError):
+            CompiledPrompt("{a} {b}").format(a="A")
+
+    def test_unsupported_placeholder_rejected(self):
+        """Test format specs and attribute access are rejected at construction"""
+        for text in ("{a:>10}", "{a!r}", "{a.b}", "{0}"):
+            with pytest.raises(ValueError):
+                CompiledPrompt(text)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
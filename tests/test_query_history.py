@@ -0,0 +1,175 @@
+"""
+Tests for QueryHistory's background writer and keyset pagination
+"""
+import pytest
+from utils.query_history import QueryHistory
+
+
+def _result(confidence=0.8):
+    return {
+        "report_metadata": {"confidence_score": confidence, "processing_time_seconds": 1},
+        "validated_insights": {"competitors": [{"name": "A"}, {"name": "B"}]},
+    }
+
+
+@pytest.fixture
+def history(tmp_path):
+    """QueryHistory on a throwaway database"""
+    return QueryHistory(db_path=str(tmp_path / "history.db"))
+
+
+class TestQueryHistoryWriter:
+    """Test suite for the batched background writer"""
+
+    def test_rows_readable_after_flush(self, history):
+        """Test queued rows are visible to reads once flush() returns"""
+        for i in range(5):
+            history.save_query(f"query {i}", _result())
+        history.flush()
+
+        rows = history.get_recent_queries(limit=10)
+        assert [row[1] for row in rows] == [f"query {i}" for i in reversed(range(5))]
+        assert rows[0][4] == 2
+
+    def test_writer_survives_failed_batch(self, history, monkeypatch):
+        """Test a non-sqlite error drops the batch but keeps the writer running"""
+        original_configure = QueryHistory._configure_connection
+        calls = {"count": 0}
+
+        def flaky_configure(conn):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise RuntimeError("boom")
+            original_configure(conn)
+
+        monkeypatch.setattr(QueryHistory, "_configure_connection", staticmethod(flaky_configure))
+
+        history.save_query("dropped", _result())
+        history.flush()
+        assert history._writer.is_alive()
+
+        history.save_query("kept", _result())
+        history.flush()
+        assert [row[1] for row in history.get_recent_queries()] == ["kept"]
+
+    def test_dead_writer_is_restarted(self, history):
+        """Test flush() restarts a writer thread that has exited"""
+
+        class _DeadThread:
+            def is_alive(self):
+                return False
+
+        history._writer = _DeadThread()
+        history.save_query("after restart", _result())
+        history.flush()
+
+        assert history._writer.is_alive()
+        assert history.get_recent_queries()[0][1] == "after restart"
+
+
+class TestRecentQueriesPaging:
+    """Test suite for before_id / next_cursor pagination"""
+
+    def test_pages_cover_all_rows_once(self, history):
+        """Test following the cursor walks every row exactly once, newest first"""
+        for i in range(7):
+            history.save_query(f"query {i}", _result())
+        history.flush()
+
+        seen = []
+        before_id = None
+        while True:
+            page = history.get_recent_queries(limit=3, before_id=before_id)
+            seen.extend(row[1] for row in page)
+            if len(page) < 3:
+                break
+            before_id = page[-1][0]
+
+        assert seen == [f"query {i}" for i in reversed(range(7))]
+
+    def test_recent_endpoint_next_cursor(self, history):
+        """Test /api/history/recent returns next_cursor until the last page"""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from api.dependencies import get_history
+        from api.routers.history import router
+
+        app = FastAPI()
+        app.include_router(router)
+
+        for i in range(5):
+            history.save_query(f"query {i}", _result())
+        history.flush()
+
+        app.dependency_overrides[get_history] = lambda: history
+        client = TestClient(app)
+
+        first = client.get("/api/history/recent", params={"limit": 3}).json()
+        assert [item["query"] for item in first["items"]] == ["query 4", "query 3", "query 2"]
+        assert first["next_cursor"] == first["items"][-1]["id"]
+
+        second = client.get(
+            "/api/history/recent",
+            params={"limit": 3, "before_id": first["next_cursor"]},
+        ).json()
+        assert [item["query"] for item in second["items"]] == ["query 1", "query 0"]
+        assert second["next_cursor"] is None
+
+
+class TestHistoryRoutes:
+    """Test suite for the /api/history endpoints"""
+
+    def test_latest_not_captured_by_query_id(self, history):
+        """Test GET /api/history/latest reaches the latest-result route"""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from api.dependencies import get_history
+        from api.routers.history import router
+
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_history] = lambda: history
+        client = TestClient(app)
+
+        assert client.get("/api/history/latest").status_code == 404
+
+        history.save_query("first", _result(), response_json='{"query_text": "first"}')
+        history.save_query("second", _result(), response_json='{"query_text": "second"}')
+        history.flush()
+
+        response = client.get("/api/history/latest")
+        assert response.status_code == 200
+        assert response.json() == {"query_text": "second"}
+
+
+class TestHistoryDependency:
+    """Test suite for the get_history dependency"""
+
+    def test_built_off_event_loop_once(self, tmp_path, monkeypatch):
+        """Test the instance is built in the threadpool once, then returned directly"""
+        import asyncio
+        import threading
+        from functools import lru_cache
+        from api import dependencies
+
+        built_on = []
+
+        @lru_cache()
+        def factory():
+            built_on.append(threading.current_thread())
+            return QueryHistory(db_path=str(tmp_path / "history.db"))
+
+        monkeypatch.setattr(dependencies, "_get_history_instance", factory)
+
+        async def resolve_twice():
+            return await dependencies.get_history(), await dependencies.get_history()
+
+        first, second = asyncio.run(resolve_twice())
+
+        assert first is second
+        assert len(built_on) == 1
+        assert built_on[0] is not threading.main_thread()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -27,9 +27,9 @@ class TestResearchAgent:
         
         # Mock the _search_web, _get_trends, and _search_reddit methods
         # to avoid actual API calls during testing
-        agent._search_web = lambda q: []
-        agent._get_trends = lambda q: {}
-        agent._search_reddit = lambda q, limit=10: []
+        agent._search_web = lambda q, trace_id=None: []
+        agent._get_trends = lambda q, trace_id=None: {}
+        agent._search_reddit = lambda q, limit=10, trace_id=None: []
         
         result = agent.run(query)
         
@@ -63,9 +63,9 @@ class TestResearchAgent:
         test_sources = [{"url": "test1"}, {"url": "test2"}]
         test_discussions = [{"title": "disc1"}]
         
-        agent._search_web = lambda q: test_sources
-        agent._get_trends = lambda q: {"query": q}
-        agent._search_reddit = lambda q, limit=10: test_discussions
+        agent._search_web = lambda q, trace_id=None: test_sources
+        agent._get_trends = lambda q, trace_id=None: {"query": q}
+        agent._search_reddit = lambda q, limit=10, trace_id=None: test_discussions
         
         result = agent.run("test query")
         
@@ -77,9 +77,9 @@ class TestResearchAgent:
     def test_empty_results_handling(self, agent):
         """Test that agent handles empty results gracefully"""
         # Mock methods to return empty results
-        agent._search_web = lambda q: []
-        agent._get_trends = lambda q: {}
-        agent._search_reddit = lambda q, limit=10: []
+        agent._search_web = lambda q, trace_id=None: []
+        agent._get_trends = lambda q, trace_id=None: {}
+        agent._search_reddit = lambda q, limit=10, trace_id=None: []
         
         result = agent.run("nonexistent query 123456789")
         
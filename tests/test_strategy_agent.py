@@ -2,7 +2,7 @@
 Tests for Strategy Agent
 """
 import pytest
-from agents.strategy_agent import StrategyAgent
+from agents.strategy_agent import StrategyAgent, _JSONArrayStreamParser
 from tests.fixtures.sample_data import SAMPLE_ANALYSIS_INSIGHTS, SAMPLE_STRATEGY_RECOMMENDATIONS
 
 
@@ -206,6 +206,80 @@ class TestStrategyAgentMethods:
             assert 1 <= positioning[comp]["x"] <= 10
             assert 1 <= positioning[comp]["y"] <= 10
 
+    def test_structural_key(self, agent):
+        """Test plan-cache key depends on structure, not ordering"""
+        insights = {
+            "competitors": ["Company A", "Company B"],
+            "competitor_attributes": {
+                "Company A": {"sentiment": 0.52},
+                "Company B": {"sentiment": -0.1}
+            },
+            "content_themes": [{"theme": "Pricing"}, {"theme": "Onboarding"}]
+        }
+        reordered = {
+            "competitors": ["Company B", "Company A"],
+            "competitor_attributes": {
+                "Company A": {"sentiment": 0.48},
+                "Company B": {"sentiment": -0.1}
+            },
+            "content_themes": [{"theme": "Onboarding"}, {"theme": "Pricing"}]
+        }
+
+        key = agent._structural_key(insights, "crm tools")
+
+        # Same structure (rounded sentiment, sorted names) shares a key
+        assert key == agent._structural_key(reordered, "crm tools")
+
+        # A different query gets its own plan
+        assert key != agent._structural_key(insights, "project management")
+
+    def test_sync_run_reuses_one_event_loop(self, agent, monkeypatch):
+        """Test run() drives arun on the same open loop every call"""
+        import asyncio
+
+        loops = []
+
+        async def fake_arun(analysis_insights, trace_id=None, query=""):
+            loops.append(asyncio.get_running_loop())
+            return {"query": query}
+
+        monkeypatch.setattr(agent, "arun", fake_arun)
+
+        assert agent.run(SAMPLE_ANALYSIS_INSIGHTS, query="first") == {"query": "first"}
+        assert asyncio.run(asyncio.to_thread(agent.run, SAMPLE_ANALYSIS_INSIGHTS)) == {"query": ""}
+
+        # Pooled async connections stay usable because the loop is never closed
+        assert loops[0] is loops[1]
+        assert not loops[0].is_closed()
+
+    def test_positioning_prompt_matches_str_format(self, agent):
+        """Test the pre-rendered positioning prompt parts equal the str.format result"""
+        from core.prompts import POSITIONING_PROMPT, split_prompt
+
+        kwargs = {field: f"<{field} {{x}}>" for field in agent._positioning_data_template.fields}
+
+        instructions, data = split_prompt(POSITIONING_PROMPT.format(**kwargs))
+
+        assert agent._positioning_instructions == instructions
+        assert agent._positioning_data_template.format(**kwargs) == data
+
+    def test_stream_parser_yields_complete_objects(self):
+        """Test streamed recommendations are emitted as each object closes"""
+        document = (
+            '{"recommendations": ['
+            '{"topic": "Braces } in \\"quotes\\" {", "score_reasoning": {"demand_signal": 8}}, '
+            '{"topic": "Second"}'
+            ']}'
+        )
+        parser = _JSONArrayStreamParser("recommendations")
+
+        emitted = []
+        for i in range(0, len(document), 5):
+            emitted.extend(parser.feed(document[i:i + 5]))
+
+        assert [rec["topic"] for rec in emitted] == ['Braces } in "quotes" {', "Second"]
+        assert emitted[0]["score_reasoning"] == {"demand_signal": 8}
+
 
 class TestSampleData:
     """Validate sample data structure"""
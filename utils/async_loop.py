@@ -0,0 +1,52 @@
+"""
+Persistent event loop for running coroutines from synchronous code
+
+Async clients (such as the httpx pool behind LangChain's AsyncOpenAI client,
+which is shared process-wide) keep pooled connections bound to the loop that
+opened them. Creating and closing a loop per call leaves those connections
+dead for the next call, so sync entry points run their coroutines on this
+one long-lived loop instead.
+"""
+
+import asyncio
+import threading
+from typing import Any, Coroutine
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_thread: threading.Thread | None = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start the background loop thread once"""
+    global _loop, _loop_thread
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                _loop_thread = threading.Thread(
+                    target=loop.run_forever, name="background-event-loop", daemon=True
+                )
+                _loop_thread.start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine on the background loop and block until it finishes
+
+    Safe to call from any thread, including one running its own event loop
+    (that loop is blocked for the duration, as with any sync call).
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result; its exception is re-raised here
+    """
+    loop = _get_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the background loop itself")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -12,9 +12,9 @@ Features:
 """
 
 import sqlite3
-import json
 import hashlib
 import logging
+import orjson
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Optional, Dict, List
@@ -45,6 +45,13 @@ class CacheManager:
         CACHE_TYPE_QUALITY: 7 * 24,   # 7 days for quality
     }
 
+    # LangChain's SQLiteCache (api/main.py) writes LLM responses to this table
+    # in the same database. It has no expiry column, so it is bounded by size
+    # on cleanup and cleared with the rest of the cache.
+    LLM_CACHE_TABLE = "full_llm_cache"
+    CACHE_TYPE_LLM = "llm_responses"
+    LLM_CACHE_MAX_ENTRIES = 5000
+
     def __init__(self, db_path: str = "data/cache.db", auto_cleanup: bool = True):
         """
         Initialize cache manager
@@ -79,6 +86,11 @@ class CacheManager:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
 
+                # WAL is persistent in the database file, so set it once here;
+                # page_size only takes effect on a new database, before WAL
+                cursor.execute("PRAGMA page_size=8192")
+                cursor.execute("PRAGMA journal_mode=WAL")
+
                 # Create cache table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS cache (
@@ -136,6 +148,9 @@ class CacheManager:
         """Context manager for database connections"""
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
+        # Per-connection settings: fsync only at WAL checkpoints, temp tables in memory
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
         try:
             yield conn
         finally:
@@ -186,8 +201,8 @@ class CacheManager:
                     logger.debug(f"Cache HIT for key: {key}")
 
                     try:
-                        return json.loads(row[0])
-                    except (json.JSONDecodeError, TypeError):
+                        return orjson.loads(row[0])
+                    except (orjson.JSONDecodeError, TypeError):
                         logger.warning(f"Failed to decode cache value for key: {key}")
                         return None
                 else:
@@ -229,9 +244,9 @@ class CacheManager:
                 ttl_hours = self.DEFAULT_TTLS.get(cache_type, 24)
 
             expires_at = datetime.now() + timedelta(hours=ttl_hours)
-            json_value = json.dumps(value)
+            json_value = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
 
-            metadata_json = json.dumps(metadata) if metadata else None
+            metadata_json = orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode() if metadata else None
 
             with self._get_connection() as conn:
                 cursor = conn.cursor()
@@ -281,6 +296,14 @@ class CacheManager:
             self.stats["errors"] += 1
             return False
 
+    def _has_llm_cache(self, cursor: sqlite3.Cursor) -> bool:
+        """Check whether the LangChain LLM cache table exists in this database"""
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            [self.LLM_CACHE_TABLE]
+        )
+        return cursor.fetchone() is not None
+
     def delete_by_type(self, cache_type: str) -> int:
         """
         Delete all cache entries of specific type
@@ -294,9 +317,15 @@ class CacheManager:
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("DELETE FROM cache WHERE cache_type = ?", [cache_type])
+                if cache_type == self.CACHE_TYPE_LLM:
+                    deleted = 0
+                    if self._has_llm_cache(cursor):
+                        cursor.execute(f"DELETE FROM {self.LLM_CACHE_TABLE}")
+                        deleted = cursor.rowcount
+                else:
+                    cursor.execute("DELETE FROM cache WHERE cache_type = ?", [cache_type])
+                    deleted = cursor.rowcount
                 conn.commit()
-                deleted = cursor.rowcount
 
             self.stats["deletes"] += deleted
             logger.info(f"Deleted {deleted} cache entries of type: {cache_type}")
@@ -344,8 +373,11 @@ class CacheManager:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM cache")
-                conn.commit()
                 deleted = cursor.rowcount
+                if self._has_llm_cache(cursor):
+                    cursor.execute(f"DELETE FROM {self.LLM_CACHE_TABLE}")
+                    deleted += cursor.rowcount
+                conn.commit()
 
             self.stats["deletes"] += deleted
             logger.warning(f"Cleared entire cache: {deleted} entries deleted")
@@ -360,6 +392,9 @@ class CacheManager:
         """
         Remove expired cache entries
 
+        Also trims the LLM response cache to the newest
+        LLM_CACHE_MAX_ENTRIES rows, since it has no TTL of its own.
+
         Returns:
             Number of entries deleted
         """
@@ -370,8 +405,17 @@ class CacheManager:
                     "DELETE FROM cache WHERE expires_at < ?",
                     [datetime.now()]
                 )
-                conn.commit()
                 deleted = cursor.rowcount
+                if self._has_llm_cache(cursor):
+                    cursor.execute(f"""
+                        DELETE FROM {self.LLM_CACHE_TABLE}
+                        WHERE rowid NOT IN (
+                            SELECT rowid FROM {self.LLM_CACHE_TABLE}
+                            ORDER BY rowid DESC LIMIT ?
+                        )
+                    """, [self.LLM_CACHE_MAX_ENTRIES])
+                    deleted += cursor.rowcount
+                conn.commit()
 
             if deleted > 0:
                 logger.info(f"Cleanup removed {deleted} expired cache entries")
@@ -412,7 +456,22 @@ class CacheManager:
                     WHERE expires_at > ?
                     GROUP BY cache_type
                 """, [datetime.now()])
-                by_type = cursor.fetchall()
+                by_type = [
+                    {"type": row[0], "count": row[1], "hits": row[2] or 0}
+                    for row in cursor.fetchall()
+                ]
+
+                # LLM responses cached by LangChain (no expiry or hit tracking)
+                if self._has_llm_cache(cursor):
+                    cursor.execute(
+                        f"SELECT COUNT(*), SUM(LENGTH(response)) FROM {self.LLM_CACHE_TABLE}"
+                    )
+                    llm_count, llm_size = cursor.fetchone()
+                    if llm_count:
+                        total_valid += llm_count
+                        total_all += llm_count
+                        total_size += llm_size or 0
+                        by_type.append({"type": self.CACHE_TYPE_LLM, "count": llm_count, "hits": 0})
 
             hit_rate = (
                 (self.stats["hits"] / (self.stats["hits"] + self.stats["misses"]) * 100)
@@ -427,14 +486,7 @@ class CacheManager:
                 "total_entries_all": total_all,
                 "total_size_bytes": total_size,
                 "total_size_mb": round(total_size / (1024 * 1024), 2),
-                "by_type": [
-                    {
-                        "type": row[0],
-                        "count": row[1],
-                        "hits": row[2] or 0
-                    }
-                    for row in by_type
-                ]
+                "by_type": by_type
             }
         except Exception as e:
             logger.error(f"Error getting cache stats: {e}")
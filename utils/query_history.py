@@ -1,15 +1,76 @@
-import json
+import atexit
+import hashlib
+import logging
 import os
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def query_fingerprint(query: str, parameters: dict | None) -> tuple[str, str]:
+    """Hash the normalized query and its parameters to identify repeat requests"""
+    query_hash = hashlib.blake2b(query.strip().lower().encode(), digest_size=16).hexdigest()
+    params_hash = hashlib.blake2b(
+        orjson.dumps(parameters or {}, option=orjson.OPT_SORT_KEYS), digest_size=8
+    ).hexdigest()
+    return query_hash, params_hash
+
+
+_INSERT_QUERY_SQL = """
+    INSERT INTO queries 
+    (query, timestamp, confidence_score, num_competitors, processing_time, result_json, response_json,
+     query_hash, params_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Background writer: commit up to _WRITE_BATCH_SIZE rows per transaction,
+# waiting at most _WRITE_BATCH_WINDOW seconds for a batch to fill
+_WRITE_QUEUE_SIZE = 1000
+_WRITE_BATCH_SIZE = 50
+_WRITE_BATCH_WINDOW = 0.05
+
+# Prepared statements kept per connection; every query here is a fixed SQL
+# string, so each is parsed once per connection and then reused
+_CACHED_STATEMENTS = 256
 
 
 class QueryHistory:
     def __init__(self, db_path: str = "data/history.db"):
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(
+            db_path, check_same_thread=False, cached_statements=_CACHED_STATEMENTS
+        )
+        self._configure_connection(self.conn)
         self._create_table()
 
+        # Inserts are committed in batches by a writer thread on its own
+        # connection, so readers never wait on the write transaction
+        self._write_queue: "queue.Queue" = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection):
+        # page_size only takes effect on a new database, before WAL is enabled
+        conn.executescript(
+            """
+            PRAGMA page_size=8192;
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+            """
+        )
+
     def _create_table(self):
         self.conn.execute(
             """
@@ -20,41 +81,159 @@ class QueryHistory:
                 confidence_score FLOAT,
                 num_competitors INT,
                 processing_time INT,
-                result_json TEXT
+                result_json TEXT,
+                response_json TEXT,
+                query_hash TEXT,
+                params_hash TEXT
             )
             """
         )
-        self.conn.commit()
-
-    def save_query(self, query: str, result: dict):
-        metadata = result.get("report_metadata", {})
+        # Databases created before these columns were added
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(queries)")}
+        for column in ("response_json", "query_hash", "params_hash"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE queries ADD COLUMN {column} TEXT")
+        # Recent/latest lookups order by timestamp; avoid a full scan + sort
         self.conn.execute(
-            """
-            INSERT INTO queries 
-            (query, timestamp, confidence_score, num_competitors, processing_time, result_json)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                query,
-                datetime.now(),
-                metadata.get("confidence_score"),
-                len(result.get("validated_insights", {}).get("competitors", [])),
-                metadata.get("processing_time_seconds"),
-                json.dumps(result),
-            ),
+            "CREATE INDEX IF NOT EXISTS idx_queries_timestamp ON queries(timestamp DESC)"
+        )
+        # Fresh-result lookups match on (query, parameters) within a TTL
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_queries_hash ON queries(query_hash, params_hash, timestamp)"
         )
+        self.conn.execute("ANALYZE queries")
         self.conn.commit()
 
-    def get_recent_queries(self, limit: int = 10):
-        cursor = self.conn.execute(
-            """
-            SELECT id, query, timestamp, confidence_score, num_competitors
-            FROM queries
-            ORDER BY timestamp DESC
-            LIMIT ?
-            """,
-            (limit,),
+    def save_query(
+        self,
+        query: str,
+        result: dict,
+        response_json: str | None = None,
+        parameters: dict | None = None,
+    ):
+        """
+        Save a query result.
+
+        Args:
+            query: Query text
+            result: Raw orchestrator result
+            response_json: Pre-validated API response body, served as-is by the history endpoints
+            parameters: Request parameters the result was produced with
+
+        Results whose report_metadata lists agent errors are stored without a
+        fingerprint, so get_fresh_response_json never returns them.
+        The row is queued and committed by a background writer; call flush()
+        to wait until it is visible to reads.
+        """
+        metadata = result.get("report_metadata", {})
+        if metadata.get("errors"):
+            # Runs where an agent failed are kept in history but never served
+            # as a fresh result for a repeat request
+            query_hash, params_hash = None, None
+        else:
+            query_hash, params_hash = query_fingerprint(query, parameters)
+        row = (
+            query,
+            datetime.now(),
+            metadata.get("confidence_score"),
+            len(result.get("validated_insights", {}).get("competitors", [])),
+            metadata.get("processing_time_seconds"),
+            # Stored as a BLOB: orjson bytes go in and come back without a UTF-8 round trip
+            orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS),
+            response_json,
+            query_hash,
+            params_hash,
         )
+
+        self._ensure_writer()
+        try:
+            self._write_queue.put_nowait(row)
+        except queue.Full:
+            # Writer is backed up; don't lose the row, write it here instead
+            with self.conn:
+                self.conn.execute(_INSERT_QUERY_SQL, row)
+
+    def flush(self):
+        """Wait until all queued history rows are committed"""
+        if self._writer is not None:
+            # A writer that died would leave the queue undrained forever
+            self._ensure_writer()
+            self._write_queue.join()
+
+    def _ensure_writer(self):
+        """Start the background writer thread, or restart it if it has exited"""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            return
+
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._drain_writes, name="query-history-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _drain_writes(self):
+        """Writer loop: commit queued rows in batches"""
+        conn = None
+        while True:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + _WRITE_BATCH_WINDOW
+            while len(batch) < _WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                if conn is None:
+                    new_conn = sqlite3.connect(self.db_path, cached_statements=_CACHED_STATEMENTS)
+                    self._configure_connection(new_conn)
+                    conn = new_conn
+                with conn:
+                    conn.executemany(_INSERT_QUERY_SQL, batch)
+            except Exception as e:
+                # Drop this batch but keep the writer running for the next one
+                logger.error(f"Failed to write {len(batch)} history rows: {e}")
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    def get_recent_queries(self, limit: int = 10, before_id: int | None = None):
+        """
+        Get recent queries, newest first.
+
+        Args:
+            limit: Maximum number of rows to return
+            before_id: Only return rows with an id below this cursor (keyset pagination)
+
+        Returns:
+            List of (id, query, timestamp, confidence_score, num_competitors) rows
+        """
+        if before_id is None:
+            cursor = self.conn.execute(
+                """
+                SELECT id, query, timestamp, confidence_score, num_competitors
+                FROM queries
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (limit,),
+            )
+        else:
+            cursor = self.conn.execute(
+                """
+                SELECT id, query, timestamp, confidence_score, num_competitors
+                FROM queries
+                WHERE id < ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (before_id, limit),
+            )
         return cursor.fetchall()
 
     def get_query_by_id(self, query_id: int) -> dict | None:
@@ -66,7 +245,7 @@ class QueryHistory:
         )
         row = cursor.fetchone()
         if row:
-            result = json.loads(row[1])
+            result = orjson.loads(row[1])
             # Add the original query text to the result
             result["query_text"] = row[0]
             return result
@@ -83,9 +262,58 @@ class QueryHistory:
         )
         row = cursor.fetchone()
         if row:
-            result = json.loads(row[1])
+            result = orjson.loads(row[1])
             result["query_text"] = row[0]
             return result
         return None
 
+    def get_response_json_by_id(self, query_id: int) -> str | None:
+        """Get the stored API response body for a query, or None if not stored"""
+        cursor = self.conn.execute(
+            """
+            SELECT response_json FROM queries WHERE id = ?
+            """,
+            (query_id,),
+        )
+        row = cursor.fetchone()
+        return row[0] if row else None
 
+    def get_latest_response_json(self) -> str | None:
+        """Get the stored API response body for the most recent query, or None if not stored"""
+        cursor = self.conn.execute(
+            """
+            SELECT response_json FROM queries 
+            ORDER BY timestamp DESC 
+            LIMIT 1
+            """
+        )
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def get_fresh_response_json(
+        self, query: str, parameters: dict | None, max_age: timedelta
+    ) -> str | None:
+        """
+        Get the stored API response for the same query and parameters, if recent enough.
+
+        Args:
+            query: Query text (compared case- and whitespace-insensitively)
+            parameters: Request parameters
+            max_age: Oldest result that still counts as fresh
+
+        Returns:
+            Stored response body, or None if there is no fresh result
+        """
+        query_hash, params_hash = query_fingerprint(query, parameters)
+        cursor = self.conn.execute(
+            """
+            SELECT response_json FROM queries
+            WHERE query_hash = ? AND params_hash = ? AND timestamp > ?
+                AND response_json IS NOT NULL
+            ORDER BY timestamp DESC
+            LIMIT 1
+            """,
+            (query_hash, params_hash, datetime.now() - max_age),
+        )
+        row = cursor.fetchone()
+        return row[0] if row else None